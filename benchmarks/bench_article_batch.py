@@ -0,0 +1,77 @@
+"""Compare building a list of Articles with building an ArticleBatch.
+
+Both start from the same RssArticles, as returned by the RSS client, and
+report the build time and the memory held by the result.
+
+Usage: poetry run python benchmarks/bench_article_batch.py
+"""
+
+import time
+import tracemalloc
+from typing import Callable
+
+from newspy.batch import ArticleBatch
+from newspy.models import Category, Language
+from newspy.rss.models import RssArticle, RssSource
+
+COUNT = 100_000
+SOURCES = 200
+
+
+def make_articles() -> list[RssArticle]:
+    sources = [
+        RssSource(
+            id=f"source-{i}",
+            name=f"Source {i}",
+            description="",
+            url=f"https://example.com/{i}/feed.xml",
+            category=Category.GENERAL,
+            language=Language.EN,
+        )
+        for i in range(SOURCES)
+    ]
+    return [
+        RssArticle(
+            source=sources[i % SOURCES],
+            title=f"Headline number {i}",
+            description="Lorem ipsum dolor sit amet",
+            url=f"https://example.com/articles/{i}",
+            published="Sun, 12 Mar 2023 13:00:35 GMT",
+        )
+        for i in range(COUNT)
+    ]
+
+
+def to_list(articles: list[RssArticle]) -> list:
+    return [article.to_article() for article in articles]
+
+
+def to_batch(articles: list[RssArticle]) -> ArticleBatch:
+    batch = ArticleBatch()
+    for article in articles:
+        article.append_to(batch)
+    return batch
+
+
+def measure(build: Callable, articles: list[RssArticle]) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(articles)
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, held
+
+
+def main() -> None:
+    articles = make_articles()
+    print(f"{COUNT} articles from {SOURCES} sources")
+    print(f"{'result':>14} {'build s':>8} {'held MB':>8}")
+    for name, build in (("list[Article]", to_list), ("ArticleBatch", to_batch)):
+        elapsed, held = measure(build, articles)
+        print(f"{name:>14} {elapsed:>8.2f} {held / 2**20:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
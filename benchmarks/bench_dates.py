@@ -0,0 +1,74 @@
+"""Compare utils.to_datetime with the previous strptime cascade.
+
+The corpus mixes the date styles found in real feeds: RFC 822 dates with a
+zone name or a numeric offset (RSS 2.0) and ISO 8601 dates (Atom, RDF and the
+Newsorg API).
+
+Usage: poetry run python benchmarks/bench_dates.py
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from newspy.shared import utils
+
+CORPUS = {
+    "rfc822 GMT": [f"Sun, {day:02} Mar 2023 13:00:35 GMT" for day in range(1, 29)],
+    "rfc822 offset": [f"Tue, {day:02} Mar 2023 09:30:00 +0200" for day in range(1, 29)],
+    "iso Z": [f"2023-03-{day:02}T18:00:00Z" for day in range(1, 29)],
+    "iso offset": [f"2023-03-{day:02}T06:00:00+01:00" for day in range(1, 29)],
+}
+REPEAT = 2000
+
+
+def legacy_to_datetime(date_string: str) -> datetime:
+    try:
+        transformed = datetime.fromisoformat(date_string.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            transformed = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ")
+        except ValueError:
+            try:
+                transformed = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
+            except ValueError:
+                try:
+                    transformed = datetime.strptime(
+                        date_string, "%a, %d %b %Y %H:%M:%S %z"
+                    )
+                except ValueError:
+                    transformed = datetime.strptime(
+                        date_string, "%a, %d %b %Y %H:%M:%S %Z"
+                    ).replace(tzinfo=timezone.utc)
+
+    return transformed
+
+
+def measure(parse: Callable[[list[str]], object], dates: list[str]) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        parse(dates)
+    return (time.perf_counter() - start) / (REPEAT * len(dates))
+
+
+def main() -> None:
+    cases = {
+        "legacy": lambda dates: [legacy_to_datetime(date) for date in dates],
+        "to_datetime": lambda dates: [utils.to_datetime(date) for date in dates],
+        "per source": lambda dates: [
+            utils.to_datetime(date, source="https://example.com") for date in dates
+        ],
+        "to_datetimes": lambda dates: utils.to_datetimes(
+            dates, source="https://example.com"
+        ),
+    }
+
+    print(f"{'dates':>14}" + "".join(f"{name:>14}" for name in cases) + "  (us/date)")
+    for style, dates in CORPUS.items():
+        assert [legacy_to_datetime(d) for d in dates] == utils.to_datetimes(dates)
+        timings = [measure(parse, dates) * 1e6 for parse in cases.values()]
+        print(f"{style:>14}" + "".join(f"{timing:>14.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
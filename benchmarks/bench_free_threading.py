@@ -0,0 +1,69 @@
+"""Measure how feed parsing throughput scales with the number of threads.
+
+Run it with a regular and with a free-threaded (PEP 703) interpreter, e.g.
+python3.14 and python3.14t. With the GIL the throughput stays flat as
+threads are added; without it, it should grow with the number of cores.
+
+Usage: poetry run python benchmarks/bench_free_threading.py
+"""
+
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from newspy.shared import xml_parser
+
+ITEM = (
+    "<item>"
+    "<title><![CDATA[ Headline number {i} ]]></title>"
+    "<description><![CDATA[ <p>{body}</p> ]]></description>"
+    "<link>https://example.com/articles/{i}</link>"
+    "<pubDate>Sun, 12 Mar 2023 13:00:35 GMT</pubDate>"
+    "</item>"
+)
+FEEDS = 256
+
+
+def make_feed(items: int, body_size: int) -> bytes:
+    body = "lorem ipsum " * (body_size // 12)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel><title>Benchmark</title>'
+        + "".join(ITEM.format(i=i, body=body) for i in range(items))
+        + "</channel></rss>"
+    ).encode()
+
+
+def gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def main() -> None:
+    feed = make_feed(items=100, body_size=500)
+    free_threaded_build = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"python {sys.version.split()[0]}, cpus: {os.cpu_count()}")
+    print(f"free-threaded build: {free_threaded_build}, GIL enabled: {gil_enabled()}")
+    print(f"backend: {xml_parser.get_backend().value}")
+
+    print(f"{'threads':>8} {'feeds/s':>9} {'speedup':>8}")
+    baseline = None
+    for threads in (1, 2, 4, 8, 16):
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            list(
+                executor.map(
+                    lambda i: xml_parser.parse_xml(feed, f"https://example.com/{i}"),
+                    range(FEEDS),
+                )
+            )
+            throughput = FEEDS / (time.perf_counter() - start)
+
+        baseline = baseline or throughput
+        print(f"{threads:>8} {throughput:>9.0f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
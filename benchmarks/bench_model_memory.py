@@ -0,0 +1,96 @@
+"""Measure the memory held per article by the slotted models.
+
+The models are compared with plain dataclass copies that keep a per-instance
+__dict__, which is how they were declared before. Field values are shared
+between articles so that only the per-object overhead is measured.
+
+Usage: poetry run python benchmarks/bench_model_memory.py
+"""
+
+import dataclasses
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable
+
+from newspy.models import Article, Category, Channel, Language, Source
+from newspy.rss.models import RssArticle, RssSource
+
+COUNT = 100_000
+PUBLISHED = datetime(2023, 3, 12, 13, 0, 35, tzinfo=timezone.utc)
+
+
+def unslotted(cls: type) -> type:
+    """Return a plain dataclass with the same fields as the given model."""
+    return dataclasses.make_dataclass(
+        f"Dict{cls.__name__}",
+        [
+            (
+                field.name,
+                field.type,
+                dataclasses.field(
+                    default=field.default, default_factory=field.default_factory
+                ),
+            )
+            for field in dataclasses.fields(cls)
+        ],
+    )
+
+
+def measure(factory: Callable[[int], object]) -> float:
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(COUNT)]
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in end.compare_to(start, "filename"))
+    # Don't count the list holding the objects.
+    allocated -= objects.__sizeof__()
+    return allocated / COUNT
+
+
+def main() -> None:
+    rss_source = RssSource(
+        id="wsj-markets",
+        name="The Wall Street Journal Markets",
+        description="The Wall Street Journal (WSJ) Markets RSS",
+        url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+        category=Category.FINANCIAL,
+        language=Language.EN,
+    )
+    source = rss_source.to_source()
+    fields = {
+        "title": "Title",
+        "description": "Description",
+        "url": "https://example.com/title",
+        "published": "Sun, 12 Mar 2023 13:00:35 GMT",
+    }
+    article_fields = {
+        "slug": "slug",
+        "url": "https://example.com/title",
+        "url_to_image": None,
+        "title": "Title",
+        "abstract": "Description",
+        "author": None,
+        "source": source,
+        "published": PUBLISHED,
+    }
+
+    cases = [
+        ("RssArticle", RssArticle, {"source": rss_source, **fields}),
+        ("Article", Article, article_fields),
+        ("Source", Source, {"id": "id", "name": "name", "channel": Channel.RSS}),
+    ]
+
+    print(f"{'model':>12} {'dict B/obj':>11} {'slots B/obj':>12} {'saved':>6}")
+    for name, cls, kwargs in cases:
+        plain = unslotted(cls)
+        before = measure(lambda i: plain(**kwargs))
+        after = measure(lambda i: cls(**kwargs))
+        print(
+            f"{name:>12} {before:>11.0f} {after:>12.0f} " f"{1 - after / before:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
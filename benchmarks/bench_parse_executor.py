@@ -0,0 +1,67 @@
+"""Compare parsing many feeds on threads with parsing them in worker processes.
+
+This is the parse stage of rss.get_articles(parse_executor=...), measured on
+feeds already held in memory so that the network does not blur the result.
+
+Usage: poetry run python benchmarks/bench_parse_executor.py
+"""
+
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from newspy.shared import xml_parser
+
+ITEM = (
+    "<item>"
+    "<title><![CDATA[ Headline number {i} ]]></title>"
+    "<description><![CDATA[ <p>{body}</p> ]]></description>"
+    "<link>https://example.com/articles/{i}</link>"
+    "<pubDate>Sun, 12 Mar 2023 13:00:35 GMT</pubDate>"
+    "</item>"
+)
+FEEDS = 200
+
+
+def make_feed(items: int, body_size: int) -> bytes:
+    body = "lorem ipsum " * (body_size // 12)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel><title>Benchmark</title>'
+        + "".join(ITEM.format(i=i, body=body) for i in range(items))
+        + "</channel></rss>"
+    ).encode()
+
+
+def run(executor: Executor, feed: bytes) -> float:
+    backend = xml_parser.get_backend()
+    start = time.perf_counter()
+    futures = [
+        executor.submit(
+            xml_parser.parse_xml, feed, f"https://example.com/{i}", backend=backend
+        )
+        for i in range(FEEDS)
+    ]
+    for future in futures:
+        future.result()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    workers = os.cpu_count() or 1
+    feed = make_feed(items=200, body_size=500)
+    print(f"backend: {xml_parser.get_backend().value}, workers: {workers}")
+    print(f"{FEEDS} feeds of {len(feed) / 2**10:.0f} KiB")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        threads = run(executor, feed)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        run(executor, feed)  # Start the workers and import newspy in them.
+        processes = run(executor, feed)
+
+    print(f"{'threads':>10} {threads * 1e3:>8.1f} ms")
+    print(f"{'processes':>10} {processes * 1e3:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
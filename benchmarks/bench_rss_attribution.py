@@ -0,0 +1,64 @@
+"""Time rss.get_articles attribution as the number of sources grows.
+
+The HTTP layer is replaced by an in-memory client so only the work done
+by get_articles itself is measured. The time per article should stay
+flat as the number of sources grows.
+
+Usage: poetry run python benchmarks/bench_rss_attribution.py
+"""
+
+import time
+
+from newspy import rss
+from newspy.models import Category, Language
+from newspy.rss.models import RssSource
+from newspy.shared.http_client import HttpClient
+
+ITEMS_PER_FEED = 50
+
+
+class InMemoryHttpClient(HttpClient):
+    def send(self, method, url, headers=None, params=None, payload=None, **kwargs):
+        return [
+            {
+                "source_url": url,
+                "title": f"Article {i}",
+                "description": "",
+                "url": f"{url}/{i}",
+                "guid": f"{url}/{i}",
+                "published": "Sun, 12 Mar 2023 13:00:35 GMT",
+            }
+            for i in range(ITEMS_PER_FEED)
+        ]
+
+
+def make_sources(count: int) -> list[RssSource]:
+    return [
+        RssSource(
+            id=f"feed-{i}",
+            name=f"Feed {i}",
+            description="",
+            url=f"https://feeds.example.com/{i}.xml",
+            category=Category.GENERAL,
+            language=Language.EN,
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    http_client = InMemoryHttpClient()
+    print(f"{'sources':>8} {'articles':>9} {'seconds':>9} {'us/article':>11}")
+    for count in (250, 500, 1000, 2000, 4000):
+        sources = make_sources(count)
+        start = time.perf_counter()
+        articles = rss.get_articles(sources=sources, http_client=http_client)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{count:>8} {len(articles):>9} {elapsed:>9.3f} "
+            f"{elapsed / len(articles) * 1e6:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure the memory and speed of the seen-article sets.
+
+Adds COUNT distinct urls, then the same urls again as a repeated poll would,
+to an LRU SeenSet and to Bloom filter SeenSets, and compares them with a
+plain set of the url strings. The strings exist before the set is built, so
+only its references to them are counted; the SeenSets don't keep them.
+
+Usage: poetry run python benchmarks/bench_seen_set.py
+"""
+
+import time
+import tracemalloc
+from typing import Callable
+
+from newspy.shared.dedup import SeenSet
+
+COUNT = 100_000
+URLS = [
+    f"https://example.com/news/2023/03/12/article-{i}?utm_source=rss"
+    for i in range(COUNT)
+]
+
+
+def measure(name: str, factory: Callable[[], object], add: Callable) -> None:
+    # Timed without tracemalloc, which slows allocations down.
+    seen = factory()
+    began = time.perf_counter()
+    for url in URLS:
+        add(seen, url)
+    first = time.perf_counter() - began
+
+    began = time.perf_counter()
+    repeats = sum(not add(seen, url) for url in URLS)
+    second = time.perf_counter() - began
+
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    seen = factory()
+    for url in URLS:
+        add(seen, url)
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in end.compare_to(start, "filename"))
+    print(
+        f"{name:<24} {allocated / COUNT:8.1f} B/url"
+        f" {first / COUNT * 1e6:6.2f} us/new {second / COUNT * 1e6:6.2f} us/repeat"
+        f" {repeats / COUNT:7.2%} dropped"
+    )
+
+
+def add_to_set(seen: set, url: str) -> bool:
+    if url in seen:
+        return False
+    seen.add(url)
+    return True
+
+
+def main() -> None:
+    measure("set of strings", set, add_to_set)
+    measure("SeenSet LRU", lambda: SeenSet(max_size=COUNT), SeenSet.add)
+    for rate in (0.01, 0.001):
+        measure(
+            f"SeenSet Bloom p={rate}",
+            lambda: SeenSet(max_size=COUNT, false_positive_rate=rate),
+            SeenSet.add,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare filtering the RSS source catalog by rescanning it with SourceCatalog.
+
+Usage: poetry run python benchmarks/bench_source_catalog.py
+"""
+
+import csv
+import gzip
+import io
+import time
+
+from newspy.models import Category
+from newspy.rss.catalog import SourceCatalog, parse_catalog
+from newspy.rss.models import RssSource
+
+SOURCES = 20_000
+LANGUAGES = ("ar", "de", "en", "es", "fr", "it", "nl", "pt", "ru", "zh")
+REPEAT = 50
+
+
+def make_catalog() -> bytes:
+    rows = io.StringIO()
+    writer = csv.writer(rows)
+    writer.writerow(["id", "name", "description", "url", "category", "language"])
+    categories = [category.value for category in Category]
+    for i in range(SOURCES):
+        writer.writerow(
+            [
+                f"source-{i}",
+                f"Source {i}",
+                "",
+                f"https://example.com/{i}.xml",
+                categories[i % len(categories)],
+                LANGUAGES[i % len(LANGUAGES)],
+            ]
+        )
+    return gzip.compress(rows.getvalue().encode())
+
+
+def scan(data: bytes, category: str, language: str) -> list[RssSource]:
+    """The previous read_sources: decompress and rescan for every query."""
+    with gzip.open(io.BytesIO(data), "rt") as f:
+        return [
+            RssSource(**row)
+            for row in csv.DictReader(f)
+            if row["category"] == category and row["language"] == language
+        ]
+
+
+def measure(query) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        query()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main() -> None:
+    data = make_catalog()
+    source_catalog = SourceCatalog(parse_catalog(io.BytesIO(data)))
+    print(f"{SOURCES} sources")
+
+    cases = {
+        "rescan": lambda: scan(data, "business", "en"),
+        "catalog": lambda: source_catalog.filter(
+            category=Category.BUSINESS, language="en"
+        ),
+        "catalog x3": lambda: source_catalog.filter(
+            category=[Category.BUSINESS, Category.HEALTH, Category.SPORTS],
+            language=["en", "fr"],
+        ),
+    }
+    for name, query in cases.items():
+        print(f"{name:>12} {measure(query) * 1e3:>9.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare feed parsing throughput of the stdlib and lxml backends.
+
+Usage: poetry run python benchmarks/bench_xml_backends.py
+"""
+
+import time
+
+from newspy.shared import xml_parser
+from newspy.shared.xml_parser import XmlBackend
+
+ITEM = (
+    "<item>"
+    "<title><![CDATA[ Headline number {i} ]]></title>"
+    "<description><![CDATA[ <p>{body}</p> ]]></description>"
+    "<link>https://example.com/articles/{i}</link>"
+    '<guid isPermaLink="false">{i}</guid>'
+    "<pubDate>Sun, 12 Mar 2023 13:00:35 GMT</pubDate>"
+    "<category>News</category>"
+    "</item>"
+)
+REPEAT = 20
+
+
+def make_feed(items: int, body_size: int) -> bytes:
+    body = "lorem ipsum " * (body_size // 12)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel><title>Benchmark</title>'
+        + "".join(ITEM.format(i=i, body=body) for i in range(items))
+        + "</channel></rss>"
+    ).encode()
+
+
+def main() -> None:
+    backends = [XmlBackend.STDLIB]
+    if xml_parser.lxml_etree is not None:
+        backends.append(XmlBackend.LXML)
+    else:
+        print("lxml is not installed: only the stdlib backend is measured")
+
+    print(f"{'backend':>8} {'items':>6} {'feed MB':>8} {'ms/feed':>8} {'MB/s':>7}")
+    for items, body_size in ((50, 200), (500, 200), (2000, 2000)):
+        feed = make_feed(items, body_size)
+        size = len(feed) / 2**20
+        for backend in backends:
+            xml_parser.set_backend(backend)
+            start = time.perf_counter()
+            for _ in range(REPEAT):
+                xml_parser.parse_xml(data=feed, source_url="https://example.com")
+            elapsed = (time.perf_counter() - start) / REPEAT
+            print(
+                f"{backend.value:>8} {items:>6} {size:>8.2f} "
+                f"{elapsed * 1e3:>8.2f} {size / elapsed:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
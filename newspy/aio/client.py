@@ -0,0 +1,66 @@
+import asyncio
+
+from newspy.aio import newsorg, rss
+from newspy.aio.http_client import AsyncHttpClient, get_async_http_client
+from newspy.models import Article, Category, Channel, Country, Language, Source
+from newspy.shared.dedup import SeenSet
+
+channels = {
+    Channel.NEWSORG: newsorg,
+    Channel.RSS: rss,
+}
+
+
+async def get_sources(
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    http_client: AsyncHttpClient | None = None,
+) -> list[Source]:
+    client = http_client or get_async_http_client()
+    results = await asyncio.gather(
+        *[
+            channels[key].get_sources(
+                category=category,
+                country=country,
+                language=language,
+                http_client=client,
+            )
+            for key in channels
+        ]
+    )
+
+    return [r.to_source() for result in results for r in result]
+
+
+async def get_articles(
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    http_client: AsyncHttpClient | None = None,
+    seen: SeenSet | None = None,
+) -> list[Article]:
+    """
+    :param seen:
+        Only return the articles whose url, else guid, is not in this set
+        yet, and add them to it, as newspy.client.get_articles
+    """
+    client = http_client or get_async_http_client()
+    results = await asyncio.gather(
+        *[
+            channels[key].get_articles(
+                category=category,
+                country=country,
+                language=language,
+                http_client=client,
+            )
+            for key in channels
+        ]
+    )
+
+    return [
+        r.to_article()
+        for result in results
+        for r in result
+        if seen is None or seen.add(r.dedup_key)
+    ]
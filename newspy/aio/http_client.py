@@ -0,0 +1,343 @@
+import asyncio
+import json
+import weakref
+from datetime import datetime
+from xml.etree import ElementTree
+
+from requests.structures import CaseInsensitiveDict
+
+from newspy.shared.exceptions import NewspyException, NewspyHttpException
+from newspy.shared.http_client import (
+    NOT_MODIFIED,
+    HttpClient,
+    HttpMethod,
+    NotModified,
+    Validators,
+    get_http_client,
+    request_url,
+)
+from newspy.shared.xml_parser import CHUNK_SIZE, FeedParser
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - depends on the environment
+    aiohttp = None
+
+DEFAULT_MAX_CONCURRENCY = 100
+XML_CONTENT_TYPES = ("application/rss+xml", "application/xml", "text/xml")
+
+
+class AsyncHttpClient:
+    MAX_RETRIES = 3
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        limit_per_host: int = 0,
+        requests_timeout: int = 5,
+        status_forcelist: tuple = (429, 500, 502, 503, 504),
+        retries: int = MAX_RETRIES,
+        backoff_factor: float = 0.3,
+        use_aiohttp: bool | None = None,
+        http_client: HttpClient | None = None,
+    ) -> None:
+        """
+        :param max_concurrency:
+            Maximum number of requests in flight at the same time
+        :param limit_per_host:
+            Maximum number of simultaneous connections to the same host.
+            Zero means no limit besides max_concurrency
+        :param requests_timeout:
+            Stop waiting for a response after a given number of seconds
+        :param status_forcelist:
+            Status codes on which requests are retried
+        :param retries:
+            Number of times to retry on bad status codes and connection errors
+        :param backoff_factor:
+            A backoff factor to apply between attempts after the second try
+        :param use_aiohttp:
+            Send requests with aiohttp. Defaults to True when aiohttp is
+            installed. When False the requests are sent by a pooled HttpClient
+            on worker threads, still bounded by max_concurrency
+        :param http_client:
+            The HttpClient used when aiohttp is not used. Defaults to a new
+            one, closed with this client
+        """
+        if use_aiohttp is None:
+            use_aiohttp = aiohttp is not None
+
+        if use_aiohttp and aiohttp is None:
+            raise NewspyException(
+                msg="aiohttp is not installed. Install it with 'pip install aiohttp'.",
+            )
+
+        self._use_aiohttp = use_aiohttp
+        self._max_concurrency = max_concurrency
+        self._limit_per_host = limit_per_host
+        self._requests_timeout = requests_timeout
+        self._status_forcelist = status_forcelist
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+        self._validators: dict[str, Validators] = {}
+
+        self._owns_http_client = not use_aiohttp and http_client is None
+        if self._owns_http_client:
+            http_client = HttpClient(pool_maxsize=max_concurrency)
+        self._http_client = http_client
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        # The session binds to the running event loop, so it is created lazily.
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._max_concurrency,
+                    limit_per_host=self._limit_per_host,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self._requests_timeout),
+            )
+
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        if self._owns_http_client:
+            self._http_client.close()
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def send(
+        self,
+        method: HttpMethod,
+        url: str,
+        headers: dict | None = None,
+        params: dict | None = None,
+        payload: dict | None = None,
+        conditional: bool = False,
+        max_items: int | None = None,
+        since: datetime | None = None,
+        raw: bool = False,
+        retry_rate_limited: bool = True,
+    ) -> dict | list | bytes | str | NotModified | None:
+        """Takes the arguments of HttpClient.send."""
+        async with self._semaphore:
+            if not self._use_aiohttp:
+                return await asyncio.to_thread(
+                    self._http_client.send,
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    payload=payload,
+                    conditional=conditional,
+                    max_items=max_items,
+                    since=since,
+                    raw=raw,
+                    retry_rate_limited=retry_rate_limited,
+                )
+
+            return await self._send(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                payload=payload,
+                conditional=conditional,
+                max_items=max_items,
+                since=since,
+                raw=raw,
+                retry_rate_limited=retry_rate_limited,
+            )
+
+    async def _send(
+        self,
+        method: HttpMethod,
+        url: str,
+        headers: dict | None,
+        params: dict | None,
+        payload: dict | None,
+        conditional: bool,
+        max_items: int | None,
+        since: datetime | None,
+        raw: bool,
+        retry_rate_limited: bool,
+    ) -> dict | list | bytes | str | NotModified | None:
+        args = {}
+        if payload:
+            if headers["Content-Type"] == "application/json":
+                args["data"] = json.dumps(payload)
+            else:
+                args["data"] = str(payload)
+
+        validators_key = request_url(url, params)
+        if conditional and validators_key in self._validators:
+            validators = self._validators[validators_key]
+            headers = dict(headers or {})
+            if validators.etag:
+                headers["If-None-Match"] = validators.etag
+            if validators.last_modified:
+                headers["If-Modified-Since"] = validators.last_modified
+
+        session = self._get_session()
+        for attempt in range(self._retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff_factor * (2 ** (attempt - 1)))
+
+            try:
+                async with session.request(
+                    method.value, url, headers=headers, params=params, **args
+                ) as response:
+                    if response.status in self._status_forcelist and (
+                        retry_rate_limited or response.status != 429
+                    ):
+                        if attempt < self._retries:
+                            continue
+
+                        raise NewspyHttpException(
+                            status_code=429,
+                            msg="%s:\n %s" % (response.url, "Max Retries"),
+                            reason="too many %s error responses" % response.status,
+                        )
+
+                    if response.status == 304:
+                        return NOT_MODIFIED
+
+                    if response.status >= 400:
+                        raise _http_exception(response, await response.read())
+
+                    if raw:
+                        results = await response.read()
+                    else:
+                        content_type = None
+                        if headers and "Content-Type" in headers:
+                            content_type = headers["Content-Type"]
+                        elif response.content_type:
+                            content_type = response.content_type
+
+                        if content_type in XML_CONTENT_TYPES:
+                            results = await _parse_xml_stream(
+                                response, url, max_items=max_items, since=since
+                            )
+                        else:
+                            results = _decode(
+                                content_type=content_type,
+                                body=await response.read(),
+                                charset=response.charset,
+                                url=url,
+                            )
+
+                    # As in HttpClient.send, only a body read and decoded in
+                    # full may be revalidated later.
+                    if conditional and results is not None:
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                        if etag or last_modified:
+                            self._validators[validators_key] = Validators(
+                                etag=etag, last_modified=last_modified
+                            )
+                        else:
+                            self._validators.pop(validators_key, None)
+
+                    return results
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                if attempt < self._retries:
+                    continue
+
+                raise NewspyException(msg=f"{url}: connection failed", reason=str(exc))
+            except aiohttp.ClientError as exc:
+                # E.g. a body cut short of its Content-Length.
+                raise NewspyException(msg=f"{url}: request failed", reason=str(exc))
+
+
+# One client per event loop, as aiohttp sessions are bound to their loop.
+_default_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """Return the AsyncHttpClient shared in the running event loop.
+
+    The client is created on first use and reused by the following calls,
+    so that they keep the pooled connections alive. Without aiohttp it sends
+    the requests with the process-wide HttpClient.
+    """
+    loop = asyncio.get_running_loop()
+    client = _default_clients.get(loop)
+    if client is None:
+        client = _default_clients[loop] = AsyncHttpClient(
+            http_client=None if aiohttp is not None else get_http_client()
+        )
+
+    return client
+
+
+async def close_async_http_client() -> None:
+    """Close the AsyncHttpClient shared in the running event loop, e.g.
+    before the loop ends. The next call creates a new one."""
+    client = _default_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def _http_exception(response: "aiohttp.ClientResponse", body: bytes) -> Exception:
+    try:
+        error = json.loads(body).get("error", {})
+        msg = error.get("message")
+        reason = error.get("reason")
+    except (AttributeError, ValueError):
+        msg = body.decode(response.charset or "utf-8", errors="replace") or None
+        reason = None
+
+    return NewspyHttpException(
+        status_code=response.status,
+        msg="%s:\n %s" % (response.url, msg),
+        reason=reason,
+        headers=CaseInsensitiveDict(response.headers),
+    )
+
+
+async def _parse_xml_stream(
+    response: "aiohttp.ClientResponse",
+    url: str,
+    max_items: int | None = None,
+    since: datetime | None = None,
+) -> list[dict[str, str]] | None:
+    parser = FeedParser(url, max_items=max_items, since=since)
+    items = []
+    try:
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            items.extend(parser.feed(chunk))
+            if parser.done:
+                break
+        items.extend(parser.close())
+    except ElementTree.ParseError:
+        return None
+    except aiohttp.ClientError as exc:
+        raise NewspyException(msg=f"{url}: reading the feed failed", reason=str(exc))
+
+    return items if items else None
+
+
+def _decode(
+    content_type: str | None, body: bytes, charset: str | None, url: str
+) -> dict | list | bytes | str | None:
+    try:
+        match content_type:
+            case "application/json":
+                return json.loads(body)
+            case "application/zip":
+                return body
+            case _:
+                try:
+                    return json.loads(body)
+                except ValueError:
+                    return body.decode(charset or "utf-8", errors="replace")
+    except (TypeError, ValueError):
+        return None
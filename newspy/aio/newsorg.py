@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from datetime import date
+
+from newspy import client as newspy_client
+from newspy.aio.http_client import AsyncHttpClient, get_async_http_client
+from newspy.models import Category, Country, Language
+from newspy.newsorg.client import (
+    BASE_URL,
+    create_articles_params,
+    create_sources_params,
+    create_url,
+    is_rate_limited,
+    response_cache,
+)
+from newspy.newsorg.models import (
+    NewsorgArticle,
+    NewsorgArticlesRes,
+    NewsorgEndpoint,
+    NewsorgSource,
+    NewsorgSourceRes,
+)
+from newspy.shared.cache import cache_key
+from newspy.shared.exceptions import NewspyException, NewspyHttpException
+from newspy.shared.http_client import HttpMethod
+from newspy.shared.key_pool import ApiKeyPool
+from newspy.shared.rate_limiter import retry_after
+
+logger = logging.getLogger(__name__)
+
+
+async def get_articles(
+    endpoint: NewsorgEndpoint = NewsorgEndpoint.TOP_HEADLINES,
+    search_text: str | None = None,
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    sources: list[NewsorgSource] | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    page_size: int | None = None,
+    page: int | None = None,
+    http_client: AsyncHttpClient | None = None,
+) -> list[NewsorgArticle]:
+    params = create_articles_params(
+        endpoint=endpoint,
+        search_text=search_text,
+        category=category,
+        country=country,
+        language=language,
+        sources=sources,
+        from_date=from_date,
+        to_date=to_date,
+        page_size=page_size,
+        page=page,
+    )
+
+    client = http_client or get_async_http_client()
+    resp_json = await _send(
+        client, url=create_url(endpoint=endpoint), params=params, ttl=endpoint
+    )
+
+    try:
+        article_res = NewsorgArticlesRes(**resp_json)
+    except TypeError as exc:
+        raise NewspyException(
+            msg=f"Failed to validate the News Org articles response json: {resp_json}",
+            reason=str(exc),
+        )
+
+    return article_res.articles
+
+
+async def get_sources(
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    http_client: AsyncHttpClient | None = None,
+) -> list[NewsorgSource]:
+    params = create_sources_params(
+        category=category, language=language, country=country
+    )
+
+    client = http_client or get_async_http_client()
+    resp_json = await _send(
+        client, url=f"{BASE_URL}/top-headlines/sources", params=params, ttl="SOURCES"
+    )
+
+    try:
+        source_res = NewsorgSourceRes(**resp_json)
+    except TypeError as exc:
+        raise NewspyException(
+            msg=f"Failed to validate the News Org sources response json: {resp_json}",
+            reason=str(exc),
+        )
+
+    return source_res.sources
+
+
+async def _send(client: AsyncHttpClient, url: str, params: dict, ttl: str) -> dict:
+    # The configured newsorg_cache is used as by newsorg.client, but the
+    # concurrent requests of a missing response are not merged into one.
+    cache, seconds = response_cache(ttl)
+    if cache is None:
+        return await _fetch(client, url, params)
+
+    key = cache_key(url, params)
+    resp_json = await asyncio.to_thread(cache.get, key)
+    if resp_json is None:
+        resp_json = await _fetch(client, url, params)
+        if resp_json is not None:
+            await asyncio.to_thread(cache.set, key, resp_json, seconds)
+
+    return resp_json
+
+
+async def _fetch(client: AsyncHttpClient, url: str, params: dict) -> dict:
+    key_pool = newspy_client.default_client_config.get("newsorg_key_pool")
+    if key_pool is None:
+        return await client.send(method=HttpMethod.GET, url=url, params=params)
+
+    return await _fetch_with_pool(client, url, params, key_pool)
+
+
+async def _fetch_with_pool(
+    client: AsyncHttpClient, url: str, params: dict, key_pool: ApiKeyPool
+) -> dict:
+    # As newsorg.client: a rate limited key is left out and the request
+    # sent at once with the next one.
+    for _ in range(len(key_pool)):
+        key = key_pool.acquire()
+        try:
+            return await client.send(
+                method=HttpMethod.GET,
+                url=url,
+                params={**params, "apiKey": key},
+                retry_rate_limited=False,
+            )
+        except NewspyHttpException as exc:
+            if not is_rate_limited(exc):
+                raise
+            key_pool.evict(key, retry_after(exc.headers))
+
+    return await client.send(
+        method=HttpMethod.GET,
+        url=url,
+        params={**params, "apiKey": key_pool.acquire()},
+        retry_rate_limited=False,
+    )
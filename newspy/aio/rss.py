@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import requests
+
+from newspy.aio.http_client import AsyncHttpClient, get_async_http_client
+from newspy.models import Category
+from newspy.rss import catalog
+from newspy.rss.client import (
+    DEFAULT_SOURCES_URL,
+    DEFAULT_USER_AGENT,
+    URL,
+)
+from newspy.rss.models import RssArticle, RssSource
+from newspy.shared.dedup import SeenSet, article_key
+from newspy.shared.exceptions import NewspyException
+from newspy.shared.http_client import HttpMethod
+from newspy.shared.xml_parser import get_backend, parse_xml
+
+logger = logging.getLogger(__name__)
+
+
+async def get_articles(
+    category: Category | None = None,
+    language: str | None = None,
+    sources: list[RssSource] | None = None,
+    http_client: AsyncHttpClient | None = None,
+    conditional: bool = False,
+    max_items: int | None = None,
+    since: datetime | None = None,
+    parse_executor: Executor | None = None,
+    seen: SeenSet | None = None,
+    **kwargs,
+) -> list[RssArticle]:
+    """
+    :param parse_executor:
+        Parse the feeds in this executor, typically a ProcessPoolExecutor,
+        so that the event loop only downloads them
+    :param seen:
+        Only return the articles whose url, else guid, is not in this set
+        yet, and add them to it, as rss.get_articles
+    """
+    client = http_client or get_async_http_client()
+    if not sources:
+        sources = await get_sources(
+            category=category, language=language, http_client=client
+        )
+
+    results = await asyncio.gather(
+        *[
+            _get_source_articles(
+                client,
+                source,
+                conditional=conditional,
+                max_items=max_items,
+                since=since,
+                parse_executor=parse_executor,
+                seen=seen,
+            )
+            for source in sources
+        ]
+    )
+
+    return [article for articles in results for article in articles]
+
+
+async def _get_source_articles(
+    http_client: AsyncHttpClient,
+    source: RssSource,
+    conditional: bool = False,
+    max_items: int | None = None,
+    since: datetime | None = None,
+    parse_executor: Executor | None = None,
+    seen: SeenSet | None = None,
+) -> list[RssArticle]:
+    raw = parse_executor is not None
+    try:
+        resp_json = await http_client.send(
+            method=HttpMethod.GET,
+            url=source.url,
+            headers={"User-Agent": DEFAULT_USER_AGENT},
+            conditional=conditional,
+            max_items=max_items,
+            since=since,
+            raw=raw,
+        )
+    except NewspyException as exc:
+        logger.warning("Skipping a source due to error: %s", exc)
+        return []
+
+    if raw and resp_json and isinstance(resp_json, bytes):
+        resp_json = await asyncio.get_running_loop().run_in_executor(
+            parse_executor,
+            functools.partial(
+                parse_xml,
+                resp_json,
+                source.url,
+                max_items=max_items,
+                since=since,
+                backend=get_backend(),
+            ),
+        )
+
+    if not resp_json or not isinstance(resp_json, list):
+        return []
+
+    return [
+        RssArticle(
+            source=source,
+            title=article["title"],
+            description=article["description"],
+            url=article["url"],
+            published=article["published"],
+            guid=article["guid"],
+        )
+        for article in resp_json
+        if seen is None or seen.add(article_key(article["url"], article["guid"]))
+    ]
+
+
+async def get_sources(
+    category: Category | Iterable[Category] | None = None,
+    language: str | Iterable[str] | None = None,
+    file_path: Path | URL = DEFAULT_SOURCES_URL,
+    http_client: AsyncHttpClient | None = None,
+    max_age: float = catalog.DEFAULT_MAX_AGE,
+    cache_dir: Path | None = None,
+    **kwargs,
+) -> list[RssSource]:
+    """
+    Takes the same arguments as rss.get_sources. A stale cached catalog is
+    downloaded again rather than revalidated.
+    """
+    # Reading files and parsing the catalog is blocking work.
+    if isinstance(file_path, Path):
+        source_catalog = await asyncio.to_thread(catalog.read_catalog, file_path)
+    elif isinstance(file_path, str):
+        source_catalog = await asyncio.to_thread(
+            catalog.get_cached_catalog, file_path, max_age=max_age, cache_dir=cache_dir
+        )
+        if source_catalog is None:
+            source_catalog = await _download_catalog(file_path, http_client, cache_dir)
+    else:
+        return []
+
+    return source_catalog.filter(category=category, language=language)
+
+
+async def _download_catalog(
+    url: str, http_client: AsyncHttpClient | None, cache_dir: Path | None
+) -> catalog.SourceCatalog:
+    try:
+        client = http_client or get_async_http_client()
+        body = await client.send(
+            method=HttpMethod.GET,
+            url=url,
+            headers={"Content-Type": "application/zip"},
+        )
+        return await asyncio.to_thread(
+            catalog.store_catalog, url, body, cache_dir=cache_dir
+        )
+    except (NewspyException, requests.exceptions.RequestException) as exc:
+        if not catalog.can_fall_back(exc):
+            raise
+        return await asyncio.to_thread(
+            catalog.get_fallback_catalog, url, cache_dir=cache_dir, error=exc
+        )
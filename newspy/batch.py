@@ -0,0 +1,243 @@
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+from newspy.models import Article, Source
+from newspy.shared.exceptions import NewspyException
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover - depends on the environment
+    pyarrow = None
+
+
+class ArticleBatch:
+    """Column-oriented articles.
+
+    Each field is stored in its own column instead of one Article object per
+    row: strings in lists, publication times as epoch seconds in an array of
+    doubles (NaN when unknown) and sources as small integer ids into
+    the sources list. The columns are exposed as is, without copies, and must
+    not be modified.
+    """
+
+    __slots__ = (
+        "slugs",
+        "urls",
+        "url_to_images",
+        "titles",
+        "abstracts",
+        "authors",
+        "published",
+        "source_ids",
+        "sources",
+        "_source_ids_by_source",
+    )
+
+    def __init__(self) -> None:
+        self.slugs: list[str] = []
+        self.urls: list[str] = []
+        self.url_to_images: list[str | None] = []
+        self.titles: list[str] = []
+        self.abstracts: list[str] = []
+        self.authors: list[str | None] = []
+        self.published = array("d")
+        self.source_ids = array("I")
+        self.sources: list[Source] = []
+        self._source_ids_by_source: dict[Source, int] = {}
+
+    @classmethod
+    def from_articles(cls, articles: Iterable[Article]) -> "ArticleBatch":
+        batch = cls()
+        for article in articles:
+            batch.append_article(article)
+
+        return batch
+
+    def append(
+        self,
+        slug: str,
+        url: str,
+        url_to_image: str | None,
+        title: str,
+        abstract: str,
+        author: str | None,
+        source: Source,
+        published: datetime | None,
+    ) -> None:
+        """
+        :param published:
+            None when unknown. Naive datetimes are taken as UTC
+        """
+        source_id = self._source_ids_by_source.get(source)
+        if source_id is None:
+            source_id = len(self.sources)
+            self.sources.append(source)
+            self._source_ids_by_source[source] = source_id
+
+        if published is None:
+            timestamp = math.nan
+        elif published.tzinfo is None:
+            timestamp = published.replace(tzinfo=timezone.utc).timestamp()
+        else:
+            timestamp = published.timestamp()
+
+        self.slugs.append(slug)
+        self.urls.append(url)
+        self.url_to_images.append(url_to_image)
+        self.titles.append(title)
+        self.abstracts.append(abstract)
+        self.authors.append(author)
+        self.published.append(timestamp)
+        self.source_ids.append(source_id)
+
+    def append_article(self, article: Article) -> None:
+        self.append(
+            slug=article.slug,
+            url=article.url,
+            url_to_image=article.url_to_image,
+            title=article.title,
+            abstract=article.abstract,
+            author=article.author,
+            source=article.source,
+            published=article.published,
+        )
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __getitem__(self, index: int) -> "ArticleView":
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ArticleBatch index out of range")
+
+        return ArticleView(self, index)
+
+    def __iter__(self) -> Iterator["ArticleView"]:
+        for index in range(len(self)):
+            yield ArticleView(self, index)
+
+    def to_articles(self) -> list[Article]:
+        return [view.to_article() for view in self]
+
+    def to_numpy(self) -> dict:
+        """Return the columns as NumPy arrays.
+
+        published and source_ids share the memory of the batch, which cannot
+        grow while they are alive; the string columns are object arrays.
+        """
+        if numpy is None:
+            raise NewspyException(
+                msg="numpy is not installed. Install it with 'pip install numpy'.",
+            )
+
+        columns = {
+            name: numpy.array(getattr(self, name), dtype=object)
+            for name in _STRING_COLUMNS
+        }
+        columns["published"] = numpy.frombuffer(self.published, dtype=numpy.float64)
+        columns["source_ids"] = numpy.frombuffer(
+            self.source_ids, dtype=numpy.dtype(f"u{self.source_ids.itemsize}")
+        )
+
+        return columns
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """Return the batch as a pyarrow Table.
+
+        published is a UTC timestamp column, null when unknown. source_id and
+        source are dictionary-encoded with the source ids of the batch.
+        """
+        if pyarrow is None:
+            raise NewspyException(
+                msg="pyarrow is not installed. Install it with 'pip install pyarrow'.",
+            )
+
+        columns = {name: pyarrow.array(getattr(self, name)) for name in _STRING_COLUMNS}
+        columns["published"] = pyarrow.array(
+            [
+                None if math.isnan(timestamp) else round(timestamp * 1_000_000)
+                for timestamp in self.published
+            ],
+            type=pyarrow.timestamp("us", tz="UTC"),
+        )
+        source_ids = pyarrow.array(self.source_ids, type=pyarrow.int32())
+        columns["source_id"] = pyarrow.DictionaryArray.from_arrays(
+            source_ids, pyarrow.array([source.id for source in self.sources])
+        )
+        columns["source"] = pyarrow.DictionaryArray.from_arrays(
+            source_ids, pyarrow.array([source.name for source in self.sources])
+        )
+
+        return pyarrow.table(columns)
+
+
+_STRING_COLUMNS = ("slugs", "urls", "url_to_images", "titles", "abstracts", "authors")
+
+
+class ArticleView:
+    """A row of an ArticleBatch, read from the columns on access."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: ArticleBatch, index: int) -> None:
+        self._batch = batch
+        self._index = index
+
+    @property
+    def slug(self) -> str:
+        return self._batch.slugs[self._index]
+
+    @property
+    def url(self) -> str:
+        return self._batch.urls[self._index]
+
+    @property
+    def url_to_image(self) -> str | None:
+        return self._batch.url_to_images[self._index]
+
+    @property
+    def title(self) -> str:
+        return self._batch.titles[self._index]
+
+    @property
+    def abstract(self) -> str:
+        return self._batch.abstracts[self._index]
+
+    @property
+    def author(self) -> str | None:
+        return self._batch.authors[self._index]
+
+    @property
+    def source(self) -> Source:
+        return self._batch.sources[self._batch.source_ids[self._index]]
+
+    @property
+    def published(self) -> datetime | None:
+        timestamp = self._batch.published[self._index]
+        if math.isnan(timestamp):
+            return None
+
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+    def to_article(self) -> Article:
+        return Article(
+            slug=self.slug,
+            url=self.url,
+            url_to_image=self.url_to_image,
+            title=self.title,
+            abstract=self.abstract,
+            author=self.author,
+            source=self.source,
+            published=self.published,
+        )
+
+    def __repr__(self) -> str:
+        return f"ArticleView(slug={self.slug!r}, source={self.source!r})"
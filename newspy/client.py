@@ -1,10 +1,27 @@
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Full, Queue
+from typing import Iterable, Iterator
 
 from newspy import newsorg, rss
+from newspy.batch import ArticleBatch
 from newspy.models import Article, Category, Channel, Country, Language, Source
-
+from newspy.shared.cache import ResponseCache
+from newspy.shared.dedup import SeenSet
+from newspy.shared.http_client import close_http_client, set_rate_limiter
+from newspy.shared.key_pool import ApiKeyPool
+from newspy.shared.rate_limiter import RateLimiter
+
+# Replaced as a whole by configure, never mutated, so threads reading it
+# always see a complete configuration.
 default_client_config = {}
+_config_lock = threading.Lock()
+
+_CHANNEL_DONE = object()
+_MAX_QUEUED_ARTICLES = 256
+# Seconds between the checks of a producer waiting for room in the queue.
+_PUT_INTERVAL = 0.1
 
 channels = {
     Channel.NEWSORG: newsorg,
@@ -12,15 +29,58 @@ channels = {
 }
 
 
-def configure(newsorg_api_key: str | None = None) -> None:
+def configure(
+    newsorg_api_key: str | Iterable[str] | ApiKeyPool | None = None,
+    newsorg_cache: ResponseCache | None = None,
+    newsorg_cache_ttls: dict[str, float] | None = None,
+    rate_limiter: RateLimiter | None = None,
+) -> None:
+    """
+    :param newsorg_api_key:
+        A key, or several keys that the Newsorg requests take in turn,
+        as a list or an ApiKeyPool. Defaults to the NEWSORG_API_KEY
+        environment variable, whose keys may be separated by commas
+    :param newsorg_cache:
+        Answer identical Newsorg queries from this cache, e.g. a MemoryCache
+        or a DiskCache, while they are fresh. Not cached by default
+    :param newsorg_cache_ttls:
+        Seconds during which the responses of each endpoint ("EVERYTHING",
+        "TOP_HEADLINES" or "SOURCES") stay fresh, overriding
+        newsorg.client.DEFAULT_CACHE_TTLS. 0 disables caching the endpoint
+    :param rate_limiter:
+        Space out the requests of the shared HTTP client per host and API key,
+        e.g. RateLimiter(rate=1, burst=5, hosts=["newsapi.org"])
+    """
     global default_client_config
 
     if newsorg_api_key is None:
         newsorg_api_key = os.getenv("NEWSORG_API_KEY")
-
-    default_client_config = {
-        "newsorg_api_key": newsorg_api_key,
-    }
+        if newsorg_api_key and "," in newsorg_api_key:
+            newsorg_api_key = newsorg_api_key.split(",")
+
+    key_pool = None
+    if isinstance(newsorg_api_key, ApiKeyPool):
+        key_pool = newsorg_api_key
+    elif newsorg_api_key and not isinstance(newsorg_api_key, str):
+        key_pool = ApiKeyPool(key.strip() for key in newsorg_api_key)
+    if key_pool is not None:
+        # Params are built with the first key and sent with the pool's.
+        newsorg_api_key = key_pool.keys[0]
+
+    with _config_lock:
+        default_client_config = {
+            "newsorg_api_key": newsorg_api_key,
+            "newsorg_key_pool": key_pool,
+            "newsorg_cache": newsorg_cache,
+            "newsorg_cache_ttls": dict(newsorg_cache_ttls or {}),
+            "rate_limiter": rate_limiter,
+        }
+        set_rate_limiter(rate_limiter)
+
+
+def close() -> None:
+    """Release the pooled connections shared by the RSS and Newsorg clients."""
+    close_http_client()
 
 
 def get_sources(
@@ -50,23 +110,106 @@ def get_articles(
     category: Category | None = None,
     country: Country | None = None,
     language: Language | None = None,
+    seen: SeenSet | None = None,
 ) -> list[Article]:
-    articles = []
-    with ThreadPoolExecutor() as executor:
-        futures = [
-            executor.submit(
-                channels[key].client.get_articles,
-                category=category,
-                country=country,
-                language=language,
-            )
-            for key in channels
-        ]
+    return list(
+        iter_articles(category=category, country=country, language=language, seen=seen)
+    )
 
-        for future in as_completed(futures):
-            articles.extend([r.to_article() for r in future.result()])
 
-    return articles
+def iter_articles(
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    seen: SeenSet | None = None,
+) -> Iterator[Article]:
+    """Yield articles from all channels as soon as each source is fetched.
+
+    :param seen:
+        Only yield the articles whose url, else guid, is not in this set yet,
+        and add them to it. Repeats are dropped before they are converted to
+        Article
+    """
+    for article in _iter_channel_articles(
+        category=category, country=country, language=language, seen=seen
+    ):
+        yield article.to_article()
+
+
+def get_article_batch(
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    seen: SeenSet | None = None,
+) -> ArticleBatch:
+    """Return the articles from all channels as a column-oriented batch.
+
+    The channel articles are appended to the batch columns directly, without
+    building an Article per row. Articles with an unparsable publication
+    date are kept, with an unknown date. seen is that of iter_articles.
+    """
+    batch = ArticleBatch()
+    for article in _iter_channel_articles(
+        category=category, country=country, language=language, seen=seen
+    ):
+        article.append_to(batch)
+
+    return batch
+
+
+def _iter_channel_articles(
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    seen: SeenSet | None = None,
+) -> Iterator:
+    # Bounded, so that the producers wait for a slow consumer instead of
+    # holding the whole crawl in memory.
+    results: Queue = Queue(maxsize=_MAX_QUEUED_ARTICLES)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=_PUT_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce(channel_client) -> None:
+        articles = channel_client.iter_articles(
+            category=category,
+            country=country,
+            language=language,
+        )
+        try:
+            for article in articles:
+                if not put(article):
+                    break
+        finally:
+            # Stops fetching the remaining sources when the consumer is gone.
+            articles.close()
+            put(_CHANNEL_DONE)
+
+    executor = ThreadPoolExecutor()
+    futures = [executor.submit(produce, channels[key].client) for key in channels]
+    try:
+        pending = len(futures)
+        while pending:
+            article = results.get()
+            if article is _CHANNEL_DONE:
+                pending -= 1
+            elif seen is None or seen.add(article.dedup_key):
+                yield article
+
+        for future in futures:
+            future.result()
+    finally:
+        # When the consumer stops early, don't wait for the requests in
+        # flight: the producers stop at their next article.
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def get_categories() -> list[Category]:
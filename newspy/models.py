@@ -1,6 +1,10 @@
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar("T")
 
 
 class Language(str, Enum):
@@ -94,7 +98,7 @@ class Channel(str, Enum):
     RSS = "RSS"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Source:
     """Publisher domain model"""
 
@@ -106,7 +110,7 @@ class Source:
         return f"{self.name}-{self.channel.value}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     """Publication domain model"""
 
@@ -118,3 +122,57 @@ class Article:
     author: str | None
     source: Source
     published: datetime
+
+
+class SourceRegistry:
+    """Interns sources so that all the articles of a publisher share one object.
+
+    Lookups are lock-free; the lock only serializes registrations.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[Hashable, object] = {}
+        self._lock = threading.Lock()
+
+    def get_source(self, id: str, name: str, channel: Channel) -> Source:
+        """Return the Source registered for (channel, id).
+
+        A publisher that has been renamed gets a new Source, which replaces
+        the previous one.
+        """
+        key = (channel, id)
+        source = self._sources.get(key)
+        if source is not None and source.name == name:
+            return source
+
+        with self._lock:
+            source = self._sources.get(key)
+            if source is None or source.name != name:
+                source = Source(id=id, name=name, channel=channel)
+                self._sources[key] = source
+
+            return source
+
+    def intern(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Return the object registered under the key, creating it on first use."""
+        value = self._sources.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            value = self._sources.get(key)
+            if value is None:
+                value = factory()
+                self._sources[key] = value
+
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sources.clear()
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+
+source_registry = SourceRegistry()
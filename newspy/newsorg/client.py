@@ -1,5 +1,8 @@
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from typing import Iterable, Iterator
 
 from newspy import client
 from newspy.models import Country, Language, Category
@@ -9,13 +12,26 @@ from newspy.newsorg.models import (
     NewsorgSource,
     NewsorgArticle,
     NewsorgEndpoint,
+    NewsorgQuery,
 )
-from newspy.shared.exceptions import NewspyException
-from newspy.shared.http_client import HttpClient, HttpMethod
+from newspy.shared.cache import ResponseCache, cache_key
+from newspy.shared.dedup import SeenSet
+from newspy.shared.exceptions import NewspyException, NewspyHttpException
+from newspy.shared.http_client import HttpClient, HttpMethod, get_http_client
+from newspy.shared.key_pool import ApiKeyPool
+from newspy.shared.rate_limiter import retry_after
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://newsapi.org/v2"
+DEFAULT_PAGE_SIZE = 100
+# Seconds during which a cached response of each endpoint is used, when
+# a newsorg_cache is configured. Headlines change faster than searches.
+DEFAULT_CACHE_TTLS = {
+    "EVERYTHING": 15 * 60,
+    "TOP_HEADLINES": 5 * 60,
+    "SOURCES": 24 * 60 * 60,
+}
 
 
 def create_url(endpoint: NewsorgEndpoint) -> str:
@@ -93,7 +109,7 @@ def create_articles_params(
             params["to"] = to_date.strftime("%Y-%m-%d")
 
     if not page_size:
-        page_size = 100
+        page_size = DEFAULT_PAGE_SIZE
     params["pageSize"] = page_size
 
     if not page:
@@ -138,6 +154,7 @@ def get_articles(
     to_date: date | None = None,
     page_size: int | None = None,
     page: int | None = None,
+    http_client: HttpClient | None = None,
 ) -> list[NewsorgArticle]:
     params = create_articles_params(
         endpoint=endpoint,
@@ -152,38 +169,231 @@ def get_articles(
         page=page,
     )
 
-    http_client = HttpClient()
-    resp_json = http_client.send(
-        method=HttpMethod.GET,
-        url=create_url(endpoint=endpoint),
-        params=params,
+    if http_client is None:
+        http_client = get_http_client()
+
+    return _get_articles_res(http_client, endpoint, params).articles
+
+
+def iter_articles(
+    endpoint: NewsorgEndpoint = NewsorgEndpoint.TOP_HEADLINES,
+    search_text: str | None = None,
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    sources: list[NewsorgSource] | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    page_size: int | None = None,
+    page: int | None = None,
+    http_client: HttpClient | None = None,
+) -> Iterator[NewsorgArticle]:
+    yield from get_articles(
+        endpoint=endpoint,
+        search_text=search_text,
+        category=category,
+        country=country,
+        language=language,
+        sources=sources,
+        from_date=from_date,
+        to_date=to_date,
+        page_size=page_size,
+        page=page,
+        http_client=http_client,
     )
 
-    try:
-        article_res = NewsorgArticlesRes(**resp_json)
-    except TypeError as exc:
-        raise NewspyException(
-            msg=f"Failed to validate the News Org articles response json: {resp_json}",
-            reason=str(exc),
+
+def get_all_articles(
+    endpoint: NewsorgEndpoint = NewsorgEndpoint.TOP_HEADLINES,
+    search_text: str | None = None,
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    sources: list[NewsorgSource] | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    page_size: int | None = None,
+    max_results: int | None = None,
+    max_workers: int | None = None,
+    http_client: HttpClient | None = None,
+) -> list[NewsorgArticle]:
+    """Return the articles of all the pages of the results.
+
+    Takes the same arguments as iter_all_pages.
+    """
+    return list(
+        iter_all_pages(
+            endpoint=endpoint,
+            search_text=search_text,
+            category=category,
+            country=country,
+            language=language,
+            sources=sources,
+            from_date=from_date,
+            to_date=to_date,
+            page_size=page_size,
+            max_results=max_results,
+            max_workers=max_workers,
+            http_client=http_client,
         )
+    )
+
+
+def iter_all_pages(
+    endpoint: NewsorgEndpoint = NewsorgEndpoint.TOP_HEADLINES,
+    search_text: str | None = None,
+    category: Category | None = None,
+    country: Country | None = None,
+    language: Language | None = None,
+    sources: list[NewsorgSource] | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    page_size: int | None = None,
+    max_results: int | None = None,
+    max_workers: int | None = None,
+    http_client: HttpClient | None = None,
+) -> Iterator[NewsorgArticle]:
+    """Yield the articles of all the pages of the results, in page order.
+
+    The first page tells the number of results. The other pages are then
+    fetched concurrently, and each is yielded as soon as it and the pages
+    before it have arrived.
+
+    :param max_results:
+        Stop after this many articles, without fetching the pages past them
+    :param max_workers:
+        Maximum number of pages fetched at once. Defaults to the connection
+        pool size of the http_client
+    """
+    if not page_size:
+        page_size = DEFAULT_PAGE_SIZE
+
+    params = create_articles_params(
+        endpoint=endpoint,
+        search_text=search_text,
+        category=category,
+        country=country,
+        language=language,
+        sources=sources,
+        from_date=from_date,
+        to_date=to_date,
+        page_size=page_size,
+        page=1,
+    )
+
+    if http_client is None:
+        http_client = get_http_client()
+
+    first_page = _get_articles_res(http_client, endpoint, params)
+    total = first_page.totalResults
+    if max_results is not None:
+        total = min(total, max_results)
+
+    remaining = total
+    for article in first_page.articles[:remaining]:
+        yield article
+    remaining -= len(first_page.articles)
 
-    return article_res.articles
+    page_count = math.ceil(total / page_size)
+    if page_count <= 1 or remaining <= 0 or not first_page.articles:
+        return
+
+    workers = min(max_workers or http_client.pool_maxsize, page_count - 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _get_articles_res, http_client, endpoint, {**params, "page": page}
+            )
+            for page in range(2, page_count + 1)
+        ]
+        try:
+            for future in futures:
+                articles = future.result().articles
+                yield from articles[:remaining]
+                remaining -= len(articles)
+                # The results can shrink while they are paged through.
+                if remaining <= 0 or not articles:
+                    return
+        finally:
+            # Don't fetch the remaining pages when the caller stops iterating.
+            for future in futures:
+                future.cancel()
+
+
+def get_articles_batch(
+    queries: Iterable[NewsorgQuery],
+    max_workers: int | None = None,
+    seen: SeenSet | None = None,
+    http_client: HttpClient | None = None,
+) -> dict[NewsorgQuery, list[NewsorgArticle]]:
+    """Run the queries concurrently and return the articles of each query.
+
+    An article returned by several queries is only kept in the first of
+    them, in the order of the queries, comparing canonical urls. Requests
+    share the connection pool and the rate limiter of the http_client.
+    A query that fails is logged and left out of the result.
+
+    :param max_workers:
+        Maximum number of queries sent at once. Defaults to the connection
+        pool size of the http_client
+    :param seen:
+        Also leave out the articles already in this set, e.g. from previous
+        batches, and add the new ones to it
+    """
+    queries = list(dict.fromkeys(queries))
+    # Invalid queries raise before any request is sent.
+    params = [_query_params(query) for query in queries]
+
+    if http_client is None:
+        http_client = get_http_client()
+    if seen is None:
+        page_sizes = (query.page_size or DEFAULT_PAGE_SIZE for query in queries)
+        seen = SeenSet(max_size=max(sum(page_sizes), 1))
+
+    results = {}
+    if not queries:
+        return results
+
+    workers = min(max_workers or http_client.pool_maxsize, len(queries))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _get_articles_res, http_client, query.endpoint, query_params
+            )
+            for query, query_params in zip(queries, params)
+        ]
+        for query, future in zip(queries, futures):
+            try:
+                articles = future.result().articles
+            except NewspyException as exc:
+                logger.warning("Skipping a query due to error: %s", exc)
+                continue
+
+            results[query] = [
+                article for article in articles if seen.add(article.dedup_key)
+            ]
+
+    return results
 
 
 def get_sources(
     category: Category | None = None,
     country: Country | None = None,
     language: Language | None = None,
+    http_client: HttpClient | None = None,
 ) -> list[NewsorgSource]:
     params = create_sources_params(
         category=category, language=language, country=country
     )
 
-    http_client = HttpClient()
-    resp_json = http_client.send(
-        method=HttpMethod.GET,
+    if http_client is None:
+        http_client = get_http_client()
+
+    resp_json = _send(
+        http_client,
         url=f"{BASE_URL}/top-headlines/sources",
         params=params,
+        ttl="SOURCES",
     )
 
     try:
@@ -195,3 +405,95 @@ def get_sources(
         )
 
     return source_res.sources
+
+
+def _get_articles_res(
+    http_client: HttpClient, endpoint: NewsorgEndpoint, params: dict
+) -> NewsorgArticlesRes:
+    resp_json = _send(
+        http_client, url=create_url(endpoint=endpoint), params=params, ttl=endpoint
+    )
+
+    try:
+        return NewsorgArticlesRes(**resp_json)
+    except TypeError as exc:
+        raise NewspyException(
+            msg=f"Failed to validate the News Org articles response json: {resp_json}",
+            reason=str(exc),
+        )
+
+
+def _send(http_client: HttpClient, url: str, params: dict, ttl: str) -> dict:
+    key_pool = client.default_client_config.get("newsorg_key_pool")
+
+    def send() -> dict:
+        if key_pool is None:
+            return http_client.send(method=HttpMethod.GET, url=url, params=params)
+
+        return _send_with_pool(http_client, url, params, key_pool)
+
+    cache, seconds = response_cache(ttl)
+    if cache is None:
+        return send()
+
+    return cache.get_or_fetch(cache_key(url, params), ttl=seconds, fetch=send)
+
+
+def response_cache(ttl: str) -> tuple[ResponseCache | None, float]:
+    """Return the configured newsorg_cache and the seconds its responses of
+    the ttl kind are kept, or None when they are not cached."""
+    config = client.default_client_config
+    cache = config.get("newsorg_cache")
+    ttls = {**DEFAULT_CACHE_TTLS, **(config.get("newsorg_cache_ttls") or {})}
+    if cache is None or not ttls.get(ttl):
+        return None, 0.0
+
+    return cache, ttls[ttl]
+
+
+def _send_with_pool(
+    http_client: HttpClient, url: str, params: dict, key_pool: ApiKeyPool
+) -> dict:
+    # A rate limited key is left out and the request sent at once with the
+    # next one, until the pool has no available key left.
+    for _ in range(len(key_pool)):
+        key = key_pool.acquire()
+        try:
+            return http_client.send(
+                method=HttpMethod.GET,
+                url=url,
+                params={**params, "apiKey": key},
+                retry_rate_limited=False,
+            )
+        except NewspyHttpException as exc:
+            if not is_rate_limited(exc):
+                raise
+            key_pool.evict(key, retry_after(exc.headers))
+
+    return http_client.send(
+        method=HttpMethod.GET,
+        url=url,
+        params={**params, "apiKey": key_pool.acquire()},
+        retry_rate_limited=False,
+    )
+
+
+def is_rate_limited(exc: NewspyHttpException) -> bool:
+    """Return whether the request failed because its API key is rate limited,
+    rather than after retrying server errors, also reported as 429."""
+    return exc.status_code == 429 and bool(exc.headers)
+
+
+def _query_params(query: NewsorgQuery) -> dict[str, str]:
+    return create_articles_params(
+        endpoint=query.endpoint,
+        search_text=query.search_text,
+        category=query.category,
+        country=query.country,
+        language=query.language,
+        sources=list(query.sources) if query.sources else None,
+        from_date=query.from_date,
+        to_date=query.to_date,
+        page_size=query.page_size,
+        page=query.page,
+    )
@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
+from datetime import date
 from enum import Enum
+from typing import TYPE_CHECKING
 
 from newspy.models import (
     Article,
@@ -8,8 +10,13 @@ from newspy.models import (
     Language,
     Channel,
     Category,
+    source_registry,
 )
 from newspy.shared import utils
+from newspy.shared.dedup import article_key
+
+if TYPE_CHECKING:
+    from newspy.batch import ArticleBatch
 
 
 class NewsorgEndpoint(str, Enum):
@@ -17,7 +24,27 @@ class NewsorgEndpoint(str, Enum):
     TOP_HEADLINES = "TOP_HEADLINES"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class NewsorgQuery:
+    """Arguments of a Newsorg articles request, usable as a dict key"""
+
+    endpoint: NewsorgEndpoint = NewsorgEndpoint.TOP_HEADLINES
+    search_text: str | None = None
+    category: Category | None = None
+    country: Country | None = None
+    language: Language | None = None
+    sources: tuple["NewsorgSource", ...] | None = None
+    from_date: date | None = None
+    to_date: date | None = None
+    page_size: int | None = None
+    page: int | None = None
+
+    def __post_init__(self):
+        if self.sources is not None and not isinstance(self.sources, tuple):
+            object.__setattr__(self, "sources", tuple(self.sources))
+
+
+@dataclass(slots=True)
 class NewsorgArticlesReq:
     """Newsorg API article requests"""
 
@@ -25,7 +52,7 @@ class NewsorgArticlesReq:
     params: dict | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NewsorgSource:
     name: str
     id: str | None = field(default=None)
@@ -36,14 +63,14 @@ class NewsorgSource:
     country: Country | None = field(default=None)
 
     def to_source(self) -> Source:
-        return Source(
+        return source_registry.get_source(
             id=self.id if self.id is not None else self.name,
             name=self.name,
             channel=Channel.NEWSORG,
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsorgSourceRes:
     """Newsorg API article source response"""
 
@@ -58,7 +85,7 @@ class NewsorgSourceRes:
             ]
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsorgArticle:
     """Newsorg API articles"""
 
@@ -73,7 +100,11 @@ class NewsorgArticle:
 
     def __post_init__(self):
         if isinstance(self.source, dict):
-            self.source = NewsorgSource(**self.source)
+            self.source = _article_source(self.source)
+
+    @property
+    def dedup_key(self) -> str:
+        return article_key(self.url)
 
     def to_article(self) -> Article:
         source = self.source.to_source()
@@ -86,11 +117,41 @@ class NewsorgArticle:
             abstract=self.description,
             author=self.author,
             source=source,
-            published=utils.to_datetime(self.publishedAt),
+            published=utils.to_datetime(self.publishedAt, source=source),
+        )
+
+    def append_to(self, batch: "ArticleBatch") -> None:
+        """Add the article to a batch without building an Article."""
+        source = self.source.to_source()
+
+        try:
+            published = utils.to_datetime(self.publishedAt, source=source)
+        except ValueError:
+            published = None
+
+        batch.append(
+            slug=f"{utils.slugify(self.source.name)}-{utils.slugify(self.title)}",
+            url=self.url,
+            url_to_image=self.urlToImage,
+            title=self.title,
+            abstract=self.description,
+            author=self.author,
+            source=source,
+            published=published,
         )
 
 
-@dataclass
+def _article_source(fields: dict) -> NewsorgSource:
+    # Articles only carry the id and name of their source, which repeat
+    # across a response: share one NewsorgSource per publisher.
+    if fields.keys() <= {"id", "name"}:
+        key = (NewsorgSource, fields.get("id"), fields.get("name"))
+        return source_registry.intern(key, lambda: NewsorgSource(**fields))
+
+    return NewsorgSource(**fields)
+
+
+@dataclass(slots=True)
 class NewsorgArticlesRes:
     """Response from the Newsorg API"""
 
@@ -0,0 +1,273 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import requests
+
+from newspy.models import Category
+from newspy.rss.models import RssSource
+from newspy.shared.exceptions import NewspyException, NewspyHttpException
+from newspy.shared.http_client import NOT_MODIFIED, HttpClient, HttpMethod, Validators
+from newspy.shared.utils import get_cache_dir, write_atomic
+
+PACKAGED_SOURCES_PATH = Path(__file__).parent / "data" / "rss_sources.csv.gz"
+# The packaged catalog is a copy of this one.
+DEFAULT_SOURCES_URL = (
+    "https://github.com/onemoola/newspy/blob/main/data/rss_sources.csv.gz?raw=true"
+)
+# The catalog changes rarely: revalidate it once a day.
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+# Catalog file -> ((mtime, size) of the file when parsed, its catalog).
+_catalogs: dict[Path, tuple[tuple[int, int], "SourceCatalog"]] = {}
+
+
+class SourceCatalog:
+    """Read-only RSS sources indexed by category, language and id.
+
+    Filters look the matching sources up in the indexes, so they cost in
+    proportion to the result rather than to the catalog. Sources are
+    returned in catalog order.
+    """
+
+    def __init__(self, sources: Iterable[RssSource]) -> None:
+        self._sources = tuple(sources)
+        self._by_category: dict[str, list[int]] = {}
+        self._by_language: dict[str, list[int]] = {}
+        self._by_id: dict[str, list[int]] = {}
+
+        for position, source in enumerate(self._sources):
+            for index, value in (
+                (self._by_category, source.category),
+                (self._by_language, source.language),
+                (self._by_id, source.id),
+            ):
+                index.setdefault(_index_key(value), []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def __iter__(self) -> Iterator[RssSource]:
+        return iter(self._sources)
+
+    def get(self, id: str) -> RssSource | None:
+        positions = self._by_id.get(id)
+        return self._sources[positions[0]] if positions else None
+
+    def filter(
+        self,
+        category: Category | Iterable[Category] | None = None,
+        language: str | Iterable[str] | None = None,
+        ids: Iterable[str] | None = None,
+    ) -> list[RssSource]:
+        """Return the sources matching all the given filters.
+
+        Each filter is a value or a collection of values, any of which may
+        match. A filter left empty does not filter.
+        """
+        matches = [
+            _positions(index, values)
+            for index, values in (
+                (self._by_category, category),
+                (self._by_language, language),
+                (self._by_id, ids),
+            )
+            if values
+        ]
+        if not matches:
+            return list(self._sources)
+
+        positions = set.intersection(*sorted(matches, key=len))
+        return [self._sources[position] for position in sorted(positions)]
+
+
+def load_catalog(
+    url: str,
+    http_client: HttpClient,
+    max_age: float = DEFAULT_MAX_AGE,
+    cache_dir: Path | None = None,
+) -> SourceCatalog:
+    """Return the catalog published at the url.
+
+    The catalog is downloaded once and then read from the cache directory.
+    Once older than max_age seconds it is revalidated with a conditional
+    request, so it is only downloaded again when it has changed. When it
+    cannot be fetched, the cached copy, whatever its age, is used, and
+    otherwise the copy packaged with newspy.
+    """
+    cached = get_cached_catalog(url, max_age=max_age, cache_dir=cache_dir)
+    if cached is not None:
+        return cached
+
+    path = _cache_path(url, cache_dir)
+    http_client.set_validators(url, _read_validators(path) if path.exists() else None)
+    try:
+        body = http_client.send(
+            method=HttpMethod.GET,
+            url=url,
+            headers={"Content-Type": "application/zip"},
+            conditional=True,
+        )
+        if body is NOT_MODIFIED and path.exists():
+            _validators_path(path).touch()
+            return read_catalog(path)
+
+        return store_catalog(
+            url, body, validators=http_client.get_validators(url), cache_dir=cache_dir
+        )
+    except (NewspyException, requests.exceptions.RequestException) as exc:
+        if not can_fall_back(exc):
+            raise
+        return get_fallback_catalog(url, cache_dir=cache_dir, error=exc)
+
+
+def can_fall_back(error: Exception) -> bool:
+    """Tell whether a stored catalog may stand in for one that failed to load.
+
+    It may for network and server errors, not when the url itself is wrong.
+    """
+    if isinstance(error, NewspyHttpException):
+        return error.status_code >= 500 or error.status_code == 429
+
+    return isinstance(error, (NewspyException, requests.exceptions.RequestException))
+
+
+def get_cached_catalog(
+    url: str, max_age: float = DEFAULT_MAX_AGE, cache_dir: Path | None = None
+) -> SourceCatalog | None:
+    """Return the cached catalog of the url, or None when missing or stale."""
+    path = _cache_path(url, cache_dir)
+    try:
+        validated = _validators_path(path).stat().st_mtime
+    except OSError:
+        return None
+
+    if time.time() - validated >= max_age or not path.exists():
+        return None
+
+    return read_catalog(path)
+
+
+def store_catalog(
+    url: str,
+    body: bytes,
+    validators: Validators | None = None,
+    cache_dir: Path | None = None,
+) -> SourceCatalog:
+    """Parse a downloaded catalog and, when it is valid, cache it."""
+    if not isinstance(body, bytes) or not body:
+        raise NewspyException(msg=f"{url}: the source catalog is empty")
+
+    try:
+        source_catalog = SourceCatalog(parse_catalog(io.BytesIO(body)))
+    except (OSError, EOFError, csv.Error, TypeError, ValueError) as exc:
+        raise NewspyException(
+            msg=f"{url}: the source catalog is not a gzipped CSV file", reason=str(exc)
+        )
+
+    path = _cache_path(url, cache_dir)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, body)
+        write_atomic(
+            _validators_path(path),
+            json.dumps(
+                {
+                    "etag": validators.etag if validators else None,
+                    "last_modified": validators.last_modified if validators else None,
+                }
+            ).encode(),
+        )
+        _catalogs[path] = (_stat_key(path), source_catalog)
+    except OSError as exc:
+        logger.warning("Could not cache the RSS source catalog: %s", exc)
+
+    return source_catalog
+
+
+def get_fallback_catalog(
+    url: str, cache_dir: Path | None = None, error: Exception | None = None
+) -> SourceCatalog:
+    """Return the cached catalog whatever its age, or the packaged one.
+
+    The packaged catalog only stands in for the default url; for any other
+    url the error is raised when nothing is cached.
+    """
+    path = _cache_path(url, cache_dir)
+    if path.exists():
+        logger.warning("Using the cached RSS source catalog: %s", error)
+        return read_catalog(path)
+
+    if url != DEFAULT_SOURCES_URL:
+        if error is not None:
+            raise error
+        raise NewspyException(msg=f"No cached RSS source catalog for {url}.")
+
+    logger.warning("Using the RSS source catalog packaged with newspy: %s", error)
+    return read_catalog(PACKAGED_SOURCES_PATH)
+
+
+def read_catalog(path: Path) -> SourceCatalog:
+    """Read a catalog file, parsing it only when it changed since the last read."""
+    key = _stat_key(path)
+    cached = _catalogs.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    source_catalog = SourceCatalog(parse_catalog(path))
+    _catalogs[path] = (key, source_catalog)
+    return source_catalog
+
+
+def parse_catalog(file_content: Path | io.BytesIO) -> list[RssSource]:
+    with gzip.open(file_content, "rt") as f:
+        return [RssSource(**row) for row in csv.DictReader(f)]
+
+
+def _index_key(value: object) -> object:
+    # Category(str, Enum) does not hash like its value.
+    return getattr(value, "value", value)
+
+
+def _positions(index: dict[str, list[int]], values: object) -> set[int]:
+    if isinstance(values, str):
+        values = (values,)
+
+    positions = set()
+    for value in values:
+        positions.update(index.get(_index_key(value), ()))
+
+    return positions
+
+
+def _cache_path(url: str, cache_dir: Path | None) -> Path:
+    name = hashlib.sha256(url.encode()).hexdigest()[:32]
+    return (cache_dir or get_cache_dir()) / "catalogs" / f"{name}.csv.gz"
+
+
+def _validators_path(path: Path) -> Path:
+    # Also records, by its modification time, when the catalog was validated.
+    return path.with_name(f"{path.name}.json")
+
+
+def _read_validators(path: Path) -> Validators | None:
+    try:
+        with open(_validators_path(path)) as f:
+            validators = Validators(**json.load(f))
+    except (OSError, TypeError, ValueError):
+        return None
+
+    return validators if validators.etag or validators.last_modified else None
+
+
+def _stat_key(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
@@ -1,22 +1,26 @@
-import csv
-import gzip
 import logging
 import io
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from datetime import datetime
 from pathlib import Path
-from typing import NewType
+from typing import Iterable, Iterator, NewType
 
 from newspy.models import Category
+from newspy.rss import catalog
+from newspy.rss.catalog import SourceCatalog
 from newspy.rss.models import RssSource, RssArticle
-from newspy.shared.http_client import HttpClient, HttpMethod
+from newspy.shared.dedup import SeenSet, article_key
+from newspy.shared.http_client import HttpClient, HttpMethod, get_http_client
 from newspy.shared.exceptions import NewspyException
+from newspy.shared.xml_parser import get_backend, parse_xml
 
 DEFAULT_USER_AGENT = os.getenv(
     "USER_AGENT",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
 )
 URL = NewType("URL", str)
+DEFAULT_SOURCES_URL = URL(catalog.DEFAULT_SOURCES_URL)
 
 logger = logging.getLogger(__name__)
 
@@ -25,16 +29,79 @@ def get_articles(
     category: Category | None = None,
     language: str | None = None,
     sources: list[RssSource] | None = None,
+    http_client: HttpClient | None = None,
+    conditional: bool = False,
+    max_items: int | None = None,
+    since: datetime | None = None,
+    parse_executor: Executor | None = None,
+    seen: SeenSet | None = None,
     **kwargs,
 ) -> list[RssArticle]:
+    """
+    :param conditional:
+        Skip feeds that have not changed since the previous call with the
+        same http_client, using ETag/Last-Modified conditional requests
+    :param max_items:
+        Maximum number of articles read from each feed
+    :param since:
+        Only return articles published after this time. Each feed is read
+        until its first older article, so feeds must list newest items first
+    :param parse_executor:
+        Parse the feeds in this executor, typically a ProcessPoolExecutor,
+        instead of on the fetching threads. The threads then only download
+        the feeds, so parsing is not serialized by the GIL. The executor is
+        owned, and shut down, by the caller
+    :param seen:
+        Only return the articles whose url, else guid, is not in this set
+        yet, and add them to it. Reused across calls, it skips the articles
+        returned by the previous polls before they are built
+    """
+    return list(
+        iter_articles(
+            category=category,
+            language=language,
+            sources=sources,
+            http_client=http_client,
+            conditional=conditional,
+            max_items=max_items,
+            since=since,
+            parse_executor=parse_executor,
+            seen=seen,
+        )
+    )
+
+
+def iter_articles(
+    category: Category | None = None,
+    language: str | None = None,
+    sources: list[RssSource] | None = None,
+    http_client: HttpClient | None = None,
+    conditional: bool = False,
+    max_items: int | None = None,
+    since: datetime | None = None,
+    parse_executor: Executor | None = None,
+    seen: SeenSet | None = None,
+    **kwargs,
+) -> Iterator[RssArticle]:
+    """Yield the articles of each feed as soon as the feed is fetched.
+
+    Takes the same arguments as get_articles.
+    """
+    if http_client is None:
+        http_client = get_http_client()
+
     if not sources:
-        sources = get_sources(category=category, language=language)
+        sources = get_sources(
+            category=category, language=language, http_client=http_client
+        )
 
-    http_client = HttpClient()
+    # With a parse executor the feeds are fetched as raw bytes, then each
+    # body goes through a second stage that parses it off the fetching threads.
+    raw = parse_executor is not None
+    backend = get_backend()
 
-    articles = []
-    with ThreadPoolExecutor() as executor:
-        futures = [
+    with ThreadPoolExecutor(max_workers=http_client.pool_maxsize) as executor:
+        futures = {
             executor.submit(
                 http_client.send,
                 method=HttpMethod.GET,
@@ -42,71 +109,124 @@ def get_articles(
                 headers={"User-Agent": DEFAULT_USER_AGENT},
                 params=None,
                 payload=None,
-            )
+                conditional=conditional,
+                max_items=max_items,
+                since=since,
+                raw=raw,
+            ): source
             for source in sources
-        ]
-
-        for future in as_completed(futures):
-            try:
-                resp_json = future.result()
-            except NewspyException as exc:
-                logger.warning("Skipping a source due to error: %s", exc)
-                continue
-
-            if resp_json and isinstance(resp_json, list):
-                for article in resp_json:
-                    source = filter(lambda s: s.url == article["source_url"], sources)
-                    articles.append(
-                        RssArticle(
-                            source=next(source),
-                            title=article["title"],
-                            description=article["description"],
-                            url=article["url"],
-                            published=article["published"],
-                        )
-                    )
-
-    return articles
+        }
+        fetching = set(futures)
+        pending = set(futures)
+
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = futures.pop(future)
+                    try:
+                        resp_json = future.result()
+                    except NewspyException as exc:
+                        logger.warning("Skipping a source due to error: %s", exc)
+                        continue
+
+                    if future in fetching:
+                        fetching.discard(future)
+                        if raw:
+                            if resp_json and isinstance(resp_json, bytes):
+                                parse_future = parse_executor.submit(
+                                    parse_xml,
+                                    resp_json,
+                                    source.url,
+                                    max_items=max_items,
+                                    since=since,
+                                    backend=backend,
+                                )
+                                futures[parse_future] = source
+                                pending.add(parse_future)
+                            continue
+
+                    if resp_json and isinstance(resp_json, list):
+                        for article in resp_json:
+                            key = article_key(article["url"], article["guid"])
+                            if seen is not None and not seen.add(key):
+                                continue
+                            yield RssArticle(
+                                source=source,
+                                title=article["title"],
+                                description=article["description"],
+                                url=article["url"],
+                                published=article["published"],
+                                guid=article["guid"],
+                            )
+        finally:
+            # Don't fetch or parse the remaining feeds when the caller stops
+            # iterating.
+            for future in futures:
+                future.cancel()
 
 
 def get_sources(
-    category: Category | None = None,
-    language: str | None = None,
-    file_path: Path | URL = URL(
-        "https://github.com/onemoola/newspy/blob/main/data/rss_sources.csv.gz?raw=true"
-    ),
+    category: Category | Iterable[Category] | None = None,
+    language: str | Iterable[str] | None = None,
+    file_path: Path | URL = DEFAULT_SOURCES_URL,
+    http_client: HttpClient | None = None,
+    max_age: float = catalog.DEFAULT_MAX_AGE,
+    cache_dir: Path | None = None,
     **kwargs,
 ) -> list[RssSource]:
+    """
+    :param category:
+        A category, or several categories any of which may match
+    :param language:
+        A language, or several languages any of which may match
+
+    The other arguments are those of get_source_catalog.
+    """
+    source_catalog = get_source_catalog(
+        file_path=file_path,
+        http_client=http_client,
+        max_age=max_age,
+        cache_dir=cache_dir,
+    )
+    return source_catalog.filter(category=category, language=language)
+
+
+def get_source_catalog(
+    file_path: Path | URL = DEFAULT_SOURCES_URL,
+    http_client: HttpClient | None = None,
+    max_age: float = catalog.DEFAULT_MAX_AGE,
+    cache_dir: Path | None = None,
+) -> SourceCatalog:
+    """Return the indexed catalog of RSS sources, loaded once per change.
+
+    :param file_path:
+        A local catalog file, or the url of a catalog. A downloaded catalog is
+        cached on disk and falls back to the cached or packaged copy when it
+        cannot be fetched
+    :param max_age:
+        Seconds during which a cached catalog is used without revalidating it
+    :param cache_dir:
+        Defaults to the NEWSPY_CACHE_DIR environment variable, or else to the
+        newspy directory of the user cache, e.g. ~/.cache/newspy
+    """
     if isinstance(file_path, Path):
-        file_content = file_path
+        return catalog.read_catalog(file_path)
     elif isinstance(file_path, str):
-        http_client = HttpClient()
-        file_content = http_client.send(
-            method=HttpMethod.GET,
-            url=file_path,
-            headers={"Content-Type": "application/zip"},
+        if http_client is None:
+            http_client = get_http_client()
+        return catalog.load_catalog(
+            file_path, http_client=http_client, max_age=max_age, cache_dir=cache_dir
         )
-        file_content = io.BytesIO(file_content)
-    else:
-        return []
-
-    with gzip.open(file_content, "rt") as f:
-        reader = csv.DictReader(f)
-        if category and language:
-            sources = [
-                RssSource(**row)
-                for row in reader
-                if row["category"] == category and row["language"] == language
-            ]
-        elif category:
-            sources = [
-                RssSource(**row) for row in reader if row["category"] == category
-            ]
-        elif language:
-            sources = [
-                RssSource(**row) for row in reader if row["language"] == language
-            ]
-        else:
-            sources = [RssSource(**row) for row in reader]
-
-    return sources
+
+    return SourceCatalog([])
+
+
+def read_sources(
+    file_content: Path | io.BytesIO,
+    category: Category | Iterable[Category] | None = None,
+    language: str | Iterable[str] | None = None,
+) -> list[RssSource]:
+    return SourceCatalog(catalog.parse_catalog(file_content)).filter(
+        category=category, language=language
+    )
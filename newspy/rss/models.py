@@ -1,13 +1,25 @@
 import logging
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from newspy.models import Article, Source, Language, Channel, Category
+from newspy.models import (
+    Article,
+    Source,
+    Language,
+    Channel,
+    Category,
+    source_registry,
+)
 from newspy.shared import utils
+from newspy.shared.dedup import article_key
+
+if TYPE_CHECKING:
+    from newspy.batch import ArticleBatch
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class RssArticleMediaContent:
     height: str
     width: str
@@ -15,13 +27,13 @@ class RssArticleMediaContent:
     medium: str | None
 
 
-@dataclass
+@dataclass(slots=True)
 class RssArticleContent:
     base: str
     value: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RssSource:
     id: str
     name: str
@@ -31,16 +43,23 @@ class RssSource:
     language: Language
 
     def to_source(self) -> Source:
-        return Source(id=self.id, name=self.name, channel=Channel.RSS)
+        return source_registry.get_source(
+            id=self.id, name=self.name, channel=Channel.RSS
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class RssArticle:
     source: RssSource
     title: str
     description: str
     url: str
     published: str
+    guid: str = ""
+
+    @property
+    def dedup_key(self) -> str:
+        return article_key(self.url, self.guid)
 
     def to_article(self) -> Article:
         source = self.source.to_source()
@@ -53,5 +72,25 @@ class RssArticle:
             abstract=self.description,
             author=None,
             source=source,
-            published=utils.to_datetime(self.published),
+            published=utils.to_datetime(self.published, source=self.source.url),
+        )
+
+    def append_to(self, batch: "ArticleBatch") -> None:
+        """Add the article to a batch without building an Article."""
+        source = self.source.to_source()
+
+        try:
+            published = utils.to_datetime(self.published, source=self.source.url)
+        except ValueError:
+            published = None
+
+        batch.append(
+            slug=f"{utils.slugify(source.name)}-{utils.slugify(self.title)}",
+            url=self.url,
+            url_to_image=None,
+            title=self.title,
+            abstract=self.description,
+            author=None,
+            source=source,
+            published=published,
         )
@@ -0,0 +1,335 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+from xml.etree import ElementTree
+
+import requests
+
+from newspy.rss.client import DEFAULT_USER_AGENT, get_sources
+from newspy.rss.models import RssArticle, RssSource
+from newspy.shared.dedup import article_key
+from newspy.shared.exceptions import NewspyException
+from newspy.shared.http_client import (
+    NOT_MODIFIED,
+    HttpClient,
+    HttpMethod,
+    get_http_client,
+)
+from newspy.shared.xml_parser import FeedParser
+
+DEFAULT_MIN_INTERVAL = 5 * 60
+DEFAULT_MAX_INTERVAL = 6 * 60 * 60
+DEFAULT_INITIAL_INTERVAL = 30 * 60
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class FeedState:
+    """Polling state of a feed"""
+
+    source: RssSource
+    interval: float
+    next_poll: float
+    last_poll: float | None = None
+    # Estimated publish rate in articles per second.
+    rate: float | None = None
+    ttl: int | None = None
+    skip_hours: frozenset[int] = frozenset()
+    skip_days: frozenset[str] = frozenset()
+    polls: int = 0
+    errors: int = 0
+    articles: int = 0
+    seen_keys: frozenset[str] = field(default_factory=frozenset)
+
+
+class FeedScheduler:
+    """Poll each feed on its own interval, adapted to how often it publishes.
+
+    Feeds wait in a priority queue ordered by their next poll time. After
+    each poll the interval of the feed is set to the time in which it is
+    expected to publish target_articles new articles, within min_interval and
+    max_interval. The interval is never shorter than the feed's RSS <ttl> or
+    than the freshness declared by its HTTP cache headers, and polls are
+    moved out of the feed's <skipHours> and <skipDays>. Unchanged feeds cost
+    a conditional request answered with 304 Not Modified.
+    """
+
+    def __init__(
+        self,
+        sources: list[RssSource] | None = None,
+        http_client: HttpClient | None = None,
+        on_articles: Callable[[list[RssArticle]], None] | None = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+        target_articles: float = 1.0,
+        jitter: float = 0.1,
+        start_spread: float | None = None,
+        clock: Callable[[], float] = time.time,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        :param sources:
+            Defaults to all the sources of the RSS catalog
+        :param on_articles:
+            Called with the new articles of each round of polls run by start
+        :param target_articles:
+            Number of new articles a poll should find on average
+        :param jitter:
+            Intervals are randomly stretched or shrunk by up to this fraction,
+            so that feeds polled together drift apart
+        :param start_spread:
+            The first polls are spread at random over this many seconds.
+            Defaults to min_interval
+        :param clock:
+            Returns the current epoch time
+        """
+        if http_client is None:
+            http_client = get_http_client()
+
+        self._http_client = http_client
+        self._on_articles = on_articles
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._initial_interval = initial_interval
+        self._target_articles = target_articles
+        self._jitter = jitter
+        self._start_spread = min_interval if start_spread is None else start_spread
+        self._clock = clock
+        self._rng = rng or random.Random()
+
+        self._feeds: dict[str, FeedState] = {}
+        self._queue: list[tuple[float, int, FeedState]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        if sources is None:
+            sources = get_sources(http_client=http_client)
+        for source in sources:
+            self.add(source)
+
+    @property
+    def feeds(self) -> dict[str, FeedState]:
+        """The state of each feed, by source id"""
+        with self._lock:
+            return dict(self._feeds)
+
+    def add(self, source: RssSource) -> None:
+        now = self._clock()
+        with self._lock:
+            if source.id in self._feeds:
+                return
+
+            state = FeedState(
+                source=source,
+                interval=self._initial_interval,
+                next_poll=now + self._rng.uniform(0, self._start_spread),
+            )
+            self._feeds[source.id] = state
+            self._push(state)
+        self._wakeup.set()
+
+    def remove(self, source_id: str) -> None:
+        # The queue entry of the feed is dropped when it comes up.
+        with self._lock:
+            self._feeds.pop(source_id, None)
+
+    def next_poll_time(self) -> float | None:
+        with self._lock:
+            self._drop_removed()
+            return self._queue[0][0] if self._queue else None
+
+    def run_pending(self) -> list[RssArticle]:
+        """Poll the feeds that are due and return their new articles."""
+        now = self._clock()
+        due = []
+        with self._lock:
+            self._drop_removed()
+            while self._queue and self._queue[0][0] <= now:
+                due.append(heapq.heappop(self._queue)[2])
+
+        if not due:
+            return []
+
+        articles = []
+        workers = min(len(due), self._http_client.pool_maxsize)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for new_articles in executor.map(self._poll, due):
+                    articles.extend(new_articles)
+        finally:
+            # Even when a poll raised, the feeds stay scheduled.
+            with self._lock:
+                for state in due:
+                    if self._feeds.get(state.source.id) is state:
+                        self._push(state)
+
+        return articles
+
+    def start(self) -> None:
+        """Poll the feeds in a background thread until stop is called."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="newspy-feed-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "FeedScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            # Cleared first, so that feeds added during the round wake us up.
+            self._wakeup.clear()
+            try:
+                articles = self.run_pending()
+                if articles and self._on_articles is not None:
+                    self._on_articles(articles)
+            except Exception:  # Keep polling whatever a round raised.
+                logger.exception("Feed polling round failed")
+
+            next_poll = self.next_poll_time()
+            timeout = None if next_poll is None else max(0, next_poll - self._clock())
+            self._wakeup.wait(timeout)
+
+    def _poll(self, state: FeedState) -> list[RssArticle]:
+        source = state.source
+        now = self._clock()
+        try:
+            body = self._http_client.send(
+                method=HttpMethod.GET,
+                url=source.url,
+                headers={"User-Agent": DEFAULT_USER_AGENT},
+                conditional=True,
+                raw=True,
+            )
+            if body is NOT_MODIFIED:
+                items = None
+            else:
+                parser = FeedParser(source.url)
+                items = parser.feed(body or b"") + parser.close()
+                state.ttl = parser.ttl
+                state.skip_hours = parser.skip_hours
+                state.skip_days = parser.skip_days
+        except (
+            NewspyException,
+            requests.exceptions.RequestException,
+            ElementTree.ParseError,
+        ) as exc:
+            logger.warning("Polling %s failed: %s", source.url, exc)
+            state.errors += 1
+            state.interval = min(state.interval * 2, self._max_interval)
+            state.next_poll = self._next_poll(state, now, state.interval)
+            return []
+
+        articles = []
+        if items is not None:
+            # Feeds list their latest items: new ones are those not seen before.
+            # Items without url nor guid have no key and are always new.
+            keys = [article_key(item["url"], item["guid"]) for item in items]
+            articles = [
+                RssArticle(
+                    source=source,
+                    title=item["title"],
+                    description=item["description"],
+                    url=item["url"],
+                    published=item["published"],
+                    guid=item["guid"],
+                )
+                for item, key in zip(items, keys)
+                if not key or key not in state.seen_keys
+            ]
+            state.seen_keys = frozenset(key for key in keys if key)
+
+        # The first poll only tells what the feed already had.
+        if state.last_poll is not None:
+            self._update_interval(state, now, len(articles))
+        state.polls += 1
+        state.articles += len(articles)
+        state.last_poll = now
+        state.next_poll = self._next_poll(state, now, state.interval)
+
+        return articles
+
+    def _update_interval(self, state: FeedState, now: float, new: int) -> None:
+        elapsed = max(now - (state.last_poll or now), 1.0)
+        rate = new / elapsed
+        # Exponentially weighted, so that the rate follows the feed's rhythm
+        # without jumping at every poll.
+        state.rate = rate if state.rate is None else 0.5 * state.rate + 0.5 * rate
+
+        if state.rate > 0:
+            interval = self._target_articles / state.rate
+        else:
+            interval = state.interval * 1.5
+
+        state.interval = min(max(interval, self._min_interval), self._max_interval)
+
+    def _next_poll(self, state: FeedState, now: float, interval: float) -> float:
+        interval *= 1 + self._rng.uniform(-self._jitter, self._jitter)
+        if state.ttl:
+            interval = max(interval, state.ttl * 60)
+
+        next_poll = now + interval
+        validators = self._http_client.get_validators(state.source.url)
+        if validators is not None and validators.expires:
+            next_poll = max(next_poll, validators.expires)
+
+        return _skip(next_poll, state.skip_hours, state.skip_days)
+
+    def _push(self, state: FeedState) -> None:
+        # The counter keeps entries with the same time from comparing states.
+        heapq.heappush(self._queue, (state.next_poll, next(self._counter), state))
+
+    def _drop_removed(self) -> None:
+        while self._queue:
+            state = self._queue[0][2]
+            if self._feeds.get(state.source.id) is state:
+                return
+            heapq.heappop(self._queue)
+
+
+_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def _skip(
+    timestamp: float, skip_hours: frozenset[int], skip_days: frozenset[str]
+) -> float:
+    """Move the time to the start of the next hour the feed may be polled."""
+    if not skip_hours and not skip_days:
+        return timestamp
+
+    moved = timestamp
+    for _ in range(7 * 24):
+        moment = datetime.fromtimestamp(moved, tz=timezone.utc)
+        if moment.hour not in skip_hours and _DAYS[moment.weekday()] not in skip_days:
+            return moved
+        moved = (moved // 3600 + 1) * 3600
+
+    # Every hour is skipped: ignore the hints rather than never polling.
+    return timestamp
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterable
+
+from newspy.shared.utils import get_cache_dir, write_atomic
+
+DEFAULT_MAX_SIZE = 1024
+# Query parameters that don't change the response, like credentials.
+IGNORED_PARAMS = frozenset(("apiKey",))
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(
+    url: str, params: dict | None = None, ignored: Iterable[str] = IGNORED_PARAMS
+) -> str:
+    """Return the key of a request: the url and its sorted params, without
+    the ignored ones."""
+    ignored = frozenset(ignored)
+    items = sorted(
+        (name, str(getattr(value, "value", value)))
+        for name, value in (params or {}).items()
+        if name not in ignored and value is not None
+    )
+    return json.dumps([url, items], separators=(",", ":"))
+
+
+class ResponseCache(ABC):
+    """Responses kept for a time to live, evicted least recently used first.
+
+    Subclasses store the entries. Values are JSON-serializable responses,
+    shared between the callers that get them: they must not be modified.
+    """
+
+    def __init__(self) -> None:
+        self._fetching_lock = threading.Lock()
+        self._fetching: dict[str, threading.Lock] = {}
+
+    @abstractmethod
+    def get(self, key: str) -> object | None:
+        """Return the value of the key, or None when missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: object, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def get_or_fetch(self, key: str, ttl: float, fetch: Callable[[], object]) -> object:
+        """Return the cached value of the key, or fetch and cache it.
+
+        Concurrent calls for the same missing key fetch it once: the others
+        wait for it and get the cached value. A fetch that raises caches
+        nothing.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._fetching_lock:
+            lock = self._fetching.setdefault(key, threading.Lock())
+
+        with lock:
+            try:
+                value = self.get(key)
+                if value is None:
+                    value = fetch()
+                    if value is not None:
+                        self.set(key, value, ttl)
+            finally:
+                with self._fetching_lock:
+                    self._fetching.pop(key, None)
+
+        return value
+
+
+class MemoryCache(ResponseCache):
+    """Response cache in memory, shared by the threads of the process."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> object | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: object, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache(ResponseCache):
+    """Response cache in a directory, shared by processes and restarts.
+
+    Each entry is a JSON file, whose modification time records when it was
+    last used.
+    """
+
+    def __init__(
+        self, directory: Path | None = None, max_size: int = DEFAULT_MAX_SIZE
+    ) -> None:
+        """
+        :param directory:
+            Defaults to the responses directory of the newspy cache,
+            e.g. ~/.cache/newspy/responses
+        """
+        super().__init__()
+        self.directory = directory or get_cache_dir() / "responses"
+        self.max_size = max_size
+
+    def get(self, key: str) -> object | None:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        if entry.get("expires", 0) <= time.time():
+            _remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, key: str, value: object, ttl: float) -> None:
+        entry = {"key": key, "expires": time.time() + ttl, "value": value}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_atomic(self._path(key), json.dumps(entry).encode())
+            self._evict()
+        except OSError as exc:
+            logger.warning("Could not cache the response: %s", exc)
+
+    def clear(self) -> None:
+        for path in self._entry_paths():
+            _remove(path)
+
+    def __len__(self) -> int:
+        return len(self._entry_paths())
+
+    def _path(self, key: str) -> Path:
+        name = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return self.directory / f"{name}.json"
+
+    def _entry_paths(self) -> list[Path]:
+        try:
+            return list(self.directory.glob("*.json"))
+        except OSError:
+            return []
+
+    def _evict(self) -> None:
+        paths = self._entry_paths()
+        if len(paths) <= self.max_size:
+            return
+
+        used = []
+        for path in paths:
+            try:
+                used.append((path.stat().st_mtime, path))
+            except OSError:
+                pass
+        used.sort()
+        for _, path in used[: len(used) - self.max_size]:
+            _remove(path)
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
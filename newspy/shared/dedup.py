@@ -0,0 +1,276 @@
+import hashlib
+import json
+import logging
+import math
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from newspy.shared.exceptions import NewspyException
+from newspy.shared.utils import write_atomic
+
+DEFAULT_MAX_SIZE = 100_000
+
+logger = logging.getLogger(__name__)
+
+_TRACKING_PARAMS = frozenset(
+    ("fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "_ga")
+)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_FORMAT_VERSION = 1
+
+
+def canonicalize_url(url: str) -> str:
+    """Return the url in the form under which articles are deduplicated.
+
+    The scheme, host and port are normalized, a leading www., the fragment,
+    a trailing slash and tracking parameters (utm_*, fbclid, ...) are dropped
+    and the query parameters are sorted. Keys that are not urls, like some
+    guids, are only stripped of surrounding whitespace.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    if not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        # The same article is often linked over both.
+        scheme = "https"
+
+    host = (parts.hostname or "").removeprefix("www.")
+    if port is not None and port != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/") or "/"
+    query = parts.query
+    if query:
+        query = urlencode(
+            sorted(
+                (name, value)
+                for name, value in parse_qsl(query, keep_blank_values=True)
+                if not name.lower().startswith("utm_")
+                and name.lower() not in _TRACKING_PARAMS
+            )
+        )
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def article_key(url: str | None, guid: str | None = None) -> str:
+    """Return the key an article is deduplicated under: its url, else its
+    guid. Empty when it has neither, and then it is never reported as seen.
+    """
+    return (url or "").strip() or (guid or "").strip()
+
+
+class SeenSet:
+    """Bounded memory of the articles already seen, shared across polls.
+
+    Keys, canonicalized urls by default, are stored as 64-bit hashes in an
+    LRU window of the last max_size keys. With a false_positive_rate, they
+    are stored in two rotating Bloom filters of max_size keys each instead:
+    a few bits per key, at the cost of reporting that fraction of new keys
+    as seen. Either way at least the last max_size keys are remembered.
+
+    The set is thread-safe. With a path, it is loaded from the file when it
+    exists and save writes it back.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        false_positive_rate: float | None = None,
+        path: Path | None = None,
+        key: Callable[[str], str] | None = canonicalize_url,
+    ) -> None:
+        """
+        :param false_positive_rate:
+            Use Bloom filters with this false positive rate, e.g. 0.001,
+            instead of an exact LRU window
+        :param key:
+            Maps the values passed to add to the deduplication key.
+            None uses the values as they are
+        """
+        if max_size < 1:
+            raise NewspyException(msg="The max_size of a SeenSet must be positive.")
+        if false_positive_rate is not None and not 0 < false_positive_rate < 1:
+            raise NewspyException(
+                msg="The false_positive_rate must be between 0 and 1, exclusive.",
+            )
+
+        self.max_size = max_size
+        self.false_positive_rate = false_positive_rate
+        self.path = path
+        self._key = key
+        self._lock = threading.Lock()
+
+        self._recent: OrderedDict[int, None] = OrderedDict()
+        if false_positive_rate is not None:
+            # Optimal sizes for max_size keys per filter.
+            self._bits = max(
+                8,
+                math.ceil(-max_size * math.log(false_positive_rate) / math.log(2) ** 2),
+            )
+            self._hashes = max(1, round(self._bits / max_size * math.log(2)))
+            self._current = bytearray((self._bits + 7) // 8)
+            self._previous = bytearray(len(self._current))
+            self._current_count = 0
+            self._previous_count = 0
+
+        if path is not None and path.exists():
+            self._load(path)
+
+    def add(self, value: str) -> bool:
+        """Record the value and return whether it had not been seen before.
+
+        Empty values, like the key of an article without url nor guid, are
+        never recorded: they are always new.
+        """
+        if not value or not value.strip():
+            return True
+
+        digest = self._digest(value)
+        with self._lock:
+            if self.false_positive_rate is None:
+                return self._add_recent(digest)
+            return self._add_bloom(digest)
+
+    def __contains__(self, value: str) -> bool:
+        if not value or not value.strip():
+            return False
+
+        digest = self._digest(value)
+        with self._lock:
+            if self.false_positive_rate is None:
+                return int.from_bytes(digest[:8], "little") in self._recent
+
+            positions = self._positions(digest)
+            return _has_bits(self._current, positions) or _has_bits(
+                self._previous, positions
+            )
+
+    def __len__(self) -> int:
+        """Number of keys remembered: approximate with Bloom filters."""
+        with self._lock:
+            if self.false_positive_rate is None:
+                return len(self._recent)
+            return self._current_count + self._previous_count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            if self.false_positive_rate is not None:
+                self._current = bytearray(len(self._current))
+                self._previous = bytearray(len(self._current))
+                self._current_count = 0
+                self._previous_count = 0
+
+    def save(self, path: Path | None = None) -> None:
+        """Write the set to the path, atomically.
+
+        :param path:
+            Defaults to the path the set was created with
+        """
+        path = path or self.path
+        if path is None:
+            raise NewspyException(msg="The SeenSet has no path to be saved to.")
+
+        with self._lock:
+            header = {
+                "version": _FORMAT_VERSION,
+                "max_size": self.max_size,
+                "false_positive_rate": self.false_positive_rate,
+            }
+            if self.false_positive_rate is None:
+                body = array("Q", self._recent).tobytes()
+            else:
+                header["counts"] = [self._current_count, self._previous_count]
+                body = bytes(self._current) + bytes(self._previous)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, json.dumps(header).encode() + b"\n" + body)
+
+    def _load(self, path: Path) -> None:
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not read the seen articles from %s: %s", path, exc)
+            return
+
+        if (
+            header.get("version") != _FORMAT_VERSION
+            or header.get("false_positive_rate") != self.false_positive_rate
+        ):
+            logger.warning("Ignoring the seen articles of %s: other settings", path)
+            return
+
+        if self.false_positive_rate is None:
+            digests = array("Q")
+            digests.frombytes(body[: len(body) - len(body) % digests.itemsize])
+            # Oldest first, so the most recent survive a smaller max_size.
+            for digest in digests[-self.max_size :]:
+                self._recent[digest] = None
+        elif header.get("max_size") == self.max_size and len(body) == 2 * len(
+            self._current
+        ):
+            self._current = bytearray(body[: len(self._current)])
+            self._previous = bytearray(body[len(self._current) :])
+            self._current_count, self._previous_count = header.get("counts", (0, 0))
+        else:
+            logger.warning("Ignoring the seen articles of %s: other settings", path)
+
+    def _digest(self, value: str) -> bytes:
+        if self._key is not None:
+            value = self._key(value)
+        return hashlib.blake2b(value.encode(), digest_size=16).digest()
+
+    def _add_recent(self, digest: bytes) -> bool:
+        key = int.from_bytes(digest[:8], "little")
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            return False
+
+        self._recent[key] = None
+        if len(self._recent) > self.max_size:
+            self._recent.popitem(last=False)
+        return True
+
+    def _add_bloom(self, digest: bytes) -> bool:
+        positions = self._positions(digest)
+        if _has_bits(self._current, positions):
+            return False
+
+        new = not _has_bits(self._previous, positions)
+        # Keys seen again move to the current filter, so they outlive the
+        # rotation like in an LRU.
+        if self._current_count >= self.max_size:
+            self._previous = self._current
+            self._current = bytearray(len(self._previous))
+            self._previous_count = self._current_count
+            self._current_count = 0
+
+        for position in positions:
+            self._current[position >> 3] |= 1 << (position & 7)
+        self._current_count += 1
+        return new
+
+    def _positions(self, digest: bytes) -> list[int]:
+        # Double hashing: k positions from two 64-bit hashes.
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self._bits for i in range(self._hashes)]
+
+
+def _has_bits(bits: bytearray, positions: list[int]) -> bool:
+    return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
@@ -1,11 +1,21 @@
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
 from enum import Enum
+from typing import Mapping
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
 
+from newspy.shared import utils
 from newspy.shared.exceptions import NewspyHttpException
-from newspy.shared.xml_parser import parse_xml
+from newspy.shared.rate_limiter import RateLimiter, retry_after
+from newspy.shared.xml_parser import CHUNK_SIZE, parse_xml_stream
 
 
 class ContentType(str, Enum):
@@ -18,6 +28,78 @@ class HttpMethod(str, Enum):
     POST = "POST"
 
 
+@dataclass(frozen=True)
+class Validators:
+    """Cache validators of a previously fetched resource"""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    # Epoch time until which the server declared the response fresh.
+    expires: float | None = None
+
+
+def cache_expiry(headers: Mapping[str, str], now: float | None = None) -> float | None:
+    """Return the epoch time at which a response stops being fresh.
+
+    Cache-Control max-age (less the Age of the response) takes precedence
+    over Expires. None when the response does not say or must be revalidated.
+    """
+    if now is None:
+        now = time.time()
+
+    directives = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.partition("=")
+        directives[name.strip().lower()] = value.strip().strip('"')
+
+    if "no-cache" in directives or "no-store" in directives:
+        return None
+
+    if "max-age" in directives:
+        try:
+            max_age = int(directives["max-age"])
+            age = int(headers.get("Age", 0))
+        except ValueError:
+            return None
+        return now + max_age - age
+
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return utils.to_datetime(expires).timestamp()
+        except ValueError:
+            # An invalid date, typically "0", means already expired.
+            return now
+
+    return None
+
+
+class NotModified:
+    """Marker returned by a conditional request answered with 304 Not Modified"""
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = NotModified()
+
+
+def request_url(url: str, params: dict | None = None) -> str:
+    """Return the url with the query params encoded the way requests sends it"""
+    request = requests.PreparedRequest()
+    request.prepare_url(url, params)
+    return request.url
+
+
+# Match the default worker count of ThreadPoolExecutor so a full fan-out
+# never waits on, or discards, pooled connections.
+DEFAULT_POOL_MAXSIZE = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_POOL_CONNECTIONS = 256
+
+
 class HttpClient:
     MAX_RETRIES = 3
 
@@ -29,8 +111,15 @@ class HttpClient:
         retries: int = MAX_RETRIES,
         status_retries: int = MAX_RETRIES,
         backoff_factor: float = 0.3,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_sizes: dict[str, int] | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
         """
+        :param requests_session:
+            Reuse connections through a pooled requests.Session. When False
+            every request opens a new connection
         :param requests_timeout:
             Tell Requests to stop waiting for a response after a given
             number of seconds
@@ -43,32 +132,137 @@ class HttpClient:
         :param backoff_factor:
             A backoff factor to apply between attempts after the second try
             See urllib3 https://urllib3.readthedocs.io/en/latest/reference/urllib3.util.html
+        :param pool_connections:
+            Number of per-host connection pools to keep alive
+        :param pool_maxsize:
+            Maximum number of connections kept alive per host. Should be at
+            least the number of threads sharing the client
+        :param pool_sizes:
+            Maximum pool size per URL prefix, overriding pool_maxsize for a
+            scheme or a host, e.g. {"http://": 8, "https://newsapi.org": 4}
+        :param rate_limiter:
+            Space out the requests to each host and API key, shared by all
+            the threads using the client. The Retry-After of 429 responses
+            then pauses the limiter instead of each thread sleeping on its
+            own, and the request is retried up to status_retries times
         """
         self._requests_timeout = requests_timeout
         self._status_forcelist = status_forcelist
         self._retries = retries
         self._status_retries = status_retries
         self._backoff_factor = backoff_factor
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._rate_limiter = rate_limiter
+        self._validators: dict[str, Validators] = {}
+        self._validators_lock = threading.Lock()
+        self._mount_lock = threading.Lock()
 
         if requests_session:  # Build a new session.
             self._build_session()
+            for prefix, maxsize in (pool_sizes or {}).items():
+                self.mount_pool(prefix=prefix, pool_maxsize=maxsize)
         else:  # Use the Requests API module as a "session".
             self._session = requests.api
 
     def _build_session(self) -> None:
         self._session = requests.Session()
-        retry = Retry(
+        adapter = self._build_adapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _build_adapter(self, pool_connections: int, pool_maxsize: int) -> HTTPAdapter:
+        retry = _Retry(
             total=self._retries,
             connect=1,
             read=False,
             allowed_methods=frozenset(["GET", "POST"]),
             status=self._status_retries,
             backoff_factor=self._backoff_factor,
-            status_forcelist=self._status_forcelist,
+            # 429 responses are retried by _request.
+            status_forcelist=tuple(
+                status for status in self._status_forcelist if status != 429
+            ),
         )
 
-        adapter = HTTPAdapter(max_retries=retry)
-        self._session.mount("https://", adapter)
+        return HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+
+    def mount_pool(
+        self, prefix: str, pool_maxsize: int, pool_connections: int | None = None
+    ) -> None:
+        """Use a dedicated connection pool for URLs starting with the prefix.
+
+        :param prefix:
+            A scheme ("http://") or scheme and host ("https://newsapi.org")
+        :param pool_maxsize:
+            Maximum number of connections kept alive per host under the prefix
+        :param pool_connections:
+            Number of per-host pools to keep. Defaults to one for a host prefix
+            and to the client's pool_connections for a scheme prefix
+        """
+        if not isinstance(self._session, requests.Session):
+            return
+
+        if pool_connections is None:
+            is_host_prefix = bool(urlsplit(prefix).netloc)
+            pool_connections = 1 if is_host_prefix else self._pool_connections
+
+        adapter = self._build_adapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+
+        # Session.mount reorders the adapters in place while other threads may
+        # be iterating them to pick one, so mount on a copy and swap it in.
+        with self._mount_lock:
+            adapters = OrderedDict(self._session.adapters)
+            adapters[prefix] = adapter
+            for key in [k for k in adapters if len(k) < len(prefix)]:
+                adapters[key] = adapters.pop(key)
+            self._session.adapters = adapters
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        return self._rate_limiter
+
+    @property
+    def pool_maxsize(self) -> int:
+        return self._pool_maxsize
+
+    def close(self) -> None:
+        """Close the pooled connections held by the session."""
+        if isinstance(self._session, requests.Session):
+            self._session.close()
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get_validators(self, url: str, params: dict | None = None) -> Validators | None:
+        with self._validators_lock:
+            return self._validators.get(request_url(url, params))
+
+    def set_validators(
+        self, url: str, validators: Validators | None, params: dict | None = None
+    ) -> None:
+        key = request_url(url, params)
+        with self._validators_lock:
+            if validators is None:
+                self._validators.pop(key, None)
+            else:
+                self._validators[key] = validators
+
+    def clear_validators(self) -> None:
+        with self._validators_lock:
+            self._validators.clear()
 
     def send(
         self,
@@ -77,48 +271,121 @@ class HttpClient:
         headers: dict | None = None,
         params: dict | None = None,
         payload: dict | None = None,
-    ) -> dict | list | bytes | str | None:
+        conditional: bool = False,
+        max_items: int | None = None,
+        since: datetime | None = None,
+        raw: bool = False,
+        retry_rate_limited: bool = True,
+    ) -> dict | list | bytes | str | NotModified | None:
+        """
+        :param conditional:
+            Send the ETag/Last-Modified validators remembered from the previous
+            response for this url. NOT_MODIFIED is returned, without reading or
+            parsing the body, when the server answers 304 Not Modified. The
+            freshness declared by the response is remembered with them
+        :param max_items:
+            For feeds, stop reading the body after this many items
+        :param since:
+            For newest-first feeds, stop reading the body at the first item
+            published at or before this time
+        :param raw:
+            Return the body as bytes instead of decoding it, e.g. to parse
+            feeds in another process
+        :param retry_rate_limited:
+            Retry 429 Too Many Requests responses, after their Retry-After.
+            When False a NewspyHttpException 429 is raised at once, e.g. to
+            try another API key
+        """
         args = {}
         results = None
 
+        if conditional:
+            validators = self.get_validators(url, params)
+            if validators is not None:
+                headers = dict(headers or {})
+                if validators.etag:
+                    headers["If-None-Match"] = validators.etag
+                if validators.last_modified:
+                    headers["If-Modified-Since"] = validators.last_modified
+
         if payload:
             if headers["Content-Type"] == "application/json":
                 args["data"] = json.dumps(payload)
             else:
                 args["data"] = str(payload)
 
+        response = None
         try:
-            response = self._session.request(
+            # Stream the body so that feeds are parsed while they download.
+            response = self._request(
                 method,
                 url,
                 headers=headers,
                 timeout=self._requests_timeout,
                 params=params,
+                retry_rate_limited=retry_rate_limited,
+                stream=True,
                 **args,
             )
 
             response.raise_for_status()
 
-            content_type = None
-            if headers and "Content-Type" in headers:
-                content_type = headers["Content-Type"]
+            if response.status_code == 304:
+                # A 304 carries the new freshness of the unchanged resource.
+                validators = self.get_validators(url, params)
+                if conditional and validators is not None:
+                    expires = cache_expiry(response.headers)
+                    self.set_validators(
+                        url, replace(validators, expires=expires), params
+                    )
+                return NOT_MODIFIED
+
+            if raw:
+                results = response.content
             else:
-                response_content_type = response.headers.get("Content-Type", "")
-                if response_content_type:
-                    content_type = response_content_type.split(";")[0].strip()
-
-            match content_type:
-                case "application/json":
-                    results = response.json()
-                case "application/rss+xml" | "application/xml" | "text/xml":
-                    results = parse_xml(data=response.content, source_url=url)
-                case "application/zip":
-                    results = response.content
-                case _:
-                    try:
+                content_type = None
+                if headers and "Content-Type" in headers:
+                    content_type = headers["Content-Type"]
+                else:
+                    response_content_type = response.headers.get("Content-Type", "")
+                    if response_content_type:
+                        content_type = response_content_type.split(";")[0].strip()
+
+                match content_type:
+                    case "application/json":
                         results = response.json()
-                    except ValueError:
-                        results = response.text
+                    case "application/rss+xml" | "application/xml" | "text/xml":
+                        results = parse_xml_stream(
+                            chunks=response.iter_content(chunk_size=CHUNK_SIZE),
+                            source_url=url,
+                            max_items=max_items,
+                            since=since,
+                        )
+                    case "application/zip":
+                        results = response.content
+                    case _:
+                        try:
+                            results = response.json()
+                        except ValueError:
+                            results = response.text
+
+            # Only a body read and decoded in full may be revalidated later:
+            # a 304 to a broken one would keep it broken.
+            if conditional and results is not None:
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                expires = cache_expiry(response.headers)
+                self.set_validators(
+                    url,
+                    (
+                        Validators(
+                            etag=etag, last_modified=last_modified, expires=expires
+                        )
+                        if etag or last_modified or expires
+                        else None
+                    ),
+                    params,
+                )
 
         except requests.exceptions.HTTPError as http_error:
             response = http_error.response
@@ -147,5 +414,115 @@ class HttpClient:
             )
         except (TypeError, ValueError):
             results = None
+        finally:
+            if response is not None:
+                response.close()
 
         return results
+
+    def _request(
+        self,
+        method: HttpMethod,
+        url: str,
+        headers: dict | None = None,
+        params: dict | None = None,
+        retry_rate_limited: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        limiter = self._rate_limiter
+        host = urlsplit(url).hostname or ""
+        limited = limiter is not None and limiter.limits(host)
+        key = rate_limit_key(headers, params) if limited else None
+        attempt = 0
+        while True:
+            if limited:
+                limiter.acquire(host, key)
+            response = self._session.request(
+                method, url, headers=headers, params=params, **kwargs
+            )
+            if response.status_code != 429:
+                return response
+
+            delay = retry_after(response.headers)
+            if delay is None:
+                delay = self._backoff_factor * 2**attempt
+            if limited:
+                # Every thread sending to the host with this key holds back.
+                limiter.pause(host, key, delay)
+
+            if (
+                not retry_rate_limited
+                or attempt >= self._status_retries
+                or (not limited and 429 not in self._status_forcelist)
+            ):
+                return response
+            attempt += 1
+            response.close()
+            if not limited:
+                time.sleep(delay)
+
+
+class _Retry(Retry):
+    # Only retry 429 responses when in the status_forcelist, even with a
+    # Retry-After: HttpClient retries them itself.
+    RETRY_AFTER_STATUS_CODES = frozenset((413, 503))
+
+
+def rate_limit_key(headers: dict | None, params: dict | None) -> str | None:
+    """Return the API key a request is sent with, which rate limits apply to."""
+    for name in ("X-Api-Key", "Authorization"):
+        if headers and headers.get(name):
+            return headers[name]
+
+    if params and params.get("apiKey"):
+        return str(params["apiKey"])
+
+    return None
+
+
+_default_client: HttpClient | None = None
+_default_rate_limiter: RateLimiter | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HttpClient, creating it on first use.
+
+    The client is shared by all threads so that repeated polls reuse the
+    pooled keep-alive connections instead of paying new TCP/TLS handshakes.
+    """
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient(rate_limiter=_default_rate_limiter)
+
+        return _default_client
+
+
+def set_rate_limiter(rate_limiter: RateLimiter | None) -> None:
+    """Use the rate limiter in the process-wide HttpClient.
+
+    The current client, whose adapters were built without it, is closed
+    and replaced on next use.
+    """
+    global _default_client, _default_rate_limiter
+
+    with _default_client_lock:
+        if rate_limiter is _default_rate_limiter:
+            return
+
+        _default_rate_limiter = rate_limiter
+        if _default_client is not None:
+            _default_client.close()
+            _default_client = None
+
+
+def close_http_client() -> None:
+    """Close the process-wide HttpClient. The next call creates a new one."""
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is not None:
+            _default_client.close()
+            _default_client = None
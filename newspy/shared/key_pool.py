@@ -0,0 +1,130 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+
+from newspy.shared.exceptions import NewspyException, NewspyHttpException
+
+# Seconds a rate limited key is left out when the response gives no
+# Retry-After.
+DEFAULT_EVICTION = 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class KeyUsage:
+    """Usage of an API key since the start of the UTC day"""
+
+    requests: int
+    rate_limited: int
+    # Seconds before the key is used again, 0 when it is available.
+    evicted_for: float
+
+
+@dataclass(slots=True)
+class _KeyState:
+    day: str
+    requests: int = 0
+    rate_limited: int = 0
+    evicted_until: float = 0.0
+
+
+class ApiKeyPool:
+    """API keys used in turn, leaving out the exhausted ones.
+
+    Requests go round-robin over the available keys. A key is left out
+    until the next UTC day once it has sent daily_limit requests, and for
+    a while after being rate limited. The pool is shared by all threads.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str],
+        daily_limit: int | None = None,
+        eviction: float = DEFAULT_EVICTION,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        :param daily_limit:
+            Requests allowed per key and UTC day, e.g. 100 on the Newsorg
+            developer plan. Not limited by default
+        :param eviction:
+            Seconds a rate limited key is left out when the response tells
+            no Retry-After
+        """
+        self.keys = tuple(dict.fromkeys(key for key in keys if key))
+        if not self.keys:
+            raise NewspyException(msg="An API key pool needs at least one key.")
+
+        self.daily_limit = daily_limit
+        self.eviction = eviction
+        self._clock = clock
+        self._next = 0
+        self._states = {key: _KeyState(day="") for key in self.keys}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def acquire(self) -> str:
+        """Return the next available key and count a request for it.
+
+        Raises NewspyHttpException 429 when all the keys are exhausted.
+        """
+        with self._lock:
+            now = self._clock()
+            for offset in range(len(self.keys)):
+                index = (self._next + offset) % len(self.keys)
+                key = self.keys[index]
+                state = self._state(key, now)
+                if state.evicted_until > now:
+                    continue
+                if self.daily_limit is not None and state.requests >= self.daily_limit:
+                    continue
+
+                state.requests += 1
+                self._next = index + 1
+                return key
+
+        raise NewspyHttpException(
+            status_code=429,
+            msg="All the API keys are exhausted or rate limited.",
+        )
+
+    def evict(self, key: str, seconds: float | None = None) -> None:
+        """Leave the key out after it was rate limited.
+
+        :param seconds:
+            Typically the Retry-After of the response. Defaults to eviction
+        """
+        if key not in self._states:
+            return
+
+        with self._lock:
+            now = self._clock()
+            state = self._state(key, now)
+            state.rate_limited += 1
+            until = now + (self.eviction if seconds is None else seconds)
+            state.evicted_until = max(state.evicted_until, until)
+
+    def usage(self) -> dict[str, KeyUsage]:
+        with self._lock:
+            now = self._clock()
+            return {
+                key: KeyUsage(
+                    requests=state.requests,
+                    rate_limited=state.rate_limited,
+                    evicted_for=max(state.evicted_until - now, 0.0),
+                )
+                for key, state in ((key, self._state(key, now)) for key in self.keys)
+            }
+
+    def _state(self, key: str, now: float) -> _KeyState:
+        state = self._states[key]
+        day = datetime.fromtimestamp(now, tz=timezone.utc).date().isoformat()
+        if state.day != day:
+            # The daily counts restart; an eviction carries over.
+            state.day = day
+            state.requests = 0
+            state.rate_limited = 0
+        return state
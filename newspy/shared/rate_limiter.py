@@ -0,0 +1,167 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Mapping
+
+from requests.structures import CaseInsensitiveDict
+
+from newspy.shared import utils
+from newspy.shared.exceptions import NewspyHttpException
+
+DEFAULT_MAX_WAIT = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitStats:
+    """Budget and counters of a (host, key) rate limit"""
+
+    # Requests that can be sent right now without waiting.
+    remaining: float
+    requests: int
+    # Requests that had to wait for the budget, and for how long in total.
+    throttled: int
+    waited: float
+    # Responses 429 Too Many Requests, and the seconds left of their pause.
+    rate_limited: int
+    paused_for: float
+
+
+@dataclass(slots=True)
+class _Bucket:
+    # Theoretical arrival time of the next request at the sustained rate:
+    # the bucket is full when it is in the past.
+    next_at: float
+    paused_until: float = 0.0
+    requests: int = 0
+    throttled: int = 0
+    waited: float = 0.0
+    rate_limited: int = 0
+
+
+class RateLimiter:
+    """Token buckets per host and API key, shared by all threads.
+
+    Each (host, key) may send burst requests at once and then rate requests
+    per second. Requests wait their turn in the order they ask for it, so a
+    saturated limit sends at a steady pace instead of in bursts. A pause,
+    e.g. for the Retry-After of a 429 response, holds back all the threads
+    using the bucket and the budget then refills from empty.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        hosts: Iterable[str] | None = None,
+        max_wait: float | None = DEFAULT_MAX_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        :param rate:
+            Sustained requests per second allowed per host and key
+        :param burst:
+            Requests allowed at once after being idle. Defaults to rate,
+            and at least 1
+        :param hosts:
+            Only limit the requests to these hosts, e.g. ["newsapi.org"].
+            Defaults to all hosts
+        :param max_wait:
+            Raise a NewspyHttpException 429 instead of waiting longer than
+            this many seconds. None waits as long as needed
+        """
+        self.rate = rate
+        self.burst = max(1.0, rate if burst is None else burst)
+        self.hosts = None if hosts is None else frozenset(hosts)
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._interval = 1 / rate
+        self._tolerance = (self.burst - 1) * self._interval
+        self._buckets: dict[tuple[str, str | None], _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def limits(self, host: str) -> bool:
+        return self.hosts is None or host in self.hosts
+
+    def acquire(self, host: str, key: str | None = None) -> float:
+        """Wait until a request may be sent and return the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(host, key, now)
+            next_at = max(bucket.next_at, now)
+            wait = max(next_at - self._tolerance, bucket.paused_until) - now
+
+            if self.max_wait is not None and wait > self.max_wait:
+                # Like a 429 response, tells when to try again.
+                raise NewspyHttpException(
+                    status_code=429,
+                    msg=f"{host}: rate limited for {wait:.0f} more seconds",
+                    headers=CaseInsensitiveDict({"Retry-After": str(math.ceil(wait))}),
+                )
+
+            # Reserve the turn before waiting, so that the threads waiting
+            # on the same bucket are spaced out.
+            bucket.next_at = max(next_at, bucket.paused_until) + self._interval
+            bucket.requests += 1
+            if wait > 0:
+                bucket.throttled += 1
+                bucket.waited += wait
+
+        if wait > 0:
+            self._sleep(wait)
+        return max(wait, 0.0)
+
+    def pause(self, host: str, key: str | None = None, seconds: float = 0.0) -> None:
+        """Hold back the requests of the bucket, e.g. after a 429 response."""
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(host, key, now)
+            bucket.rate_limited += 1
+            resume_at = now + max(seconds, 0.0)
+            bucket.paused_until = max(bucket.paused_until, resume_at)
+            # Resume at the sustained rate rather than with a burst.
+            bucket.next_at = max(bucket.next_at, resume_at + self._tolerance)
+
+    def stats(self, host: str, key: str | None = None) -> RateLimitStats:
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(host, key, now)
+            next_at = max(bucket.next_at, now)
+            remaining = (now + self._tolerance + self._interval - next_at) / (
+                self._interval
+            )
+
+            return RateLimitStats(
+                remaining=min(max(remaining, 0.0), self.burst),
+                requests=bucket.requests,
+                throttled=bucket.throttled,
+                waited=bucket.waited,
+                rate_limited=bucket.rate_limited,
+                paused_for=max(bucket.paused_until - now, 0.0),
+            )
+
+    def _bucket(self, host: str, key: str | None, now: float) -> _Bucket:
+        bucket = self._buckets.get((host, key))
+        if bucket is None:
+            bucket = self._buckets[(host, key)] = _Bucket(next_at=now)
+        return bucket
+
+
+def retry_after(headers: Mapping[str, str], now: float | None = None) -> float | None:
+    """Return the seconds to wait given by a Retry-After header, if any."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = utils.to_datetime(value).timestamp()
+    except ValueError:
+        return None
+
+    return max(retry_at - (time.time() if now is None else now), 0.0)
@@ -1,29 +1,163 @@
+import os
+import re
 import string
-from datetime import datetime, timezone
+import tempfile
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Hashable, Iterable
+
+# RFC 822 / RFC 2822 dates, as used by RSS: "Sun, 12 Mar 2023 13:00:35 GMT".
+_RFC822 = re.compile(
+    r"\s*(?:[A-Za-z]{3},?\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4}|\d{2})"
+    r"\s+(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([+-]\d{4}|[A-Za-z]{1,3})\s*$"
+)
+_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun")
+        + ("jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+# Zone names defined by RFC 822, as offsets in hours.
+_ZONES = {
+    "gmt": 0,
+    "ut": 0,
+    "utc": 0,
+    "z": 0,
+    "est": -5,
+    "edt": -4,
+    "cst": -6,
+    "cdt": -5,
+    "mst": -7,
+    "mdt": -6,
+    "pst": -8,
+    "pdt": -7,
+}
+
+# Source -> the parser that last worked for its dates. Bounded so that
+# arbitrary source keys cannot grow it forever.
+_MAX_CACHED_SOURCES = 10_000
+_parsers_by_source: dict[Hashable, Callable[[str], datetime | None]] = {}
+
+
+def to_datetime(date_string: str, source: Hashable | None = None) -> datetime:
+    """Parse an ISO 8601 or RFC 822 date.
+
+    :param source:
+        Any key identifying where the date comes from, e.g. a feed url. A
+        source keeps its date format, so the parser that worked for the
+        previous date of the source is tried first
+    :raises ValueError: when the date is not in a supported format
+    """
+    if source is not None:
+        parser = _parsers_by_source.get(source)
+        if parser is not None:
+            transformed = parser(date_string)
+            if transformed is not None:
+                return transformed
+
+    for parser in _PARSERS:
+        transformed = parser(date_string)
+        if transformed is not None:
+            if source is not None:
+                if len(_parsers_by_source) >= _MAX_CACHED_SOURCES:
+                    _parsers_by_source.clear()
+                _parsers_by_source[source] = parser
+            return transformed
+
+    return _parse_strptime(date_string)
+
+
+def to_datetimes(
+    date_strings: Iterable[str], source: Hashable | None = None
+) -> list[datetime | None]:
+    """Parse many dates, e.g. all the dates of a feed.
+
+    Unlike to_datetime, a date that cannot be parsed gives None instead of
+    raising, so that one bad date does not discard the batch.
+    """
+    transformed = []
+    for date_string in date_strings:
+        try:
+            transformed.append(to_datetime(date_string, source=source))
+        except (TypeError, ValueError):
+            transformed.append(None)
+
+    return transformed
+
+
+def _parse_rfc822(date_string: str) -> datetime | None:
+    match = _RFC822.match(date_string)
+    if match is None:
+        return None
+
+    day, month, year, hour, minute, second, zone = match.groups()
+    month = _MONTHS.get(month.lower())
+    if zone[0] in "+-":
+        offset = int(zone[1:3]) * 60 + int(zone[3:5])
+        tzinfo = _timezone(-offset if zone[0] == "-" else offset)
+    else:
+        hours = _ZONES.get(zone.lower())
+        tzinfo = _timezone(hours * 60) if hours is not None else None
+    if month is None or tzinfo is None:
+        return None
+
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+
+    try:
+        return datetime(
+            year,
+            month,
+            int(day),
+            int(hour),
+            int(minute),
+            int(second or 0),
+            tzinfo=tzinfo,
+        )
+    except ValueError:
+        return None
 
 
-def to_datetime(date_string: str) -> datetime:
+def _parse_iso(date_string: str) -> datetime | None:
+    if not date_string[:4].isdigit():
+        return None
+
     try:
         # Replace is added to support both 3.10 and 3.11
         # See: https://docs.python.org/3/library/datetime.html#datetime.datetime.fromisoformat
-        transformed = datetime.fromisoformat(date_string.replace("Z", "+00:00"))
+        return datetime.fromisoformat(date_string.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+_PARSERS = (_parse_iso, _parse_rfc822)
+
+
+@lru_cache(maxsize=None)
+def _timezone(minutes: int) -> timezone:
+    return timezone.utc if minutes == 0 else timezone(timedelta(minutes=minutes))
+
+
+def _parse_strptime(date_string: str) -> datetime:
+    """Fall back to the formats the fast parsers do not cover."""
+    try:
+        transformed = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ")
     except ValueError:
         try:
-            transformed = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ")
+            transformed = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
         except ValueError:
             try:
-                transformed = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
+                transformed = datetime.strptime(date_string, "%a, %d %b %Y %H:%M:%S %z")
             except ValueError:
-                try:
-                    transformed = datetime.strptime(
-                        date_string, "%a, %d %b %Y %H:%M:%S %z"
-                    )
-                except ValueError:
-                    # %Z parses timezone abbreviations (e.g. "GMT") but produces
-                    # a naive datetime; replace with an aware UTC datetime.
-                    transformed = datetime.strptime(
-                        date_string, "%a, %d %b %Y %H:%M:%S %Z"
-                    ).replace(tzinfo=timezone.utc)
+                # %Z parses timezone abbreviations (e.g. "GMT") but produces
+                # a naive datetime; replace with an aware UTC datetime.
+                transformed = datetime.strptime(
+                    date_string, "%a, %d %b %Y %H:%M:%S %Z"
+                ).replace(tzinfo=timezone.utc)
 
     return transformed
 
@@ -34,3 +168,25 @@ def slugify(sentence: str) -> str:
         .translate(str.maketrans("", "", string.punctuation))
         .replace(" ", "-")
     )
+
+
+def get_cache_dir() -> Path:
+    """Return NEWSPY_CACHE_DIR, or the newspy directory of the user cache."""
+    cache_dir = os.getenv("NEWSPY_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "newspy"
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write the file so that readers, possibly in other processes, never
+    see it partially written."""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -1,123 +1,369 @@
+import logging
+import os
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Iterable, Iterator
 from xml.etree import ElementTree
 
+from newspy.shared import utils
+from newspy.shared.exceptions import NewspyException
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover - depends on the environment
+    lxml_etree = None
+
+_LXML_ERRORS = (lxml_etree.LxmlError,) if lxml_etree is not None else ()
+
+logger = logging.getLogger(__name__)
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+RSS1 = "{http://purl.org/rss/1.0/}"
+
+_ATOM_LINK = f"{ATOM}link"
+
+# Fully-qualified item child tag -> (field, rank). When an item has several
+# candidates for a field, the one with the lowest rank wins.
+_ITEM_FIELDS = {
+    "title": ("title", 0),
+    f"{ATOM}title": ("title", 1),
+    f"{RSS1}title": ("title", 2),
+    "description": ("description", 0),
+    f"{CONTENT}encoded": ("description", 1),
+    f"{ATOM}summary": ("description", 2),
+    f"{ATOM}content": ("description", 3),
+    "summary": ("description", 4),
+    f"{RSS1}description": ("description", 5),
+    "link": ("url", 0),
+    f"{RSS1}link": ("url", 1),
+    _ATOM_LINK: ("url", 2),
+    "pubDate": ("published", 0),
+    "published": ("published", 1),
+    f"{ATOM}published": ("published", 2),
+    f"{ATOM}updated": ("published", 3),
+    f"{DC}date": ("published", 4),
+    "date": ("published", 5),
+    "guid": ("guid", 0),
+    f"{ATOM}id": ("guid", 1),
+}
+
+# RSS 2.0, RSS 1.0 (RDF) and Atom item tags.
+_ITEM_TAGS = frozenset(("item", f"{RSS1}item", f"{ATOM}entry"))
+# RSS 2.0 channel elements telling readers how often to poll the feed.
+_SCHEDULE_TAGS = frozenset(("ttl", "skipHours", "skipDays"))
+
+CHUNK_SIZE = 64 * 1024
+
+
+class XmlBackend(str, Enum):
+    LXML = "lxml"
+    STDLIB = "stdlib"
+
+
+def _default_backend() -> XmlBackend:
+    fallback = XmlBackend.LXML if lxml_etree is not None else XmlBackend.STDLIB
+    value = os.getenv("NEWSPY_XML_BACKEND")
+    if not value:
+        return fallback
 
-def parse_xml(data: str, source_url: str) -> list[dict[str, str]] | None:
     try:
-        root = ElementTree.fromstring(data)
-    except ElementTree.ParseError:
-        return None
+        backend = XmlBackend(value)
+    except ValueError:
+        logger.warning("Unknown NEWSPY_XML_BACKEND %r, using %s", value, fallback.value)
+        return fallback
 
-    namespaces = {
-        "atom": "http://www.w3.org/2005/Atom",
-        "content": "http://purl.org/rss/1.0/modules/content/",
-        "dc": "http://purl.org/dc/elements/1.1/",
-        "media": "http://search.yahoo.com/mrss/",
-    }
+    if backend == XmlBackend.LXML and lxml_etree is None:
+        logger.warning("NEWSPY_XML_BACKEND is lxml, which is not installed")
+        return XmlBackend.STDLIB
 
-    items = []
+    return backend
 
-    rss_items = root.findall(".//item")
 
-    if not rss_items:
-        rss_items = root.findall(".//atom:entry", namespaces) or root.findall(
-            ".//{http://www.w3.org/2005/Atom}entry"
-        )
+_backend = _default_backend()
 
-    for item in rss_items:
-        parsed_item = _parse_feed_item(item, source_url, namespaces)
-        if parsed_item:
-            items.append(parsed_item)
 
-    return items if items else None
+def get_backend() -> XmlBackend:
+    return _backend
 
 
-def _parse_feed_item(
-    item: ElementTree.Element, source_url: str, namespaces: dict
-) -> dict[str, str] | None:
-    title = _get_text_content(
-        item,
-        [
-            "title",
-            "atom:title",
-            "{http://www.w3.org/2005/Atom}title",
-        ],
-        namespaces,
-    )
+def set_backend(backend: XmlBackend | None = None) -> None:
+    """Select the library used to parse feeds.
 
-    description = _get_text_content(
-        item,
-        [
-            "description",
-            "content:encoded",
-            "atom:summary",
-            "{http://www.w3.org/2005/Atom}summary",
-            "atom:content",
-            "{http://www.w3.org/2005/Atom}content",
-            "summary",
-        ],
-        namespaces,
-    )
+    :param backend:
+        XmlBackend.LXML parses in C and recovers from malformed feeds.
+        XmlBackend.STDLIB uses xml.etree.ElementTree. None selects the
+        NEWSPY_XML_BACKEND environment variable, or lxml when it is installed
+    """
+    global _backend
+
+    if backend is None:
+        backend = _default_backend()
+    else:
+        backend = XmlBackend(backend)
+
+    if backend == XmlBackend.LXML and lxml_etree is None:
+        raise NewspyException(
+            msg="lxml is not installed. Install it with 'pip install lxml'.",
+        )
 
-    link = _get_link(item, namespaces)
-
-    pub_date = _get_text_content(
-        item,
-        [
-            "pubDate",
-            "published",
-            "atom:published",
-            "{http://www.w3.org/2005/Atom}published",
-            "atom:updated",
-            "{http://www.w3.org/2005/Atom}updated",
-            "dc:date",
-            "date",
-        ],
-        namespaces,
+    _backend = backend
+
+
+def parse_xml(
+    data: str | bytes,
+    source_url: str,
+    max_items: int | None = None,
+    since: datetime | None = None,
+    backend: XmlBackend | None = None,
+) -> list[dict[str, str]] | None:
+    """Parse a whole feed document.
+
+    A module-level function with plain arguments, so it can be submitted to a
+    ProcessPoolExecutor. Pass the backend explicitly there: worker processes
+    do not see set_backend calls made in the parent.
+    """
+    chunks = (data[i : i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+    return parse_xml_stream(
+        chunks, source_url, max_items=max_items, since=since, backend=backend
     )
 
-    if not title:
+
+def parse_xml_stream(
+    chunks: Iterable[str | bytes],
+    source_url: str,
+    max_items: int | None = None,
+    since: datetime | None = None,
+    backend: XmlBackend | None = None,
+) -> list[dict[str, str]] | None:
+    """Parse a feed fed chunk by chunk, e.g. from a streamed HTTP response."""
+    try:
+        items = list(
+            iter_xml(
+                chunks, source_url, max_items=max_items, since=since, backend=backend
+            )
+        )
+    except ElementTree.ParseError:
         return None
 
-    return {
-        "source_url": source_url,
-        "title": title or "",
-        "description": description or "",
-        "url": link or "",
-        "published": pub_date or "",
-    }
+    return items if items else None
+
+
+def iter_xml(
+    chunks: Iterable[str | bytes],
+    source_url: str,
+    max_items: int | None = None,
+    since: datetime | None = None,
+    backend: XmlBackend | None = None,
+) -> Iterator[dict[str, str]]:
+    """Yield each feed item as soon as its end tag has been parsed.
 
+    Stops reading the chunks once a cutoff of the FeedParser is reached.
+    Raises ElementTree.ParseError when the feed is not well-formed, possibly
+    after some items have already been yielded.
+    """
+    parser = FeedParser(source_url, backend=backend, max_items=max_items, since=since)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+
+    yield from parser.close()
+
+
+class FeedParser:
+    """Incremental feed parser that keeps memory bounded to a single item.
+
+    Each item is extracted as soon as its end tag is seen and is then
+    detached from the tree, so only the feed header stays in memory.
+
+    The RSS 2.0 polling hints of the channel are exposed once parsed: ttl in
+    minutes, skip_hours as GMT hours and skip_days as day names.
+    """
+
+    def __init__(
+        self,
+        source_url: str,
+        backend: XmlBackend | None = None,
+        max_items: int | None = None,
+        since: datetime | None = None,
+    ) -> None:
+        """
+        :param backend:
+            Defaults to the backend selected with set_backend. Parse errors are
+            raised as ElementTree.ParseError whichever backend is used
+        :param max_items:
+            Stop after this many items
+        :param since:
+            Stop at the first item published at or before this time. Feeds
+            are expected to list their newest items first. Items without a
+            parsable date are kept. Naive datetimes are taken as UTC
+        """
+        self._source_url = source_url
+        self._max_items = max_items
+        self._since = _as_utc(since) if since is not None else None
+        self._count = 0
+        self.done = False
+        self._backend = backend or get_backend()
+        if self._backend == XmlBackend.LXML:
+            # lxml filters the events in C and links elements to their parent,
+            # so only item end events reach Python.
+            self._parser = lxml_etree.XMLPullParser(
+                events=("end",),
+                tag=list(_ITEM_TAGS | _SCHEDULE_TAGS),
+                recover=True,
+                resolve_entities=False,
+                no_network=True,
+            )
+        else:
+            self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._parents: list[ElementTree.Element] = []
+        self._item_tag: str | None = None
+        self.ttl: int | None = None
+        self.skip_hours: frozenset[int] = frozenset()
+        self.skip_days: frozenset[str] = frozenset()
+
+    def feed(self, data: str | bytes) -> list[dict[str, str]]:
+        if self.done:
+            return []
+
+        try:
+            self._parser.feed(data)
+        except _LXML_ERRORS as exc:
+            raise ElementTree.ParseError(str(exc)) from exc
+
+        return self._read_items()
+
+    def close(self) -> list[dict[str, str]]:
+        # Once a cutoff is reached the rest of the document is never fed.
+        if self.done:
+            return []
 
-def _get_text_content(
-    element: ElementTree.Element, paths: list[str], namespaces: dict
-) -> str:
-    for path in paths:
         try:
-            if ":" in path and not path.startswith("{"):
-                found = element.find(path, namespaces)
+            self._parser.close()
+        except _LXML_ERRORS as exc:
+            raise ElementTree.ParseError(str(exc)) from exc
+
+        return self._read_items()
+
+    def _read_items(self) -> list[dict[str, str]]:
+        items = []
+
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._parents.append(element)
+                continue
+
+            if self._backend == XmlBackend.LXML:
+                parent = element.getparent()
             else:
-                found = element.find(path)
+                self._parents.pop()
+                parent = self._parents[-1] if self._parents else None
 
-            if found is not None:
-                text = found.text
-                if text:
-                    return text.strip()
-        except (AttributeError, KeyError):
-            continue
+            if element.tag in _SCHEDULE_TAGS:
+                if parent is not None and parent.tag == "channel":
+                    self._read_schedule(element)
+                continue
+
+            if element.tag not in _ITEM_TAGS:
+                continue
+
+            # A feed is either RSS 2.0, RDF or Atom: stick to the first kind seen.
+            if self._item_tag is None:
+                self._item_tag = element.tag
+            elif element.tag != self._item_tag:
+                continue
 
-    return ""
+            parsed_item = _parse_feed_item(element, self._source_url)
+            if parent is not None:
+                parent.remove(element)
+            if not parsed_item:
+                continue
 
+            if self._since is not None and self._is_stale(parsed_item):
+                self.done = True
+                break
+
+            items.append(parsed_item)
+            self._count += 1
+            if self._max_items is not None and self._count >= self._max_items:
+                self.done = True
+                break
 
-def _get_link(element: ElementTree.Element, namespaces: dict) -> str:
-    link = _get_text_content(element, ["link"], namespaces)
-    if link:
-        return link
+        return items
 
-    for link_path in ["atom:link", "{http://www.w3.org/2005/Atom}link"]:
+    def _read_schedule(self, element: ElementTree.Element) -> None:
+        if element.tag == "ttl":
+            try:
+                self.ttl = int((element.text or "").strip())
+            except ValueError:
+                pass
+        elif element.tag == "skipHours":
+            self.skip_hours = frozenset(
+                int(hour.text)
+                for hour in element
+                if hour.tag == "hour" and (hour.text or "").strip().isdigit()
+            )
+        else:
+            self.skip_days = frozenset(
+                day.text.strip().capitalize()
+                for day in element
+                if day.tag == "day" and (day.text or "").strip()
+            )
+
+    def _is_stale(self, item: dict[str, str]) -> bool:
         try:
-            link_elem = element.find(link_path, namespaces)
-            if link_elem is not None and "href" in link_elem.attrib:
-                return link_elem.attrib["href"].strip()
-        except (AttributeError, KeyError):
+            published = utils.to_datetime(item["published"], source=self._source_url)
+        except ValueError:
+            return False
+
+        return _as_utc(published) <= self._since
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _parse_feed_item(
+    item: ElementTree.Element, source_url: str
+) -> dict[str, str] | None:
+    """Extract the item fields in a single pass over its children.
+
+    Only the first child with a given tag is considered, and it is skipped
+    when it has no text (or, for an Atom link, no href).
+    """
+    fields: dict[str, tuple[int, str]] = {}
+    seen = set()
+
+    for child in item:
+        tag = child.tag
+        entry = _ITEM_FIELDS.get(tag)
+        if entry is None or tag in seen:
             continue
+        seen.add(tag)
 
-    return ""
+        if tag == _ATOM_LINK:
+            value = child.get("href")
+        else:
+            value = child.text
+        if not value:
+            continue
+
+        name, rank = entry
+        current = fields.get(name)
+        if current is None or rank < current[0]:
+            fields[name] = (rank, value.strip())
+
+    title = fields.get("title", (0, ""))[1]
+    if not title:
+        return None
+
+    return {
+        "source_url": source_url,
+        "title": title,
+        "description": fields.get("description", (0, ""))[1],
+        "url": fields.get("url", (0, ""))[1],
+        "published": fields.get("published", (0, ""))[1],
+        "guid": fields.get("guid", (0, ""))[1],
+    }
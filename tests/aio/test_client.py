@@ -0,0 +1,201 @@
+import asyncio
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import responses
+
+import newspy.client as newspy
+from newspy.aio import client, newsorg
+from newspy.aio.http_client import AsyncHttpClient
+from newspy.models import Channel, Language, Source
+from newspy.shared.cache import MemoryCache
+from newspy.shared.key_pool import ApiKeyPool
+from newspy.shared.exceptions import NewspyException
+
+API_KEY = "seckfkdLkkekeKy"
+
+
+@responses.activate
+def test_get_articles(newsorg_articles_res_json, rss_articles_res_xml) -> None:
+    with open("tests/data/rss_sources.csv.gz", "rb") as f:
+        rss_sources_data = f.read()
+
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://github.com/onemoola/newspy/blob/main/data/rss_sources.csv.gz?raw=true",
+            "body": rss_sources_data,
+            "status": 200,
+            "content_type": "application/zip",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": f"https://newsapi.org/v2/top-headlines?apiKey={API_KEY}&language=en&pageSize=100&page=1",
+            "body": newsorg_articles_res_json,
+            "status": 200,
+            "content_type": "application/json",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/WSJcomUSBusiness.xml",
+            "body": None,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+
+    newspy.configure(newsorg_api_key=API_KEY)
+    actual = asyncio.run(
+        client.get_articles(
+            language=Language.EN, http_client=AsyncHttpClient(use_aiohttp=False)
+        )
+    )
+
+    assert [article.source.id for article in actual] == [
+        "fortune",
+        "wsj-markets",
+        "wsj-markets",
+    ]
+
+
+@responses.activate
+def test_get_sources(newsorg_sources_res_json) -> None:
+    with open("tests/data/rss_sources.csv.gz", "rb") as f:
+        rss_sources_data = f.read()
+
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://github.com/onemoola/newspy/blob/main/data/rss_sources.csv.gz?raw=true",
+            "body": rss_sources_data,
+            "status": 200,
+            "content_type": "application/zip",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": f"https://newsapi.org/v2/top-headlines/sources?apiKey={API_KEY}",
+            "body": newsorg_sources_res_json,
+            "status": 200,
+            "content_type": "application/json",
+        }
+    )
+
+    newspy.configure(newsorg_api_key=API_KEY)
+    actual = asyncio.run(
+        client.get_sources(http_client=AsyncHttpClient(use_aiohttp=False))
+    )
+
+    assert actual == [
+        Source(id="abc-news", name="ABC News", channel=Channel.NEWSORG),
+        Source(
+            id="wsj-markets",
+            name="The Wall Street Journal Markets",
+            channel=Channel.RSS,
+        ),
+        Source(
+            id="wsj-business",
+            name="The Wall Street Journal Business",
+            channel=Channel.RSS,
+        ),
+    ]
+
+
+@responses.activate
+def test_get_newsorg_articles_exception(newsorg_articles_res_broken_json) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": f"https://newsapi.org/v2/top-headlines?apiKey={API_KEY}&q=bitcoin&pageSize=100&page=1",
+            "body": newsorg_articles_res_broken_json,
+            "status": 200,
+            "content_type": "application/json",
+        }
+    )
+
+    newspy.configure(newsorg_api_key=API_KEY)
+    with pytest.raises(
+        NewspyException, match="Failed to validate the News Org articles response"
+    ):
+        asyncio.run(
+            newsorg.get_articles(
+                search_text="bitcoin", http_client=AsyncHttpClient(use_aiohttp=False)
+            )
+        )
+
+
+@responses.activate
+def test_get_newsorg_articles_from_the_cache(newsorg_articles_res_json) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": f"https://newsapi.org/v2/top-headlines?apiKey={API_KEY}&q=bitcoin&pageSize=100&page=1",
+            "body": newsorg_articles_res_json,
+            "status": 200,
+            "content_type": "application/json",
+        }
+    )
+
+    newspy.configure(newsorg_api_key=API_KEY, newsorg_cache=MemoryCache())
+
+    async def run() -> tuple:
+        http_client = AsyncHttpClient(use_aiohttp=False)
+        first = await newsorg.get_articles(
+            search_text="bitcoin", http_client=http_client
+        )
+        second = await newsorg.get_articles(
+            search_text="bitcoin", http_client=http_client
+        )
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_get_newsorg_articles_with_a_key_pool(newsorg_articles_res_json) -> None:
+    responses.add(
+        responses.GET,
+        re.compile(r"https://newsapi.org/v2/top-headlines.*apiKey=first.*"),
+        status=429,
+        headers={"Retry-After": "60"},
+        json={"status": "error", "code": "rateLimited"},
+    )
+    responses.add(
+        responses.GET,
+        re.compile(r"https://newsapi.org/v2/top-headlines.*apiKey=second.*"),
+        body=newsorg_articles_res_json,
+        content_type="application/json",
+    )
+    pool = ApiKeyPool(["first", "second"])
+    newspy.configure(newsorg_api_key=pool)
+
+    asyncio.run(
+        newsorg.get_articles(
+            search_text="bitcoin", http_client=AsyncHttpClient(use_aiohttp=False)
+        )
+    )
+
+    used = [
+        parse_qs(urlsplit(call.request.url).query)["apiKey"][0]
+        for call in responses.calls
+    ]
+    assert used == ["first", "second"]
+    assert pool.usage()["first"].rate_limited == 1
@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from newspy.aio import http_client
+from newspy.aio.http_client import AsyncHttpClient
+from newspy.shared.exceptions import NewspyException, NewspyHttpException
+from newspy.shared.http_client import NOT_MODIFIED, HttpMethod
+
+
+def test_async_http_client_when_aiohttp_is_not_installed(monkeypatch) -> None:
+    monkeypatch.setattr(http_client, "aiohttp", None)
+
+    with pytest.raises(NewspyException, match="aiohttp is not installed"):
+        AsyncHttpClient(use_aiohttp=True)
+
+
+def test_async_http_client_with_aiohttp(rss_articles_res_xml) -> None:
+    pytest.importorskip("aiohttp")
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    async def feed(request: web.Request) -> web.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+
+        return web.Response(
+            text=rss_articles_res_xml,
+            content_type="application/rss+xml",
+            headers={"ETag": '"v1"'},
+        )
+
+    async def error(request: web.Request) -> web.Response:
+        return web.json_response({"error": {"message": "Bad request"}}, status=404)
+
+    async def run() -> tuple:
+        app = web.Application()
+        app.router.add_get("/feed", feed)
+        app.router.add_get("/error", error)
+
+        async with TestServer(app) as server, AsyncHttpClient() as client:
+            url = str(server.make_url("/feed"))
+            first = await client.send(HttpMethod.GET, url, conditional=True)
+            second = await client.send(HttpMethod.GET, url, conditional=True)
+
+            with pytest.raises(NewspyHttpException, match="status code: 404"):
+                await client.send(HttpMethod.GET, str(server.make_url("/error")))
+
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert [item["title"] for item in first] == [
+        "Three global cities are pulling ahead since the peak of the pandemic",
+        "UK seeks to tap Middle East money to buy out SVB unit",
+    ]
+    assert second is NOT_MODIFIED
+
+
+def test_async_http_client_without_retry_rate_limited() -> None:
+    pytest.importorskip("aiohttp")
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    calls = []
+
+    async def rate_limited(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        return web.json_response(
+            {"status": "error"}, status=429, headers={"Retry-After": "60"}
+        )
+
+    async def run() -> NewspyHttpException:
+        app = web.Application()
+        app.router.add_get("/v2", rate_limited)
+
+        async with TestServer(app) as server, AsyncHttpClient() as client:
+            with pytest.raises(NewspyHttpException) as ex:
+                await client.send(
+                    HttpMethod.GET,
+                    str(server.make_url("/v2")),
+                    retry_rate_limited=False,
+                )
+        return ex.value
+
+    actual = asyncio.run(run())
+
+    assert actual.status_code == 429
+    assert actual.headers["Retry-After"] == "60"
+    assert len(calls) == 1
+
+
+def test_async_http_client_when_the_body_is_cut_short() -> None:
+    pytest.importorskip("aiohttp")
+
+    async def truncated(reader, writer) -> None:
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/rss+xml\r\n"
+            b"Content-Length: 1000\r\n\r\n"
+            b"<rss><channel><item><title>a</title>"
+        )
+        await writer.drain()
+        writer.close()
+
+    async def run() -> None:
+        server = await asyncio.start_server(truncated, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server, AsyncHttpClient(retries=0) as client:
+            await client.send(HttpMethod.GET, f"http://127.0.0.1:{port}/feed")
+
+    with pytest.raises(NewspyException, match="feed"):
+        asyncio.run(run())
+
+
+def test_async_http_client_when_the_body_is_cut_short_keeps_no_validators() -> None:
+    pytest.importorskip("aiohttp")
+
+    async def truncated(reader, writer) -> None:
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b'ETag: "v1"\r\n'
+            b"Content-Type: application/rss+xml\r\n"
+            b"Content-Length: 1000\r\n\r\n"
+            b"<rss><channel><item><title>a</title>"
+        )
+        await writer.drain()
+        writer.close()
+
+    async def run() -> AsyncHttpClient:
+        server = await asyncio.start_server(truncated, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server, AsyncHttpClient(retries=0) as client:
+            with pytest.raises(NewspyException):
+                await client.send(
+                    HttpMethod.GET, f"http://127.0.0.1:{port}/feed", conditional=True
+                )
+
+        return client
+
+    client = asyncio.run(run())
+
+    assert client._validators == {}
+
+
+def test_get_async_http_client_is_shared_in_the_event_loop() -> None:
+    async def run() -> tuple:
+        first = http_client.get_async_http_client()
+        second = http_client.get_async_http_client()
+        await http_client.close_async_http_client()
+        return first, second, http_client.get_async_http_client()
+
+    first, second, after_close = asyncio.run(run())
+
+    assert first is second
+    assert after_close is not first
+
+
+def test_async_http_client_closes_its_own_http_client(monkeypatch) -> None:
+    closed = []
+    client = AsyncHttpClient(use_aiohttp=False)
+    monkeypatch.setattr(client._http_client, "close", lambda: closed.append(True))
+
+    asyncio.run(client.close())
+
+    assert closed == [True]
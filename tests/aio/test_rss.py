@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import responses
+
+from newspy.aio import rss
+from newspy.aio.http_client import AsyncHttpClient
+from newspy.models import Category, Language
+from newspy.rss.models import RssSource
+
+WSJ_MARKETS = RssSource(
+    id="wsj-markets",
+    name="The Wall Street Journal Markets",
+    description="The Wall Street Journal (WSJ) Markets RSS",
+    url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+    category=Category.FINANCIAL,
+    language=Language.EN,
+)
+WSJ_BUSINESS = RssSource(
+    id="wsj-business",
+    name="The Wall Street Journal Business",
+    description="The Wall Street Journal (WSJ) Business RSS",
+    url="https://feeds.a.dj.com/rss/WSJcomUSBusiness.xml",
+    category=Category.BUSINESS,
+    language=Language.EN,
+)
+
+
+@responses.activate
+def test_get_rss_articles(rss_articles_res_xml) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/WSJcomUSBusiness.xml",
+            "json": {"error": {"message": "Service unavailable"}},
+            "status": 404,
+            "content_type": "application/json",
+        }
+    )
+
+    actual = asyncio.run(
+        rss.get_articles(
+            sources=[WSJ_MARKETS, WSJ_BUSINESS],
+            http_client=AsyncHttpClient(use_aiohttp=False),
+        )
+    )
+
+    assert [article.title for article in actual] == [
+        "Three global cities are pulling ahead since the peak of the pandemic",
+        "UK seeks to tap Middle East money to buy out SVB unit",
+    ]
+    assert all(article.source == WSJ_MARKETS for article in actual)
+
+
+@responses.activate
+def test_get_rss_articles_with_parse_executor(rss_articles_res_xml) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as parse_executor:
+        actual = asyncio.run(
+            rss.get_articles(
+                sources=[WSJ_MARKETS],
+                http_client=AsyncHttpClient(use_aiohttp=False),
+                max_items=1,
+                parse_executor=parse_executor,
+            )
+        )
+
+    assert [article.title for article in actual] == [
+        "Three global cities are pulling ahead since the peak of the pandemic",
+    ]
+    assert actual[0].source == WSJ_MARKETS
+
+
+def test_get_rss_sources_from_local_path() -> None:
+    actual = asyncio.run(
+        rss.get_sources(
+            file_path=Path("tests/data/rss_sources.csv.gz"),
+            category=Category.BUSINESS,
+        )
+    )
+
+    assert actual == [WSJ_BUSINESS]
+
+
+@responses.activate
+def test_get_rss_sources_from_remote_path() -> None:
+    with open("tests/data/rss_sources.csv.gz", "rb") as f:
+        rss_sources_data = f.read()
+
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://github.com/onemoola/newspy/blob/main/data/rss_sources.csv.gz?raw=true",
+            "body": rss_sources_data,
+            "status": 200,
+            "content_type": "application/zip",
+        }
+    )
+
+    actual = asyncio.run(
+        rss.get_sources(http_client=AsyncHttpClient(use_aiohttp=False))
+    )
+
+    assert actual == [WSJ_MARKETS, WSJ_BUSINESS]
@@ -1,12 +1,51 @@
 import json
+from pathlib import Path
 
 import pytest
 
+import newspy.client
 from newspy.newsorg.models import (
     NewsorgArticle,
     NewsorgArticlesRes,
     NewsorgSource,
 )
+from newspy.shared import xml_parser
+from newspy.shared.xml_parser import XmlBackend
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch) -> Path:
+    """Keep each test's cached files, e.g. the RSS source catalog, apart."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("NEWSPY_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def client_config(monkeypatch) -> None:
+    """Restore the configuration replaced by the tests calling configure."""
+    monkeypatch.setattr(
+        newspy.client, "default_client_config", newspy.client.default_client_config
+    )
+
+
+@pytest.fixture(params=[XmlBackend.STDLIB, XmlBackend.LXML])
+def xml_backend(request) -> XmlBackend:
+    if request.param == XmlBackend.LXML:
+        pytest.importorskip("lxml")
+
+    backend = xml_parser.get_backend()
+    xml_parser.set_backend(request.param)
+    yield request.param
+    xml_parser.set_backend(backend)
+
+
+@pytest.fixture
+def stdlib_xml_backend() -> XmlBackend:
+    backend = xml_parser.get_backend()
+    xml_parser.set_backend(XmlBackend.STDLIB)
+    yield XmlBackend.STDLIB
+    xml_parser.set_backend(backend)
 
 
 @pytest.fixture
@@ -1,4 +1,7 @@
+import json
+import re
 from datetime import date
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
 import responses
@@ -6,8 +9,17 @@ import responses
 from newspy import client
 from newspy import newsorg
 from newspy.models import Language, Country, Category
-from newspy.newsorg.models import NewsorgSource, NewsorgArticle, NewsorgEndpoint
+from newspy.newsorg.models import (
+    NewsorgArticle,
+    NewsorgEndpoint,
+    NewsorgQuery,
+    NewsorgSource,
+)
+from newspy.shared.cache import MemoryCache
 from newspy.shared.exceptions import NewspyException
+from newspy.shared.http_client import HttpClient
+from newspy.shared.key_pool import ApiKeyPool
+from newspy.shared.rate_limiter import RateLimiter
 
 API_KEY = "seckfkdLkkekeKy"
 BASE_URL = "https://newsapi.org/v2/top-headlines"
@@ -216,6 +228,8 @@ def test_create_articles_params_when_endpoint_is_everything_and_page_size_and_pa
 
 
 def test_create_articles_params_when_from_date_is_greater_than_to_date() -> None:
+    client.configure(newsorg_api_key=API_KEY)
+
     with pytest.raises(
         NewspyException,
         match="The from date cannot be greater than the to date.",
@@ -425,3 +439,278 @@ def test_get_newsorg_source_exception(newsorg_sources_res_broken_json) -> None:
         "'category': 'general', 'language': 'en', 'country': 'us'}]}, reason: "
         "NewsorgSource.__init__() got an unexpected keyword argument 'full_name'"
     )
+
+
+def add_paged_articles(total: int, page_size: int, status: int = 200) -> list[int]:
+    """Serve total articles in pages and return the pages requested."""
+    requested = []
+
+    def callback(request):
+        params = parse_qs(urlsplit(request.url).query)
+        page = int(params["page"][0])
+        requested.append(page)
+        first = (page - 1) * page_size
+        articles = [
+            {
+                "source": {"id": "fortune", "name": "Fortune"},
+                "author": None,
+                "title": f"Article {i}",
+                "description": "",
+                "url": f"https://fortune.com/{i}",
+                "urlToImage": "",
+                "publishedAt": "2022-06-01T13:22:34Z",
+                "content": "",
+            }
+            for i in range(first, min(first + page_size, total))
+        ]
+        body = {"status": "ok", "totalResults": total, "articles": articles}
+        return status, {}, json.dumps(body)
+
+    responses.add_callback(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*"),
+        callback=callback,
+        content_type="application/json",
+    )
+    return requested
+
+
+@responses.activate
+def test_get_all_newsorg_articles() -> None:
+    requested = add_paged_articles(total=25, page_size=10)
+    client.configure(newsorg_api_key=API_KEY)
+
+    actual = newsorg.get_all_articles(search_text="bitcoin", page_size=10)
+
+    assert [article.title for article in actual] == [f"Article {i}" for i in range(25)]
+    assert sorted(requested) == [1, 2, 3]
+
+
+@responses.activate
+def test_get_all_newsorg_articles_with_max_results() -> None:
+    requested = add_paged_articles(total=100, page_size=10)
+    client.configure(newsorg_api_key=API_KEY)
+
+    actual = newsorg.get_all_articles(
+        search_text="bitcoin", page_size=10, max_results=15, max_workers=2
+    )
+
+    assert [article.title for article in actual] == [f"Article {i}" for i in range(15)]
+    assert sorted(requested) == [1, 2]
+
+
+@responses.activate
+def test_iter_all_newsorg_pages_when_one_page() -> None:
+    requested = add_paged_articles(total=3, page_size=10)
+    client.configure(newsorg_api_key=API_KEY)
+
+    actual = list(newsorg.iter_all_pages(search_text="bitcoin", page_size=10))
+
+    assert len(actual) == 3
+    assert requested == [1]
+
+
+@responses.activate
+def test_iter_all_newsorg_pages_stops_fetching_when_closed() -> None:
+    requested = add_paged_articles(total=1000, page_size=10)
+    client.configure(newsorg_api_key=API_KEY)
+
+    pages = newsorg.iter_all_pages(search_text="bitcoin", page_size=10, max_workers=1)
+    first = [next(pages) for _ in range(15)]
+    pages.close()
+
+    assert first[-1].title == "Article 14"
+    assert len(requested) < 100
+
+
+@responses.activate
+def test_get_newsorg_articles_from_the_cache(newsorg_articles_res_json) -> None:
+    responses.add(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*"),
+        body=newsorg_articles_res_json,
+        content_type="application/json",
+    )
+    cache = MemoryCache()
+    client.configure(newsorg_api_key=API_KEY, newsorg_cache=cache)
+
+    first = newsorg.get_articles(search_text="bitcoin")
+    client.configure(newsorg_api_key="other-key", newsorg_cache=cache)
+    second = newsorg.get_articles(search_text="bitcoin")
+    newsorg.get_articles(search_text="ethereum")
+
+    assert first == second
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_get_newsorg_articles_when_the_endpoint_is_not_cached(
+    newsorg_articles_res_json,
+) -> None:
+    responses.add(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*"),
+        body=newsorg_articles_res_json,
+        content_type="application/json",
+    )
+    client.configure(
+        newsorg_api_key=API_KEY,
+        newsorg_cache=MemoryCache(),
+        newsorg_cache_ttls={"TOP_HEADLINES": 0},
+    )
+
+    newsorg.get_articles(search_text="bitcoin")
+    newsorg.get_articles(search_text="bitcoin")
+
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_get_newsorg_articles_with_a_key_pool(newsorg_articles_res_json) -> None:
+    responses.add(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*apiKey=first.*"),
+        status=429,
+        headers={"Retry-After": "60"},
+        json={"status": "error", "code": "rateLimited"},
+    )
+    responses.add(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*apiKey=second.*"),
+        body=newsorg_articles_res_json,
+        content_type="application/json",
+    )
+    pool = ApiKeyPool(["first", "second"])
+    client.configure(newsorg_api_key=pool)
+
+    newsorg.get_articles(search_text="bitcoin")
+    newsorg.get_articles(search_text="bitcoin")
+
+    used = [
+        parse_qs(urlsplit(call.request.url).query)["apiKey"][0]
+        for call in responses.calls
+    ]
+    # The rate limited key is left out at once, without retrying it.
+    assert used == ["first", "second", "second"]
+    assert pool.usage()["first"].rate_limited == 1
+    assert pool.usage()["first"].evicted_for > 0
+
+
+@responses.activate
+def test_get_newsorg_articles_with_a_key_pool_and_rate_limiter(
+    newsorg_articles_res_json,
+) -> None:
+    responses.add(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*apiKey=first.*"),
+        status=429,
+        headers={"Retry-After": "60"},
+        json={"status": "error", "code": "rateLimited"},
+    )
+    responses.add(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*apiKey=second.*"),
+        body=newsorg_articles_res_json,
+        content_type="application/json",
+    )
+    pool = ApiKeyPool(["first", "second"])
+    client.configure(newsorg_api_key=pool)
+    limiter = RateLimiter(rate=100, sleep=lambda seconds: None)
+    http_client = HttpClient(rate_limiter=limiter)
+
+    newsorg.get_articles(search_text="bitcoin", http_client=http_client)
+
+    assert len(responses.calls) == 2
+    assert 59 <= pool.usage()["first"].evicted_for <= 60
+
+
+@responses.activate
+def test_get_newsorg_articles_with_a_key_pool_when_the_limiter_is_paused(
+    newsorg_articles_res_json,
+) -> None:
+    responses.add(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*apiKey=second.*"),
+        body=newsorg_articles_res_json,
+        content_type="application/json",
+    )
+    pool = ApiKeyPool(["first", "second"])
+    client.configure(newsorg_api_key=pool)
+    limiter = RateLimiter(rate=10, hosts=["newsapi.org"], max_wait=1)
+    limiter.pause("newsapi.org", "first", 3600)
+    http_client = HttpClient(rate_limiter=limiter)
+
+    newsorg.get_articles(search_text="bitcoin", http_client=http_client)
+
+    # The limiter won't wait for the first key: it is evicted for the pause.
+    assert len(responses.calls) == 1
+    assert pool.usage()["first"].rate_limited == 1
+    assert 3590 <= pool.usage()["first"].evicted_for <= 3600
+
+
+def newsorg_article_json(url: str) -> dict:
+    return {
+        "source": {"id": "fortune", "name": "Fortune"},
+        "author": None,
+        "title": url,
+        "description": "",
+        "url": url,
+        "urlToImage": "",
+        "publishedAt": "2022-06-01T13:22:34Z",
+        "content": "",
+    }
+
+
+@responses.activate
+def test_get_newsorg_articles_batch() -> None:
+    urls_by_country = {
+        "us": ["https://example.com/a", "https://example.com/b"],
+        "gb": ["http://www.example.com/b/", "https://example.com/c"],
+        "fr": ["https://example.com/a", "https://example.com/d"],
+    }
+
+    def callback(request):
+        params = parse_qs(urlsplit(request.url).query)
+        country = params["country"][0]
+        if country == "de":
+            return 400, {}, json.dumps({"status": "error"})
+        articles = [newsorg_article_json(url) for url in urls_by_country[country]]
+        body = {"status": "ok", "totalResults": len(articles), "articles": articles}
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(
+        responses.GET,
+        re.compile(f"{BASE_URL}.*"),
+        callback=callback,
+        content_type="application/json",
+    )
+    client.configure(newsorg_api_key=API_KEY)
+    queries = [
+        NewsorgQuery(country=Country(country), category=Category.BUSINESS)
+        for country in ("us", "gb", "de", "fr", "us")
+    ]
+
+    actual = newsorg.get_articles_batch(queries, max_workers=2)
+
+    assert list(actual) == [queries[0], queries[1], queries[3]]
+    assert [[article.url for article in articles] for articles in actual.values()] == [
+        ["https://example.com/a", "https://example.com/b"],
+        ["https://example.com/c"],
+        ["https://example.com/d"],
+    ]
+    assert len(responses.calls) == 4
+
+
+def test_get_newsorg_articles_batch_when_a_query_is_invalid() -> None:
+    client.configure(newsorg_api_key=API_KEY)
+    queries = [
+        NewsorgQuery(country=Country.US, category=Category.BUSINESS),
+        NewsorgQuery(
+            country=Country.US,
+            sources=[NewsorgSource(id="fortune", name="Fortune")],
+        ),
+    ]
+
+    assert hash(queries[1])
+    with pytest.raises(NewspyException, match="Not both"):
+        newsorg.get_articles_batch(queries)
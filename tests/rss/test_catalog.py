@@ -0,0 +1,229 @@
+import gzip
+import os
+import time
+from pathlib import Path
+
+import pytest
+import requests
+import responses
+from responses import matchers
+
+from newspy import rss
+from newspy.rss import catalog
+from newspy.models import Category, Language
+from newspy.rss.catalog import SourceCatalog
+from newspy.rss.models import RssSource
+from newspy.shared.exceptions import NewspyHttpException
+from newspy.shared.http_client import HttpClient
+
+CATALOG_URL = "https://example.com/rss_sources.csv.gz"
+SOURCES = [
+    RssSource(
+        id=f"{category}-{language}",
+        name=f"{category} {language}",
+        description="",
+        url=f"https://example.com/{category}/{language}.xml",
+        category=category,
+        language=language,
+    )
+    for category in ("business", "financial", "sports")
+    for language in ("en", "fr")
+]
+
+with open("tests/data/rss_sources.csv.gz", "rb") as f:
+    CATALOG = f.read()
+
+
+@responses.activate
+def test_get_sources_caches_the_catalog_on_disk(cache_dir) -> None:
+    responses.add(responses.GET, CATALOG_URL, body=CATALOG, status=200)
+
+    first = rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient())
+    second = rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient())
+
+    assert [source.id for source in first] == ["wsj-markets", "wsj-business"]
+    assert second == first
+    assert len(responses.calls) == 1
+    assert list((cache_dir / "catalogs").glob("*.csv.gz"))
+
+
+@responses.activate
+def test_get_sources_parses_an_unchanged_catalog_once() -> None:
+    responses.add(responses.GET, CATALOG_URL, body=CATALOG, status=200)
+
+    first = catalog.load_catalog(CATALOG_URL, http_client=HttpClient())
+    second = catalog.load_catalog(CATALOG_URL, http_client=HttpClient())
+
+    assert second is first
+
+
+@responses.activate
+def test_get_sources_revalidates_a_stale_catalog() -> None:
+    responses.add(
+        responses.GET,
+        CATALOG_URL,
+        body=CATALOG,
+        status=200,
+        headers={"ETag": '"v1"'},
+    )
+    rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient())
+    responses.replace(
+        responses.GET,
+        CATALOG_URL,
+        status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"v1"'})],
+    )
+
+    actual = rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient(), max_age=0)
+
+    assert [source.id for source in actual] == ["wsj-markets", "wsj-business"]
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_get_sources_downloads_a_changed_catalog() -> None:
+    responses.add(responses.GET, CATALOG_URL, body=CATALOG, status=200)
+    rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient())
+    changed = gzip.compress(
+        b"id,name,description,url,category,language\n"
+        b"ft,Financial Times,FT,https://www.ft.com/rss,financial,en\n"
+    )
+    responses.replace(responses.GET, CATALOG_URL, body=changed, status=200)
+
+    actual = rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient(), max_age=0)
+
+    assert [source.id for source in actual] == ["ft"]
+
+
+@responses.activate
+def test_get_sources_when_offline_uses_the_cached_catalog() -> None:
+    responses.add(responses.GET, CATALOG_URL, body=CATALOG, status=200)
+    expected = rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient())
+    responses.replace(
+        responses.GET, CATALOG_URL, body=requests.exceptions.ConnectionError()
+    )
+
+    actual = rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient(), max_age=0)
+
+    assert actual == expected
+
+
+@responses.activate
+def test_get_sources_when_offline_uses_the_packaged_catalog() -> None:
+    responses.add(
+        responses.GET,
+        catalog.DEFAULT_SOURCES_URL,
+        body=requests.exceptions.ConnectionError(),
+    )
+
+    actual = rss.get_sources(http_client=HttpClient())
+
+    assert actual == catalog.parse_catalog(catalog.PACKAGED_SOURCES_PATH)
+    assert all(isinstance(source, RssSource) for source in actual)
+
+
+@responses.activate
+def test_get_sources_from_another_url_when_offline_raises() -> None:
+    responses.add(
+        responses.GET, CATALOG_URL, body=requests.exceptions.ConnectionError()
+    )
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient())
+
+
+@responses.activate
+def test_get_sources_does_not_cache_an_invalid_catalog(cache_dir) -> None:
+    responses.add(
+        responses.GET, catalog.DEFAULT_SOURCES_URL, body=b"<html></html>", status=200
+    )
+
+    actual = rss.get_sources(http_client=HttpClient())
+
+    assert actual == catalog.parse_catalog(catalog.PACKAGED_SOURCES_PATH)
+    assert not (cache_dir / "catalogs").exists()
+
+
+@responses.activate
+def test_get_sources_when_not_found_raises() -> None:
+    responses.add(responses.GET, CATALOG_URL, body=b"", status=404)
+
+    with pytest.raises(NewspyHttpException, match="status code: 404"):
+        rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient())
+
+
+@responses.activate
+def test_get_cached_catalog_when_stale() -> None:
+    responses.add(responses.GET, CATALOG_URL, body=CATALOG, status=200)
+    rss.get_sources(file_path=CATALOG_URL, http_client=HttpClient())
+    path = catalog._validators_path(catalog._cache_path(CATALOG_URL, None))
+    validated = time.time() - catalog.DEFAULT_MAX_AGE - 1
+    os.utime(path, (validated, validated))
+
+    assert catalog.get_cached_catalog(CATALOG_URL) is None
+    assert catalog.get_cached_catalog(CATALOG_URL, max_age=float("inf"))
+
+
+def test_source_catalog_filter_by_one_value() -> None:
+    source_catalog = SourceCatalog(SOURCES)
+
+    assert [s.id for s in source_catalog.filter(category=Category.SPORTS)] == [
+        "sports-en",
+        "sports-fr",
+    ]
+    assert [s.id for s in source_catalog.filter(language="fr")] == [
+        "business-fr",
+        "financial-fr",
+        "sports-fr",
+    ]
+
+
+def test_source_catalog_filter_by_several_values() -> None:
+    source_catalog = SourceCatalog(SOURCES)
+
+    actual = source_catalog.filter(
+        category={Category.SPORTS, Category.BUSINESS}, language=[Language.EN]
+    )
+
+    assert [source.id for source in actual] == ["business-en", "sports-en"]
+
+
+def test_source_catalog_filter_by_ids() -> None:
+    source_catalog = SourceCatalog(SOURCES)
+
+    actual = source_catalog.filter(ids=["sports-fr", "unknown"], language="fr")
+
+    assert [source.id for source in actual] == ["sports-fr"]
+
+
+def test_source_catalog_without_filters() -> None:
+    source_catalog = SourceCatalog(SOURCES)
+
+    assert source_catalog.filter() == SOURCES
+    assert source_catalog.filter(category=[]) == SOURCES
+    assert source_catalog.filter(category=Category.HEALTH) == []
+    assert len(source_catalog) == 6
+    assert list(source_catalog) == SOURCES
+
+
+def test_source_catalog_get() -> None:
+    source_catalog = SourceCatalog(SOURCES)
+
+    assert source_catalog.get("financial-en") == SOURCES[2]
+    assert source_catalog.get("unknown") is None
+
+
+def test_get_sources_with_several_categories() -> None:
+    actual = rss.get_sources(
+        file_path=Path("tests/data/rss_sources.csv.gz"),
+        category=[Category.FINANCIAL, Category.BUSINESS],
+    )
+
+    assert [source.id for source in actual] == ["wsj-markets", "wsj-business"]
+
+
+def test_get_source_catalog_from_a_file_is_loaded_once() -> None:
+    first = rss.get_source_catalog(file_path=catalog.PACKAGED_SOURCES_PATH)
+    second = rss.get_source_catalog(file_path=catalog.PACKAGED_SOURCES_PATH)
+
+    assert second is first
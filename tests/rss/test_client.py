@@ -1,11 +1,18 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
 import responses
+from responses import matchers
 
 from newspy import rss
 from newspy.models import Language, Category
 from newspy.rss.client import URL
 from newspy.rss.models import RssSource, RssArticle
+from newspy.shared.dedup import SeenSet
+from newspy.shared.http_client import HttpClient
 
 
 @responses.activate
@@ -34,6 +41,7 @@ def test_get_rss_articles(rss_articles_res_xml) -> None:
             description="Miami, Dubai and Singapore boom by welcoming those chased out of rival international hubs",
             url="https://www.ft.com/content/1cf1b55e-bb8d-435a-95a3-5d21149939b6",
             published="Sun, 12 Mar 2023 13:00:35 GMT",
+            guid="1cf1b55e-bb8d-435a-95a3-5d21149939b6",
         ),
         RssArticle(
             source=RssSource(
@@ -48,6 +56,7 @@ def test_get_rss_articles(rss_articles_res_xml) -> None:
             description="‘Lead white knight’ eyeing British arm of tech lender that had billions in deposits",
             url="https://www.ft.com/content/cde4aa95-1cb5-408d-b35f-3216eaee46ae",
             published="Sun, 12 Mar 2023 12:54:53 GMT",
+            guid="cde4aa95-1cb5-408d-b35f-3216eaee46ae",
         ),
     ]
     rss_sources = [
@@ -344,3 +353,272 @@ def test_get_rss_resources_from_invalid_path():
     actual = rss.get_sources(file_path=123)  # type: ignore
 
     assert actual == []
+
+
+@responses.activate
+def test_get_rss_articles_when_conditional_and_feed_not_modified(
+    rss_articles_res_xml,
+) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+            "headers": {"ETag": '"v1"'},
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "status": 304,
+            "match": [matchers.header_matcher({"If-None-Match": '"v1"'})],
+        }
+    )
+
+    rss_sources = [
+        RssSource(
+            id="wsj-markets",
+            name="The Wall Street Journal Markets",
+            description="The Wall Street Journal (WSJ) Markets RSS",
+            url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            category=Category.FINANCIAL,
+            language=Language.EN,
+        )
+    ]
+    http_client = HttpClient()
+
+    first = rss.get_articles(
+        sources=rss_sources, http_client=http_client, conditional=True
+    )
+    second = rss.get_articles(
+        sources=rss_sources, http_client=http_client, conditional=True
+    )
+
+    assert len(first) == 2
+    assert second == []
+
+
+@responses.activate
+def test_iter_rss_articles(rss_articles_res_xml) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+
+    rss_sources = [
+        RssSource(
+            id="wsj-markets",
+            name="The Wall Street Journal Markets",
+            description="The Wall Street Journal (WSJ) Markets RSS",
+            url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            category=Category.FINANCIAL,
+            language=Language.EN,
+        )
+    ]
+    articles = rss.iter_articles(sources=rss_sources)
+
+    assert isinstance(articles, Iterator)
+    assert (
+        next(articles).title
+        == "Three global cities are pulling ahead since the peak of the pandemic"
+    )
+    assert (
+        next(articles).title == "UK seeks to tap Middle East money to buy out SVB unit"
+    )
+    assert next(articles, None) is None
+
+
+@responses.activate
+def test_get_rss_articles_attributes_each_feed_to_its_source(
+    rss_articles_res_xml,
+) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+
+    rss_sources = [
+        RssSource(
+            id=f"wsj-markets-{i}",
+            name="The Wall Street Journal Markets",
+            description="The Wall Street Journal (WSJ) Markets RSS",
+            url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            category=Category.FINANCIAL,
+            language=Language.EN,
+        )
+        for i in range(3)
+    ]
+
+    actual = rss.get_articles(sources=rss_sources)
+
+    assert sorted(article.source.id for article in actual) == [
+        "wsj-markets-0",
+        "wsj-markets-0",
+        "wsj-markets-1",
+        "wsj-markets-1",
+        "wsj-markets-2",
+        "wsj-markets-2",
+    ]
+
+
+@responses.activate
+def test_get_rss_articles_with_since_and_max_items(rss_articles_res_xml) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+
+    rss_sources = [
+        RssSource(
+            id="wsj-markets",
+            name="The Wall Street Journal Markets",
+            description="The Wall Street Journal (WSJ) Markets RSS",
+            url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            category=Category.FINANCIAL,
+            language=Language.EN,
+        )
+    ]
+
+    since = rss.get_articles(
+        sources=rss_sources,
+        since=datetime(2023, 3, 12, 12, 58, tzinfo=timezone.utc),
+    )
+    max_items = rss.get_articles(sources=rss_sources, max_items=1)
+
+    assert [article.published for article in since] == ["Sun, 12 Mar 2023 13:00:35 GMT"]
+    assert [article.published for article in max_items] == [
+        "Sun, 12 Mar 2023 13:00:35 GMT"
+    ]
+
+
+@responses.activate
+def test_get_rss_articles_with_parse_executor(rss_articles_res_xml) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/WSJcomUSBusiness.xml",
+            "body": "Hello World",
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+
+    rss_sources = [
+        RssSource(
+            id="wsj-markets",
+            name="The Wall Street Journal Markets",
+            description="The Wall Street Journal (WSJ) Markets RSS",
+            url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            category=Category.FINANCIAL,
+            language=Language.EN,
+        ),
+        RssSource(
+            id="wsj-business",
+            name="The Wall Street Journal Business",
+            description="The Wall Street Journal (WSJ) Business RSS",
+            url="https://feeds.a.dj.com/rss/WSJcomUSBusiness.xml",
+            category=Category.BUSINESS,
+            language=Language.EN,
+        ),
+    ]
+
+    # Spawn the workers: forking a process that runs fetch threads is unsafe.
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("spawn")
+    ) as parse_executor:
+        actual = rss.get_articles(
+            sources=rss_sources, max_items=1, parse_executor=parse_executor
+        )
+
+    assert len(actual) == 1
+    assert actual[0].source.id == "wsj-markets"
+    assert (
+        actual[0].title
+        == "Three global cities are pulling ahead since the peak of the pandemic"
+    )
+
+
+@responses.activate
+def test_get_rss_articles_with_seen(rss_articles_res_xml) -> None:
+    responses.add(
+        responses.GET,
+        "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+        body=rss_articles_res_xml,
+        content_type="application/rss+xml",
+    )
+    rss_sources = [
+        RssSource(
+            id="wsj-markets",
+            name="The Wall Street Journal Markets",
+            description="The Wall Street Journal (WSJ) Markets RSS",
+            url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            category=Category.FINANCIAL,
+            language=Language.EN,
+        )
+    ]
+    seen = SeenSet()
+    first = rss.get_articles(sources=rss_sources, seen=seen)
+
+    seen_url = first[0].url.replace("https://", "http://") + "?utm_source=rss"
+    assert seen_url in seen
+    assert len(first) == 2
+    assert rss.get_articles(sources=rss_sources, seen=seen) == []
+
+
+@responses.activate
+def test_get_rss_articles_with_seen_and_no_link() -> None:
+    responses.add(
+        responses.GET,
+        "https://example.com/feed.xml",
+        body="""<rss><channel>
+            <item><title>a</title><guid>tag:example.com,2023:a</guid></item>
+            <item><title>b</title><guid>tag:example.com,2023:b</guid></item>
+            <item><title>c</title></item>
+        </channel></rss>""",
+        content_type="application/rss+xml",
+    )
+    rss_sources = [
+        RssSource(
+            id="example",
+            name="Example",
+            description="Example feed",
+            url="https://example.com/feed.xml",
+            category=Category.GENERAL,
+            language=Language.EN,
+        )
+    ]
+    seen = SeenSet()
+
+    first = rss.get_articles(sources=rss_sources, seen=seen)
+    second = rss.get_articles(sources=rss_sources, seen=seen)
+
+    assert [article.title for article in first] == ["a", "b", "c"]
+    # Without url nor guid, an item can't be told apart from a new one.
+    assert [article.title for article in second] == ["c"]
@@ -0,0 +1,238 @@
+import dataclasses
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+import responses
+from responses import matchers
+
+from newspy.models import Category, Language
+from newspy.rss.models import RssSource
+from newspy.rss.scheduler import FeedScheduler
+from newspy.shared.http_client import HttpClient
+
+FEED_URL = "https://example.com/feed.xml"
+SOURCE = RssSource(
+    id="example",
+    name="Example",
+    description="Example feed",
+    url=FEED_URL,
+    category=Category.GENERAL,
+    language=Language.EN,
+)
+# Sunday 12 March 2023, 10:00 UTC.
+START = datetime(2023, 3, 12, 10, 0, tzinfo=timezone.utc).timestamp()
+
+
+class Clock:
+    def __init__(self, now: float = START) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_feed(*titles: str, channel: str = "") -> str:
+    items = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{title}</link></item>"
+        for title in titles
+    )
+    return f"<rss><channel><title>Example</title>{channel}{items}</channel></rss>"
+
+
+def make_scheduler(clock: Clock, **kwargs) -> FeedScheduler:
+    return FeedScheduler(
+        sources=[SOURCE],
+        http_client=HttpClient(),
+        clock=clock,
+        rng=random.Random(0),
+        start_spread=0,
+        jitter=0,
+        **kwargs,
+    )
+
+
+@responses.activate
+def test_run_pending_returns_new_articles_once() -> None:
+    clock = Clock()
+    responses.add(responses.GET, FEED_URL, body=make_feed("b", "a"))
+    scheduler = make_scheduler(clock, initial_interval=600)
+
+    first = scheduler.run_pending()
+    not_due = scheduler.run_pending()
+    responses.replace(responses.GET, FEED_URL, body=make_feed("c", "b", "a"))
+    clock.now += 600
+    second = scheduler.run_pending()
+
+    assert [article.title for article in first] == ["b", "a"]
+    assert all(article.source == SOURCE for article in first)
+    assert not_due == []
+    assert [article.title for article in second] == ["c"]
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_interval_follows_the_publish_rate() -> None:
+    clock = Clock()
+    responses.add(responses.GET, FEED_URL, body=make_feed("a"))
+    scheduler = make_scheduler(
+        clock, initial_interval=600, min_interval=60, max_interval=3600
+    )
+    scheduler.run_pending()
+
+    # Four articles in ten minutes: one every 150 seconds.
+    responses.replace(responses.GET, FEED_URL, body=make_feed("e", "d", "c", "b"))
+    clock.now += 600
+    scheduler.run_pending()
+    busy = scheduler.feeds["example"].interval
+
+    clock.now += busy
+    scheduler.run_pending()
+    quiet = scheduler.feeds["example"].interval
+
+    assert busy == 150
+    assert quiet > busy
+    assert scheduler.feeds["example"].next_poll == clock.now + quiet
+
+
+@responses.activate
+def test_interval_honours_the_feed_ttl() -> None:
+    clock = Clock()
+    responses.add(
+        responses.GET, FEED_URL, body=make_feed("a", channel="<ttl>120</ttl>")
+    )
+    scheduler = make_scheduler(clock, initial_interval=600)
+
+    scheduler.run_pending()
+
+    assert scheduler.feeds["example"].ttl == 120
+    assert scheduler.feeds["example"].next_poll == START + 120 * 60
+
+
+@responses.activate
+def test_polls_are_moved_out_of_skipped_hours_and_days() -> None:
+    clock = Clock()
+    responses.add(
+        responses.GET,
+        FEED_URL,
+        body=make_feed(
+            "a",
+            channel="<skipHours><hour>10</hour><hour>11</hour></skipHours>"
+            "<skipDays><day>Monday</day></skipDays>",
+        ),
+    )
+    scheduler = make_scheduler(clock, initial_interval=600)
+
+    scheduler.run_pending()
+    first_poll = scheduler.feeds["example"].next_poll
+    # Sunday 23:50 plus 15 minutes falls on Monday.
+    clock.now = datetime(2023, 3, 12, 23, 50, tzinfo=timezone.utc).timestamp()
+    scheduler.run_pending()
+
+    state = scheduler.feeds["example"]
+    assert state.skip_hours == {10, 11}
+    assert state.skip_days == {"Monday"}
+    assert first_poll == datetime(2023, 3, 12, 12, tzinfo=timezone.utc).timestamp()
+    assert state.next_poll == datetime(2023, 3, 14, tzinfo=timezone.utc).timestamp()
+
+
+@responses.activate
+def test_interval_honours_http_cache_headers() -> None:
+    # Cache headers expire in wall clock time.
+    clock = Clock(time.time())
+    responses.add(
+        responses.GET,
+        FEED_URL,
+        body=make_feed("a"),
+        headers={"ETag": '"v1"', "Cache-Control": "max-age=3600"},
+    )
+    scheduler = make_scheduler(clock, initial_interval=600)
+
+    scheduler.run_pending()
+    assert scheduler.feeds["example"].next_poll >= time.time() + 3590
+
+    responses.replace(
+        responses.GET,
+        FEED_URL,
+        status=304,
+        headers={"Cache-Control": "max-age=7200"},
+        match=[matchers.header_matcher({"If-None-Match": '"v1"'})],
+    )
+    clock.now = scheduler.feeds["example"].next_poll
+    articles = scheduler.run_pending()
+
+    assert articles == []
+    assert scheduler.feeds["example"].next_poll >= time.time() + 7190
+
+
+@responses.activate
+def test_failing_feed_backs_off() -> None:
+    clock = Clock()
+    responses.add(responses.GET, FEED_URL, status=404)
+    scheduler = make_scheduler(clock, initial_interval=600)
+
+    scheduler.run_pending()
+
+    state = scheduler.feeds["example"]
+    assert state.errors == 1
+    assert state.interval == 1200
+    assert state.last_poll is None
+
+
+@responses.activate
+def test_unreachable_feed_backs_off_and_stays_scheduled() -> None:
+    clock = Clock()
+    down = dataclasses.replace(SOURCE, id="down", url="https://down.example.com/")
+    responses.add(responses.GET, FEED_URL, body=make_feed("a"))
+    responses.add(
+        responses.GET, down.url, body=requests.exceptions.ConnectionError("down")
+    )
+    scheduler = make_scheduler(clock, initial_interval=600)
+    scheduler.add(down)
+
+    articles = scheduler.run_pending()
+
+    assert [article.title for article in articles] == ["a"]
+    assert scheduler.feeds["down"].errors == 1
+    assert scheduler.feeds["down"].interval == 1200
+    assert scheduler.next_poll_time() == START + 600
+
+    clock.now += 1200
+    scheduler.run_pending()
+
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_removed_feed_is_not_polled() -> None:
+    responses.add(responses.GET, FEED_URL, body=make_feed("a"))
+    scheduler = make_scheduler(Clock())
+
+    scheduler.remove("example")
+
+    assert scheduler.run_pending() == []
+    assert scheduler.next_poll_time() is None
+
+
+@responses.activate
+def test_start_polls_in_the_background() -> None:
+    responses.add(responses.GET, FEED_URL, body=make_feed("a"))
+    polled = threading.Event()
+    received = []
+
+    def on_articles(articles) -> None:
+        received.extend(articles)
+        polled.set()
+
+    scheduler = FeedScheduler(
+        sources=[SOURCE],
+        http_client=HttpClient(),
+        on_articles=on_articles,
+        start_spread=0,
+    )
+    with scheduler:
+        assert polled.wait(5)
+
+    assert [article.title for article in received] == ["a"]
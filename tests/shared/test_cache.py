@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from newspy.models import Language
+from newspy.shared.cache import DiskCache, MemoryCache, ResponseCache, cache_key
+
+
+def test_cache_key_ignores_the_api_key_and_param_order() -> None:
+    first = cache_key("https://example.com", {"apiKey": "a", "q": "x", "page": 1})
+    second = cache_key("https://example.com", {"page": "1", "q": "x", "apiKey": "b"})
+
+    assert first == second
+    assert first != cache_key("https://example.com", {"q": "y", "page": 1})
+    assert cache_key("u", {"language": Language.EN}) == cache_key(
+        "u", {"language": "en"}
+    )
+
+
+@pytest.fixture(params=["memory", "disk"])
+def response_cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCache(max_size=2)
+    return DiskCache(tmp_path / "responses", max_size=2)
+
+
+def test_response_cache_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        ResponseCache()
+
+
+def test_response_cache_get_and_set(response_cache) -> None:
+    response_cache.set("a", {"status": "ok"}, ttl=60)
+
+    assert response_cache.get("a") == {"status": "ok"}
+    assert response_cache.get("b") is None
+
+
+def test_response_cache_expires_entries(response_cache, monkeypatch) -> None:
+    response_cache.set("a", {"status": "ok"}, ttl=60)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    assert response_cache.get("a") is None
+    assert len(response_cache) == 0
+
+
+def test_response_cache_evicts_the_least_recently_used(response_cache) -> None:
+    response_cache.set("a", 1, ttl=60)
+    time.sleep(0.01)
+    response_cache.set("b", 2, ttl=60)
+    time.sleep(0.01)
+    response_cache.get("a")
+    time.sleep(0.01)
+    response_cache.set("c", 3, ttl=60)
+
+    assert response_cache.get("a") == 1
+    assert response_cache.get("b") is None
+    assert response_cache.get("c") == 3
+    assert len(response_cache) == 2
+
+
+def test_response_cache_clear(response_cache) -> None:
+    response_cache.set("a", 1, ttl=60)
+    response_cache.clear()
+
+    assert response_cache.get("a") is None
+
+
+def test_response_cache_fetches_concurrent_misses_once(response_cache) -> None:
+    calls = []
+    started = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return {"status": "ok"}
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                response_cache.get_or_fetch("a", ttl=60, fetch=fetch)
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"status": "ok"}] * 4
+
+
+def test_response_cache_does_not_cache_failed_fetches(response_cache) -> None:
+    def fetch():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        response_cache.get_or_fetch("a", ttl=60, fetch=fetch)
+
+    assert response_cache.get_or_fetch("a", ttl=60, fetch=lambda: 1) == 1
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path) -> None:
+    DiskCache(tmp_path).set("a", {"status": "ok"}, ttl=60)
+    (tmp_path / "broken.json").write_text("{")
+
+    assert DiskCache(tmp_path).get("a") == {"status": "ok"}
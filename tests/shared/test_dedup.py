@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+
+from newspy.shared.dedup import SeenSet, article_key, canonicalize_url
+from newspy.shared.exceptions import NewspyException
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://example.com/a", "https://example.com/a"),
+        ("HTTP://WWW.Example.com:80/a/", "https://example.com/a"),
+        ("https://example.com:8443/a#comments", "https://example.com:8443/a"),
+        (
+            "https://example.com/a?b=2&utm_source=rss&a=1&fbclid=x",
+            "https://example.com/a?a=1&b=2",
+        ),
+        ("https://example.com", "https://example.com/"),
+        (" urn:uuid:1234 ", "urn:uuid:1234"),
+        ("https://example.com:port/a", "https://example.com:port/a"),
+    ],
+)
+def test_canonicalize_url(url, expected) -> None:
+    assert canonicalize_url(url) == expected
+
+
+@pytest.mark.parametrize("false_positive_rate", [None, 0.001])
+def test_seen_set_add(false_positive_rate) -> None:
+    seen = SeenSet(false_positive_rate=false_positive_rate)
+
+    assert seen.add("https://example.com/a")
+    assert not seen.add("http://www.example.com/a/")
+    assert seen.add("https://example.com/b")
+    assert "https://example.com/b" in seen
+    assert "https://example.com/c" not in seen
+    assert len(seen) == 2
+
+
+def test_seen_set_never_records_empty_keys() -> None:
+    seen = SeenSet()
+
+    assert seen.add("")
+    assert seen.add(" ")
+    assert "" not in seen
+    assert len(seen) == 0
+
+
+def test_article_key() -> None:
+    assert article_key("https://example.com/a", "guid") == "https://example.com/a"
+    assert article_key("", " guid ") == "guid"
+    assert article_key(None, None) == ""
+
+
+def test_seen_set_forgets_the_least_recently_seen() -> None:
+    seen = SeenSet(max_size=2, key=None)
+
+    seen.add("a")
+    seen.add("b")
+    seen.add("a")
+    seen.add("c")
+
+    assert "a" in seen
+    assert "b" not in seen
+    assert len(seen) == 2
+
+
+def test_seen_set_rotates_bloom_filters() -> None:
+    seen = SeenSet(max_size=100, false_positive_rate=1e-6, key=None)
+
+    for i in range(100):
+        seen.add(f"old-{i}")
+    for i in range(50):
+        seen.add(f"new-{i}")
+    # Seen again after the rotation: kept in the current filter.
+    assert not seen.add("old-0")
+    for i in range(50, 100):
+        seen.add(f"new-{i}")
+
+    assert "old-0" in seen
+    assert all(f"new-{i}" in seen for i in range(100))
+    assert not any(f"old-{i}" in seen for i in range(1, 100))
+    assert len(seen) == 101
+
+
+def test_seen_set_bloom_false_positive_rate() -> None:
+    seen = SeenSet(max_size=10_000, false_positive_rate=0.01, key=None)
+    for i in range(10_000):
+        seen.add(f"seen-{i}")
+
+    false_positives = sum(f"new-{i}" in seen for i in range(10_000))
+
+    assert false_positives < 200
+
+
+@pytest.mark.parametrize("false_positive_rate", [None, 0.001])
+def test_seen_set_save_and_load(tmp_path, false_positive_rate) -> None:
+    path = tmp_path / "seen" / "articles.bin"
+    seen = SeenSet(false_positive_rate=false_positive_rate, path=path)
+    seen.add("https://example.com/a")
+    seen.save()
+
+    loaded = SeenSet(false_positive_rate=false_positive_rate, path=path)
+
+    assert "https://example.com/a" in loaded
+    assert not loaded.add("https://example.com/a")
+    assert len(loaded) == 1
+
+
+def test_seen_set_ignores_a_file_with_other_settings(tmp_path) -> None:
+    path = tmp_path / "articles.bin"
+    seen = SeenSet(path=path)
+    seen.add("https://example.com/a")
+    seen.save()
+    (tmp_path / "broken.bin").write_bytes(b"\x00\x01")
+
+    assert len(SeenSet(false_positive_rate=0.01, path=path)) == 0
+    assert len(SeenSet(path=tmp_path / "broken.bin")) == 0
+
+
+def test_seen_set_save_without_path() -> None:
+    with pytest.raises(NewspyException, match="no path"):
+        SeenSet().save()
+
+
+def test_seen_set_with_invalid_settings() -> None:
+    with pytest.raises(NewspyException):
+        SeenSet(max_size=0)
+    with pytest.raises(NewspyException):
+        SeenSet(false_positive_rate=1)
+
+
+def test_seen_set_add_from_many_threads() -> None:
+    seen = SeenSet(key=None)
+    new = []
+
+    def add_all() -> None:
+        new.append(sum(seen.add(str(i)) for i in range(1000)))
+
+    threads = [threading.Thread(target=add_all) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(new) == 1000
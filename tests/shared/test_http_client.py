@@ -1,11 +1,27 @@
 import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
+import requests
 import responses
+from responses import matchers
 
 from newspy.newsorg.models import NewsorgArticlesRes
 from newspy.shared.exceptions import NewspyHttpException
-from newspy.shared.http_client import HttpClient, HttpMethod
+from newspy.shared.http_client import (
+    NOT_MODIFIED,
+    HttpClient,
+    HttpMethod,
+    Validators,
+    _Retry,
+    cache_expiry,
+    close_http_client,
+    get_http_client,
+    set_rate_limiter,
+)
+from newspy.shared.rate_limiter import RateLimiter
 
 API_KEY = "seckfkdLkkekeKy"
 
@@ -219,6 +235,7 @@ def test_http_client_when_content_type_is_rss(rss_articles_res_xml) -> None:
             "title": "Three global cities are pulling ahead since the peak of the "
             "pandemic",
             "url": "https://www.ft.com/content/1cf1b55e-bb8d-435a-95a3-5d21149939b6",
+            "guid": "1cf1b55e-bb8d-435a-95a3-5d21149939b6",
             "source_url": "https://www.ft.com/",
         },
         {
@@ -227,6 +244,7 @@ def test_http_client_when_content_type_is_rss(rss_articles_res_xml) -> None:
             "published": "Sun, 12 Mar 2023 12:54:53 GMT",
             "title": "UK seeks to tap Middle East money to buy out SVB unit",
             "url": "https://www.ft.com/content/cde4aa95-1cb5-408d-b35f-3216eaee46ae",
+            "guid": "cde4aa95-1cb5-408d-b35f-3216eaee46ae",
             "source_url": "https://www.ft.com/",
         },
     ]
@@ -296,3 +314,411 @@ def test_http_client_when_content_type_is_zip():
     )
 
     assert actual == b"Hello World"
+
+
+def test_get_http_client_returns_shared_client() -> None:
+    close_http_client()
+
+    actual = get_http_client()
+
+    assert actual is get_http_client()
+
+
+def test_close_http_client_creates_new_client_on_next_use() -> None:
+    client = get_http_client()
+
+    close_http_client()
+
+    assert get_http_client() is not client
+
+
+def test_http_client_pool_size() -> None:
+    client = HttpClient(pool_connections=4, pool_maxsize=50)
+    adapter = client._session.get_adapter("https://www.ft.com/")
+
+    assert client.pool_maxsize == 50
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 50
+
+
+@responses.activate
+def test_http_client_as_context_manager() -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://www.ft.com/",
+            "body": "Hello World",
+            "status": 200,
+            "content_type": "text/html",
+        }
+    )
+
+    with HttpClient() as client:
+        actual = client.send(method=HttpMethod.GET, url="https://www.ft.com/")
+
+    assert actual == "Hello World"
+
+
+def test_http_client_mounts_adapter_for_http_and_https() -> None:
+    client = HttpClient()
+
+    https_adapter = client._session.get_adapter("https://www.ft.com/")
+    http_adapter = client._session.get_adapter("http://www.ft.com/")
+
+    assert http_adapter is https_adapter
+    assert http_adapter.max_retries.total == HttpClient.MAX_RETRIES
+
+
+def test_http_client_pool_sizes_per_prefix() -> None:
+    client = HttpClient(
+        pool_maxsize=10, pool_sizes={"http://": 20, "https://newsapi.org": 4}
+    )
+
+    http_adapter = client._session.get_adapter("http://www.ft.com/")
+    host_adapter = client._session.get_adapter("https://newsapi.org/v2/everything")
+    https_adapter = client._session.get_adapter("https://www.ft.com/")
+
+    assert http_adapter._pool_maxsize == 20
+    assert host_adapter._pool_maxsize == 4
+    assert host_adapter._pool_connections == 1
+    assert https_adapter._pool_maxsize == 10
+
+
+def test_http_client_mount_pool_does_not_mutate_the_mounted_adapters() -> None:
+    client = HttpClient()
+    adapters = client._session.adapters
+
+    client.mount_pool(prefix="https://newsapi.org", pool_maxsize=4)
+
+    assert list(adapters) == ["https://", "http://"]
+    assert list(client._session.adapters) == [
+        "https://newsapi.org",
+        "https://",
+        "http://",
+    ]
+
+
+def test_http_client_mount_pool_when_requests_session_is_false() -> None:
+    client = HttpClient(requests_session=False)
+
+    client.mount_pool(prefix="https://newsapi.org", pool_maxsize=4)
+
+    assert client._session is requests.api
+
+
+@responses.activate
+def test_http_client_when_conditional_request_is_not_modified(
+    rss_articles_res_xml,
+) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://www.ft.com/",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+            "headers": {
+                "ETag": '"v1"',
+                "Last-Modified": "Sun, 12 Mar 2023 13:26:24 GMT",
+            },
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://www.ft.com/",
+            "status": 304,
+            "match": [
+                matchers.header_matcher(
+                    {
+                        "If-None-Match": '"v1"',
+                        "If-Modified-Since": "Sun, 12 Mar 2023 13:26:24 GMT",
+                    }
+                )
+            ],
+        }
+    )
+
+    client = HttpClient()
+    first = client.send(
+        method=HttpMethod.GET, url="https://www.ft.com/", conditional=True
+    )
+    second = client.send(
+        method=HttpMethod.GET, url="https://www.ft.com/", conditional=True
+    )
+
+    assert len(first) == 2
+    assert second is NOT_MODIFIED
+    assert client.get_validators("https://www.ft.com/") == Validators(
+        etag='"v1"', last_modified="Sun, 12 Mar 2023 13:26:24 GMT"
+    )
+
+
+@responses.activate
+def test_http_client_when_not_conditional_does_not_send_validators() -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://www.ft.com/",
+            "body": "Hello World",
+            "status": 200,
+            "content_type": "text/html",
+        }
+    )
+
+    client = HttpClient()
+    client.set_validators("https://www.ft.com/", Validators(etag='"v1"'))
+    actual = client.send(method=HttpMethod.GET, url="https://www.ft.com/")
+
+    assert actual == "Hello World"
+    assert "If-None-Match" not in responses.calls[0].request.headers
+
+
+def test_http_client_validators_are_keyed_by_url_and_params() -> None:
+    client = HttpClient()
+    client.set_validators(
+        "https://www.ft.com/", Validators(etag='"v1"'), params={"format": "rss"}
+    )
+
+    assert client.get_validators("https://www.ft.com/?format=rss") == Validators(
+        etag='"v1"'
+    )
+    assert client.get_validators("https://www.ft.com/") is None
+
+    client.clear_validators()
+
+    assert client.get_validators("https://www.ft.com/?format=rss") is None
+
+
+@responses.activate
+def test_http_client_when_raw(rss_articles_res_xml) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://www.ft.com/",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+
+    client = HttpClient()
+    actual = client.send(method=HttpMethod.GET, url="https://www.ft.com/", raw=True)
+
+    assert actual == rss_articles_res_xml.encode()
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"Cache-Control": "public, max-age=600"}, 1600),
+        ({"Cache-Control": "max-age=600", "Age": "100"}, 1500),
+        (
+            {"Cache-Control": "no-cache", "Expires": "Sun, 12 Mar 2023 10:00:00 GMT"},
+            None,
+        ),
+        ({"Expires": "Sun, 12 Mar 2023 10:00:00 GMT"}, 1678615200),
+        ({"Expires": "0"}, 1000),
+        ({}, None),
+    ],
+)
+def test_cache_expiry(headers, expected) -> None:
+    assert cache_expiry(headers, now=1000) == expected
+
+
+@responses.activate
+def test_http_client_when_not_modified_updates_the_expiry() -> None:
+    responses.add(
+        responses.GET,
+        BASE_URL,
+        body="<rss/>",
+        headers={"ETag": '"v1"', "Cache-Control": "max-age=60"},
+    )
+    responses.add(
+        responses.GET,
+        BASE_URL,
+        status=304,
+        headers={"Cache-Control": "max-age=3600"},
+    )
+    http_client = HttpClient()
+
+    http_client.send(method=HttpMethod.GET, url=BASE_URL, conditional=True, raw=True)
+    first = http_client.get_validators(BASE_URL)
+    http_client.send(method=HttpMethod.GET, url=BASE_URL, conditional=True, raw=True)
+    second = http_client.get_validators(BASE_URL)
+
+    assert first.etag == second.etag == '"v1"'
+    assert second.expires - first.expires > 3000
+
+
+@responses.activate
+def test_http_client_when_the_feed_has_no_items_keeps_no_validators() -> None:
+    responses.add(
+        responses.GET,
+        BASE_URL,
+        body="<rss><channel></channel></rss>",
+        content_type="application/rss+xml",
+        headers={"ETag": '"v1"'},
+    )
+    http_client = HttpClient()
+
+    actual = http_client.send(method=HttpMethod.GET, url=BASE_URL, conditional=True)
+
+    assert actual is None
+    assert http_client.get_validators(BASE_URL) is None
+
+
+def test_http_client_when_the_body_is_cut_short_keeps_no_validators() -> None:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", "1000")
+            self.end_headers()
+            self.wfile.write(b"<rss><channel><item><title>a</title>")
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/feed"
+    http_client = HttpClient()
+
+    try:
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            http_client.send(method=HttpMethod.GET, url=url, conditional=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert http_client.get_validators(url) is None
+
+
+@responses.activate
+def test_http_client_with_rate_limiter_honours_retry_after() -> None:
+    responses.add(
+        responses.GET, BASE_URL, status=429, headers={"Retry-After": "2"}, json={}
+    )
+    responses.add(responses.GET, BASE_URL, json={"status": "ok"})
+    sleeps = []
+    limiter = RateLimiter(rate=100, burst=100, sleep=sleeps.append)
+    http_client = HttpClient(rate_limiter=limiter)
+
+    actual = http_client.send(method=HttpMethod.GET, url=BASE_URL, params=PARAMS)
+
+    assert actual == {"status": "ok"}
+    assert len(responses.calls) == 2
+    assert sleeps and sleeps[0] == pytest.approx(2, abs=0.1)
+    stats = limiter.stats("localhost", API_KEY)
+    assert stats.requests == 2
+    assert stats.rate_limited == 1
+
+
+@responses.activate
+def test_http_client_with_rate_limiter_when_rate_limited() -> None:
+    responses.add(
+        responses.GET, BASE_URL, status=429, headers={"Retry-After": "1"}, json={}
+    )
+    limiter = RateLimiter(rate=100, sleep=lambda seconds: None)
+    http_client = HttpClient(rate_limiter=limiter, status_retries=2)
+
+    with pytest.raises(NewspyHttpException) as ex:
+        http_client.send(method=HttpMethod.GET, url=BASE_URL, params=PARAMS)
+
+    assert ex.value.status_code == 429
+    assert ex.value.headers["Retry-After"] == "1"
+    assert len(responses.calls) == 3
+    assert limiter.stats("localhost", API_KEY).rate_limited == 3
+
+
+@responses.activate
+def test_http_client_with_rate_limiter_skips_other_hosts() -> None:
+    responses.add(responses.GET, BASE_URL, json={"status": "ok"})
+    limiter = RateLimiter(rate=1, hosts=["newsapi.org"])
+    http_client = HttpClient(rate_limiter=limiter)
+
+    for _ in range(3):
+        http_client.send(method=HttpMethod.GET, url=BASE_URL, params=PARAMS)
+
+    assert limiter.stats("localhost", API_KEY).requests == 0
+
+
+@responses.activate
+def test_http_client_with_rate_limiter_retries_429_of_other_hosts() -> None:
+    responses.add(
+        responses.GET, BASE_URL, status=429, headers={"Retry-After": "0"}, json={}
+    )
+    responses.add(responses.GET, BASE_URL, json={"status": "ok"})
+    limiter = RateLimiter(rate=1, hosts=["newsapi.org"])
+    http_client = HttpClient(rate_limiter=limiter)
+
+    actual = http_client.send(method=HttpMethod.GET, url=BASE_URL, params=PARAMS)
+
+    assert actual == {"status": "ok"}
+    assert len(responses.calls) == 2
+    assert limiter.stats("localhost", API_KEY).rate_limited == 0
+
+
+def test_set_rate_limiter_replaces_the_shared_client() -> None:
+    limiter = RateLimiter(rate=1)
+    previous = get_http_client()
+    try:
+        set_rate_limiter(limiter)
+
+        assert get_http_client() is not previous
+        assert get_http_client().rate_limiter is limiter
+    finally:
+        set_rate_limiter(None)
+
+    assert get_http_client().rate_limiter is None
+
+
+@pytest.fixture
+def rate_limited_server():
+    """A local server answering 429 with a Retry-After, through urllib3."""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            requests_seen.append(self.path)
+            body = b'{"status": "error", "code": "rateLimited"}'
+            self.send_response(429)
+            self.send_header("Retry-After", "2")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v2", requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_client_without_retry_rate_limited(rate_limited_server) -> None:
+    url, requests_seen = rate_limited_server
+    http_client = HttpClient()
+    started = time.monotonic()
+
+    with pytest.raises(NewspyHttpException) as ex:
+        http_client.send(method=HttpMethod.GET, url=url, retry_rate_limited=False)
+
+    assert ex.value.status_code == 429
+    assert ex.value.headers["Retry-After"] == "2"
+    assert len(requests_seen) == 1
+    assert time.monotonic() - started < 1
+
+
+def test_retry_leaves_429_with_retry_after_to_the_client() -> None:
+    retry = _Retry(total=3, status_forcelist=(500,))
+
+    assert not retry.is_retry("GET", 429, has_retry_after=True)
+    assert retry.is_retry("GET", 503, has_retry_after=True)
@@ -0,0 +1,81 @@
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+from newspy.shared.exceptions import NewspyException, NewspyHttpException
+from newspy.shared.key_pool import ApiKeyPool
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = datetime(2023, 3, 12, 23, 0, tzinfo=timezone.utc).timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_key_pool_takes_the_keys_in_turn() -> None:
+    pool = ApiKeyPool(["a", "b", "c", "a", ""])
+
+    assert [pool.acquire() for _ in range(5)] == ["a", "b", "c", "a", "b"]
+    assert len(pool) == 3
+
+
+def test_key_pool_without_keys() -> None:
+    with pytest.raises(NewspyException, match="at least one key"):
+        ApiKeyPool([])
+
+
+def test_key_pool_leaves_out_keys_over_the_daily_limit() -> None:
+    clock = Clock()
+    pool = ApiKeyPool(["a", "b"], daily_limit=2, clock=clock)
+
+    assert [pool.acquire() for _ in range(4)] == ["a", "b", "a", "b"]
+    with pytest.raises(NewspyHttpException, match="status code: 429"):
+        pool.acquire()
+
+    clock.now += 60 * 60
+    assert pool.acquire() == "a"
+    assert pool.usage()["a"].requests == 1
+
+
+def test_key_pool_evicts_rate_limited_keys() -> None:
+    clock = Clock()
+    pool = ApiKeyPool(["a", "b"], eviction=600, clock=clock)
+
+    pool.evict("a", 30)
+    pool.evict("b")
+    pool.evict("unknown")
+    usage = pool.usage()
+
+    assert usage["a"].rate_limited == 1
+    assert usage["a"].evicted_for == 30
+    assert usage["b"].evicted_for == 600
+    with pytest.raises(NewspyHttpException):
+        pool.acquire()
+
+    clock.now += 30
+    assert [pool.acquire() for _ in range(2)] == ["a", "a"]
+
+
+def test_key_pool_from_many_threads() -> None:
+    pool = ApiKeyPool(["a", "b", "c"])
+    acquired = []
+
+    def acquire_all() -> None:
+        acquired.extend(pool.acquire() for _ in range(100))
+
+    threads = [threading.Thread(target=acquire_all) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert Counter(acquired) == {"a": 200, "b": 200, "c": 200}
+    assert {key: usage.requests for key, usage in pool.usage().items()} == {
+        "a": 200,
+        "b": 200,
+        "c": 200,
+    }
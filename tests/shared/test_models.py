@@ -1,3 +1,12 @@
+import dataclasses
+
+import pytest
+
+from newspy.models import Category, Channel, Language, Source, SourceRegistry
+from newspy.newsorg.models import NewsorgArticle
+from newspy.rss.models import RssArticle, RssSource
+
+
 def test_to_article(newsorg_article) -> None:
     actual = newsorg_article.to_article()
 
@@ -5,3 +14,106 @@ def test_to_article(newsorg_article) -> None:
         actual.slug
         == "fortune-why-a-former-softbank-partner-is-tackling-midcareer-dropoff-for-working-mothers"
     )
+
+
+def test_models_have_no_instance_dict(newsorg_article) -> None:
+    rss_source = RssSource(
+        id="wsj-markets",
+        name="The Wall Street Journal Markets",
+        description="The Wall Street Journal (WSJ) Markets RSS",
+        url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+        category=Category.FINANCIAL,
+        language=Language.EN,
+    )
+    rss_article = RssArticle(
+        source=rss_source,
+        title="Title",
+        description="Description",
+        url="https://example.com/title",
+        published="Sun, 12 Mar 2023 13:00:35 GMT",
+    )
+
+    for model in (
+        rss_source,
+        rss_article,
+        rss_article.to_article(),
+        newsorg_article,
+        newsorg_article.source,
+        newsorg_article.to_article(),
+    ):
+        assert not hasattr(model, "__dict__")
+
+
+def test_sources_are_frozen_and_hashable(newsorg_source) -> None:
+    source = Source(id="fortune", name="Fortune", channel=Channel.NEWSORG)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        source.name = "Other"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        newsorg_source.name = "Other"
+
+    assert {source, newsorg_source.to_source()} == {source}
+
+
+def test_source_registry_interns_sources_by_channel_and_id() -> None:
+    registry = SourceRegistry()
+
+    first = registry.get_source(id="fortune", name="Fortune", channel=Channel.NEWSORG)
+    second = registry.get_source(id="fortune", name="Fortune", channel=Channel.NEWSORG)
+    rss = registry.get_source(id="fortune", name="Fortune", channel=Channel.RSS)
+    renamed = registry.get_source(
+        id="fortune", name="Fortune Magazine", channel=Channel.NEWSORG
+    )
+
+    assert first is second
+    assert rss is not first
+    assert renamed.name == "Fortune Magazine"
+    assert (
+        registry.get_source(
+            id="fortune", name="Fortune Magazine", channel=Channel.NEWSORG
+        )
+        is renamed
+    )
+    assert len(registry) == 2
+
+
+def test_articles_of_a_feed_share_their_source() -> None:
+    rss_source = RssSource(
+        id="wsj-markets",
+        name="The Wall Street Journal Markets",
+        description="The Wall Street Journal (WSJ) Markets RSS",
+        url="https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+        category=Category.FINANCIAL,
+        language=Language.EN,
+    )
+    articles = [
+        RssArticle(
+            source=rss_source,
+            title=f"Title {i}",
+            description="Description",
+            url=f"https://example.com/{i}",
+            published="Sun, 12 Mar 2023 13:00:35 GMT",
+        ).to_article()
+        for i in range(3)
+    ]
+
+    assert articles[0].source is articles[1].source is articles[2].source
+
+
+def test_newsorg_articles_share_their_source() -> None:
+    articles = [
+        NewsorgArticle(
+            source={"id": "fortune", "name": "Fortune"},
+            author=None,
+            title=f"Title {i}",
+            description="Description",
+            url=f"https://example.com/{i}",
+            urlToImage="https://example.com/image.png",
+            publishedAt="2023-03-12T13:00:35Z",
+            content="Content",
+        )
+        for i in range(2)
+    ]
+
+    assert articles[0].source is articles[1].source
+    assert articles[0].to_article().source is articles[1].to_article().source
@@ -0,0 +1,132 @@
+import threading
+
+import pytest
+
+from newspy.shared.exceptions import NewspyHttpException
+from newspy.shared.rate_limiter import RateLimiter, retry_after
+
+
+class Clock:
+    """A clock that only moves when slept on."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock: Clock, **kwargs) -> RateLimiter:
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_rate_limiter_allows_a_burst_then_the_rate() -> None:
+    clock = Clock()
+    limiter = make_limiter(clock, rate=2, burst=3)
+
+    waits = [limiter.acquire("newsapi.org", "key") for _ in range(5)]
+
+    assert waits == [0, 0, 0, 0.5, 0.5]
+    assert clock.now == 1001
+
+
+def test_rate_limiter_refills_while_idle() -> None:
+    clock = Clock()
+    limiter = make_limiter(clock, rate=1, burst=2)
+    limiter.acquire("newsapi.org")
+    limiter.acquire("newsapi.org")
+    assert limiter.stats("newsapi.org").remaining == 0
+
+    clock.now += 1.5
+
+    assert limiter.stats("newsapi.org").remaining == 1.5
+    assert limiter.acquire("newsapi.org") == 0
+
+
+def test_rate_limiter_buckets_are_per_host_and_key() -> None:
+    clock = Clock()
+    limiter = make_limiter(clock, rate=1)
+
+    waits = [
+        limiter.acquire("newsapi.org", "first"),
+        limiter.acquire("newsapi.org", "second"),
+        limiter.acquire("example.com", "first"),
+        limiter.acquire("newsapi.org", "first"),
+    ]
+
+    assert waits == [0, 0, 0, 1]
+
+
+def test_rate_limiter_pause_holds_back_the_bucket() -> None:
+    clock = Clock()
+    limiter = make_limiter(clock, rate=10, burst=10)
+
+    limiter.pause("newsapi.org", "key", 30)
+    stats = limiter.stats("newsapi.org", "key")
+    waits = [limiter.acquire("newsapi.org", "key") for _ in range(3)]
+
+    assert stats.paused_for == 30
+    assert stats.rate_limited == 1
+    assert stats.remaining == 0
+    # No burst after the pause: the budget refills at the rate.
+    assert waits == pytest.approx([30, 0.1, 0.1])
+    assert limiter.acquire("newsapi.org", "other") == 0
+
+
+def test_rate_limiter_when_wait_exceeds_max_wait() -> None:
+    clock = Clock()
+    limiter = make_limiter(clock, rate=1, max_wait=10)
+    limiter.pause("newsapi.org", seconds=60)
+
+    with pytest.raises(NewspyHttpException, match="status code: 429"):
+        limiter.acquire("newsapi.org")
+
+    assert limiter.stats("newsapi.org").requests == 0
+
+
+def test_rate_limiter_spaces_out_threads() -> None:
+    clock = Clock()
+    # The clock does not move: each thread waits for the turn it reserved.
+    limiter = RateLimiter(rate=10, burst=1, clock=clock, sleep=lambda seconds: None)
+    waits = []
+
+    threads = [
+        threading.Thread(target=lambda: waits.append(limiter.acquire("newsapi.org")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(waits) == pytest.approx([0, 0.1, 0.2, 0.3, 0.4])
+    stats = limiter.stats("newsapi.org")
+    assert stats.requests == 5
+    assert stats.throttled == 4
+    assert stats.waited == pytest.approx(1.0)
+
+
+def test_rate_limiter_limits_only_the_given_hosts() -> None:
+    limiter = RateLimiter(rate=1, hosts=["newsapi.org"])
+
+    assert limiter.limits("newsapi.org")
+    assert not limiter.limits("example.com")
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"Retry-After": "120"}, 120),
+        ({"Retry-After": "Sun, 12 Mar 2023 13:01:00 GMT"}, 60),
+        ({"Retry-After": "Sun, 12 Mar 2023 12:00:00 GMT"}, 0),
+        ({"Retry-After": "soon"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after(headers, expected) -> None:
+    assert retry_after(headers, now=1678626000) == expected
@@ -25,6 +25,16 @@ from newspy.shared import utils
             "Sun, 12 Mar 2023 13:00:35 GMT",
             datetime(2023, 3, 12, 13, 0, 35, tzinfo=timezone.utc),
         ),
+        (
+            "12 Mar 2023 13:00 EST",
+            datetime(2023, 3, 12, 13, 0, tzinfo=timezone(timedelta(hours=-5))),
+        ),
+        (
+            "Sun, 2 Apr 23 09:05:00 -0330",
+            datetime(
+                2023, 4, 2, 9, 5, tzinfo=timezone(-timedelta(hours=3, minutes=30))
+            ),
+        ),
     ],
 )
 def test_create_published(test_input, expected) -> None:
@@ -33,6 +43,39 @@ def test_create_published(test_input, expected) -> None:
     assert actual == expected
 
 
+@pytest.mark.parametrize(
+    "test_input",
+    ["", "Yesterday", "Sun, 31 Feb 2023 13:00:35 GMT", "Sun, 12 Mar 2023 13:00:35 XYZ"],
+)
+def test_create_published_when_invalid(test_input) -> None:
+    with pytest.raises(ValueError):
+        utils.to_datetime(date_string=test_input)
+
+
+def test_create_published_remembers_the_format_of_a_source() -> None:
+    source = "https://example.com/feed"
+
+    utils.to_datetime("2022-07-17T07:49:34Z", source=source)
+    cached = utils._parsers_by_source[source]
+    actual = utils.to_datetime("Sun, 12 Mar 2023 13:00:35 GMT", source=source)
+
+    assert cached is utils._parse_iso
+    assert utils._parsers_by_source[source] is utils._parse_rfc822
+    assert actual == datetime(2023, 3, 12, 13, 0, 35, tzinfo=timezone.utc)
+
+
+def test_to_datetimes() -> None:
+    actual = utils.to_datetimes(
+        ["2022-07-17T07:49:34Z", "not a date", "Sun, 12 Mar 2023 13:00:35 GMT"]
+    )
+
+    assert actual == [
+        datetime(2022, 7, 17, 7, 49, 34, tzinfo=timezone.utc),
+        None,
+        datetime(2023, 3, 12, 13, 0, 35, tzinfo=timezone.utc),
+    ]
+
+
 @pytest.mark.parametrize(
     "test_input,expected",
     [
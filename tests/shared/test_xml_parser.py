@@ -1,5 +1,16 @@
-from unittest.mock import Mock
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
 from newspy.shared import xml_parser
+from newspy.shared.exceptions import NewspyException
+from newspy.shared.xml_parser import XmlBackend
+
+FEEDS_DIR = Path("tests/data/feeds")
 
 
 def test_parse_xml():
@@ -62,6 +73,7 @@ def test_parse_xml():
             "title": "Three global cities are pulling ahead since the peak of the "
             "pandemic",
             "url": "https://www.ft.com/content/1cf1b55e-bb8d-435a-95a3-5d21149939b6",
+            "guid": "1cf1b55e-bb8d-435a-95a3-5d21149939b6",
             "source_url": "https://www.ft.com/news-feed",
         },
         {
@@ -70,6 +82,7 @@ def test_parse_xml():
             "published": "Sun, 12 Mar 2023 12:54:53 GMT",
             "title": "UK seeks to tap Middle East money to buy out SVB unit",
             "url": "https://www.ft.com/content/cde4aa95-1cb5-408d-b35f-3216eaee46ae",
+            "guid": "cde4aa95-1cb5-408d-b35f-3216eaee46ae",
             "source_url": "https://www.ft.com/news-feed",
         },
     ]
@@ -194,43 +207,329 @@ def test_parse_xml_with_long_text():
     )
 
 
-def test_get_text_content_with_attribute_error():
-    item = Mock()
-    item.find.side_effect = [AttributeError("Mock error"), Mock(text="Test Article")]
+def test_parse_xml_with_rdf_feed():
+    xml = """
+        <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns="http://purl.org/rss/1.0/">
+            <channel rdf:about="https://example.com/">
+                <title>Example Feed</title>
+            </channel>
+            <item rdf:about="https://example.com/rdf-article">
+                <title>RDF Test Article</title>
+                <link>https://example.com/rdf-article</link>
+                <description>This is a test description</description>
+                <dc:date>2023-03-12T13:00:35Z</dc:date>
+            </item>
+        </rdf:RDF>
+    """
+
+    actual = xml_parser.parse_xml(data=xml, source_url="https://example.com/rdf")
+
+    assert actual == [
+        {
+            "source_url": "https://example.com/rdf",
+            "title": "RDF Test Article",
+            "description": "This is a test description",
+            "url": "https://example.com/rdf-article",
+            "published": "2023-03-12T13:00:35Z",
+            "guid": "",
+        }
+    ]
+
+
+def test_parse_xml_prefers_fields_in_rank_order():
+    xml = """
+        <rss xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:dc="http://purl.org/dc/elements/1.1/" version="2.0">
+            <channel>
+                <item>
+                    <dc:date>2023-03-12T13:00:35Z</dc:date>
+                    <content:encoded>Rich content here</content:encoded>
+                    <title>Test Article</title>
+                    <description>Short description</description>
+                    <pubDate>Sun, 12 Mar 2023 13:00:35 GMT</pubDate>
+                    <link>https://example.com/article</link>
+                </item>
+            </channel>
+        </rss>
+    """
+
+    actual = xml_parser.parse_xml(data=xml, source_url="https://example.com/feed")
+
+    assert actual[0]["description"] == "Short description"
+    assert actual[0]["published"] == "Sun, 12 Mar 2023 13:00:35 GMT"
+
+
+def test_parse_xml_uses_first_child_of_each_tag():
+    xml = """
+        <rss version="2.0">
+            <channel>
+                <item>
+                    <title>Test Article</title>
+                    <description/>
+                    <description>Ignored description</description>
+                    <summary>Summary</summary>
+                    <link>https://example.com/article</link>
+                    <link>https://example.com/other</link>
+                </item>
+            </channel>
+        </rss>
+    """
+
+    actual = xml_parser.parse_xml(data=xml, source_url="https://example.com/feed")
+
+    assert actual[0]["description"] == "Summary"
+    assert actual[0]["url"] == "https://example.com/article"
+
+
+def test_parse_xml_with_atom_updated_date():
+    xml = """
+        <feed xmlns="http://www.w3.org/2005/Atom">
+            <entry>
+                <title>Atom Test Article</title>
+                <link href="https://example.com/atom-article"/>
+                <updated>2023-03-12T13:00:35Z</updated>
+            </entry>
+        </feed>
+    """
+
+    actual = xml_parser.parse_xml(data=xml, source_url="https://example.com/atom-feed")
+
+    assert actual[0]["url"] == "https://example.com/atom-article"
+    assert actual[0]["published"] == "2023-03-12T13:00:35Z"
+
+
+def test_feed_parser_emits_items_as_their_end_tags_are_parsed():
+    parser = xml_parser.FeedParser(source_url="https://example.com/feed")
+
+    first = parser.feed(
+        b'<rss version="2.0"><channel><title>Feed</title>'
+        b"<item><title>First</title></item><item><title>Sec"
+    )
+    second = parser.feed(b"ond</title></item></channel></rss>")
+    rest = parser.close()
+
+    assert [item["title"] for item in first] == ["First"]
+    assert [item["title"] for item in second] == ["Second"]
+    assert rest == []
+
+
+def test_feed_parser_detaches_processed_items(stdlib_xml_backend):
+    parser = xml_parser.FeedParser(source_url="https://example.com/feed")
+
+    parser.feed(b'<rss version="2.0"><channel><title>Feed</title>')
+    parser.feed(b"<item><title>First</title></item>" * 100)
+    channel = parser._parents[-1]
+
+    assert [child.tag for child in channel] == ["title"]
+
+
+def test_parse_xml_stream():
+    chunks = [
+        b"<feed xmlns='http://www.w3.org/2005/Atom'><entry><title>Atom ",
+        b"Test Article</title><link href='https://example.com/atom-article'/>",
+        b"</entry></feed>",
+    ]
+
+    actual = xml_parser.parse_xml_stream(
+        chunks=chunks, source_url="https://example.com/atom-feed"
+    )
+
+    assert actual == [
+        {
+            "source_url": "https://example.com/atom-feed",
+            "title": "Atom Test Article",
+            "description": "",
+            "url": "https://example.com/atom-article",
+            "published": "",
+            "guid": "",
+        }
+    ]
+
+
+def test_parse_xml_stream_when_feed_is_truncated(stdlib_xml_backend):
+    chunks = [b"<rss><channel><item><title>First</title></item><item>"]
+
+    actual = xml_parser.parse_xml_stream(
+        chunks=chunks, source_url="https://example.com/feed"
+    )
+
+    assert actual is None
+
+
+def test_iter_xml_yields_items_before_a_parse_error(stdlib_xml_backend):
+    items = xml_parser.iter_xml(
+        chunks=[b"<rss><channel><item><title>First</title></item><item>"],
+        source_url="https://example.com/feed",
+    )
+
+    assert next(items)["title"] == "First"
+    with pytest.raises(ElementTree.ParseError):
+        next(items)
 
-    result = xml_parser._get_text_content(item, ["nonexistent", "title"], {})
 
-    assert result == "Test Article"
+@pytest.mark.parametrize("feed", sorted(FEEDS_DIR.glob("*.xml")), ids=lambda f: f.stem)
+def test_parse_xml_corpus(feed, xml_backend):
+    expected = json.loads(feed.with_suffix(".json").read_text(encoding="utf-8"))
 
+    actual = xml_parser.parse_xml(
+        data=feed.read_bytes(), source_url=f"https://example.com/{feed.stem}"
+    )
 
-def test_get_text_content_with_key_error():
-    item = Mock()
-    title_elem = Mock()
-    title_elem.text = "Test Article"
-    item.find.side_effect = [KeyError("Mock error"), title_elem]
+    assert actual == expected
 
-    result = xml_parser._get_text_content(item, ["nonexistent", "title"], {})
 
-    assert result == "Test Article"
+def test_parse_xml_with_lxml_recovers_broken_feed():
+    pytest.importorskip("lxml")
+    xml = b"""
+        <rss version="2.0">
+            <channel>
+                <item>
+                    <title>Markets & Finance</title>
+                    <link>https://example.com/article</link>
+                </item>
+                <item>
+                    <title>Truncated
+    """
 
+    parser = xml_parser.FeedParser(
+        source_url="https://example.com/feed", backend=XmlBackend.LXML
+    )
+    actual = parser.feed(xml) + parser.close()
 
-def test_get_link_with_attribute_error():
-    item = Mock()
-    item.find.side_effect = [
-        None,
-        AttributeError("Mock error"),
-        AttributeError("Mock error"),
+    assert [item["url"] for item in actual] == [
+        "https://example.com/article",
+        "",
     ]
 
-    result = xml_parser._get_link(item, {"atom": "http://www.w3.org/2005/Atom"})
 
-    assert result == ""
+def test_set_backend_when_lxml_is_not_installed(monkeypatch):
+    monkeypatch.setattr(xml_parser, "lxml_etree", None)
+
+    with pytest.raises(NewspyException, match="lxml is not installed"):
+        xml_parser.set_backend(XmlBackend.LXML)
+
+
+def test_set_backend_from_environment(monkeypatch, stdlib_xml_backend):
+    monkeypatch.setenv("NEWSPY_XML_BACKEND", "stdlib")
+
+    xml_parser.set_backend()
+
+    assert xml_parser.get_backend() == XmlBackend.STDLIB
+
+
+def test_set_backend_from_environment_when_lxml_is_not_installed(monkeypatch, caplog):
+    monkeypatch.setattr(xml_parser, "_backend", xml_parser.get_backend())
+    monkeypatch.setattr(xml_parser, "lxml_etree", None)
+    monkeypatch.setenv("NEWSPY_XML_BACKEND", "lxml")
 
+    xml_parser.set_backend()
 
-def test_get_link_with_key_error():
-    item = Mock()
-    item.find.side_effect = [None, KeyError("Mock error"), KeyError("Mock error")]
+    assert xml_parser.get_backend() == XmlBackend.STDLIB
+    assert "not installed" in caplog.text
 
-    result = xml_parser._get_link(item, {"atom": "http://www.w3.org/2005/Atom"})
 
-    assert result == ""
+def test_set_backend_from_environment_when_unknown(monkeypatch, caplog):
+    monkeypatch.setattr(xml_parser, "_backend", xml_parser.get_backend())
+    monkeypatch.setattr(xml_parser, "lxml_etree", None)
+    monkeypatch.setenv("NEWSPY_XML_BACKEND", "expat")
+
+    xml_parser.set_backend()
+
+    assert xml_parser.get_backend() == XmlBackend.STDLIB
+    assert "Unknown NEWSPY_XML_BACKEND" in caplog.text
+
+
+NEWEST_FIRST_XML = """
+    <rss version="2.0">
+        <channel>
+            <item>
+                <title>Third</title>
+                <pubDate>Sun, 12 Mar 2023 15:00:00 GMT</pubDate>
+            </item>
+            <item>
+                <title>Undated</title>
+            </item>
+            <item>
+                <title>Second</title>
+                <pubDate>Sun, 12 Mar 2023 14:00:00 GMT</pubDate>
+            </item>
+            <item>
+                <title>First</title>
+                <pubDate>Sun, 12 Mar 2023 13:00:00 GMT</pubDate>
+            </item>
+        </channel>
+    </rss>
+"""
+
+
+def test_parse_xml_with_max_items(xml_backend):
+    actual = xml_parser.parse_xml(
+        data=NEWEST_FIRST_XML, source_url="https://example.com/feed", max_items=2
+    )
+
+    assert [item["title"] for item in actual] == ["Third", "Undated"]
+
+
+def test_parse_xml_with_since(xml_backend):
+    actual = xml_parser.parse_xml(
+        data=NEWEST_FIRST_XML,
+        source_url="https://example.com/feed",
+        since=datetime(2023, 3, 12, 14, 0, 0, tzinfo=timezone.utc),
+    )
+
+    assert [item["title"] for item in actual] == ["Third", "Undated"]
+
+
+def test_parse_xml_with_naive_since():
+    actual = xml_parser.parse_xml(
+        data=NEWEST_FIRST_XML,
+        source_url="https://example.com/feed",
+        since=datetime(2023, 3, 12, 16, 0, 0),
+    )
+
+    assert actual is None
+
+
+def test_iter_xml_stops_reading_chunks_at_the_cutoff():
+    chunks = iter(
+        [
+            b"<rss><channel><item><title>First</title></item>",
+            b"<item><title>Second</title></item>",
+            b"<item><title>Third</title></item></channel></rss>",
+        ]
+    )
+
+    actual = list(
+        xml_parser.iter_xml(chunks, source_url="https://example.com", max_items=1)
+    )
+
+    assert [item["title"] for item in actual] == ["First"]
+    assert next(chunks) == b"<item><title>Second</title></item>"
+
+
+def test_parse_xml_from_many_threads(xml_backend):
+    feeds = [path.read_bytes() for path in sorted(FEEDS_DIR.glob("*.xml"))] * 50
+    expected = [xml_parser.parse_xml(feed, "https://example.com") for feed in feeds]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        actual = list(
+            executor.map(
+                lambda feed: xml_parser.parse_xml(feed, "https://example.com"), feeds
+            )
+        )
+
+    assert actual == expected
+
+
+def test_feed_parser_reads_the_channel_schedule(xml_backend):
+    parser = xml_parser.FeedParser("https://example.com/feed")
+    parser.feed(
+        b"<rss><channel><title>Example</title><ttl>60</ttl>"
+        b"<skipHours><hour>0</hour><hour>23</hour></skipHours>"
+        b"<skipDays><day>saturday</day><day>Sunday</day></skipDays>"
+        b"<item><title>Item</title><ttl>5</ttl></item></channel></rss>"
+    )
+    parser.close()
+
+    assert parser.ttl == 60
+    assert parser.skip_hours == {0, 23}
+    assert parser.skip_days == {"Saturday", "Sunday"}
@@ -0,0 +1,106 @@
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from newspy import batch as batch_module
+from newspy.batch import ArticleBatch
+from newspy.models import Article, Channel, Source
+from newspy.shared.exceptions import NewspyException
+
+FORTUNE = Source(id="fortune", name="Fortune", channel=Channel.NEWSORG)
+WSJ = Source(id="wsj-markets", name="The Wall Street Journal", channel=Channel.RSS)
+
+
+def make_article(i: int, source: Source, published: datetime | None) -> Article:
+    return Article(
+        slug=f"slug-{i}",
+        url=f"https://example.com/{i}",
+        url_to_image=None,
+        title=f"Title {i}",
+        abstract=f"Abstract {i}",
+        author=None,
+        source=source,
+        published=published,
+    )
+
+
+@pytest.fixture
+def articles() -> list[Article]:
+    return [
+        make_article(0, FORTUNE, datetime(2023, 3, 12, 13, 0, 35, tzinfo=timezone.utc)),
+        make_article(1, WSJ, datetime(2023, 3, 12, 12, 54, 53, tzinfo=timezone.utc)),
+        make_article(2, FORTUNE, None),
+    ]
+
+
+def test_article_batch_columns(articles) -> None:
+    actual = ArticleBatch.from_articles(articles)
+
+    assert len(actual) == 3
+    assert actual.titles == ["Title 0", "Title 1", "Title 2"]
+    assert actual.sources == [FORTUNE, WSJ]
+    assert list(actual.source_ids) == [0, 1, 0]
+    assert actual.published[0] == 1678626035.0
+    assert math.isnan(actual.published[2])
+
+
+def test_article_batch_views(articles) -> None:
+    actual = ArticleBatch.from_articles(articles)
+
+    assert actual[1].title == "Title 1"
+    assert actual[1].source is WSJ
+    assert actual[-1].published is None
+    assert [view.url for view in actual] == [article.url for article in articles]
+    assert actual.to_articles() == articles
+    with pytest.raises(IndexError):
+        actual[3]
+
+
+def test_article_batch_takes_naive_datetimes_as_utc() -> None:
+    actual = ArticleBatch.from_articles(
+        [make_article(0, FORTUNE, datetime(2023, 3, 12, 13, 0, 35))]
+    )
+
+    assert actual[0].published == datetime(2023, 3, 12, 13, 0, 35, tzinfo=timezone.utc)
+
+
+def test_article_batch_to_numpy(articles) -> None:
+    numpy = pytest.importorskip("numpy")
+    batch = ArticleBatch.from_articles(articles)
+
+    actual = batch.to_numpy()
+
+    assert list(actual["titles"]) == batch.titles
+    assert actual["published"][1] == 1678625693.0
+    assert numpy.isnan(actual["published"][2])
+    assert list(actual["source_ids"]) == [0, 1, 0]
+
+
+def test_article_batch_to_arrow(articles) -> None:
+    pytest.importorskip("pyarrow")
+
+    actual = ArticleBatch.from_articles(articles).to_arrow()
+
+    assert actual.num_rows == 3
+    assert actual.column("source").to_pylist() == [
+        "Fortune",
+        "The Wall Street Journal",
+        "Fortune",
+    ]
+    assert actual.column("published").to_pylist() == [
+        datetime(2023, 3, 12, 13, 0, 35, tzinfo=timezone.utc),
+        datetime(2023, 3, 12, 12, 54, 53, tzinfo=timezone.utc),
+        None,
+    ]
+
+
+def test_article_batch_export_without_optional_packages(monkeypatch) -> None:
+    monkeypatch.setattr(batch_module, "numpy", None)
+    monkeypatch.setattr(batch_module, "pyarrow", None)
+    actual = ArticleBatch()
+
+    with pytest.raises(NewspyException, match="numpy is not installed"):
+        actual.to_numpy()
+    with pytest.raises(NewspyException, match="pyarrow is not installed"):
+        actual.to_arrow()
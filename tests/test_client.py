@@ -1,11 +1,18 @@
 from datetime import datetime, timezone
 
 import os
+import time
+from types import SimpleNamespace
 
+import pytest
 import responses
 
 import newspy.client as newspy
 from newspy.models import Source, Channel, Article, Language, Category
+from newspy.shared.dedup import SeenSet
+from newspy.shared.exceptions import NewspyHttpException
+from newspy.shared.http_client import get_http_client
+from newspy.shared.rate_limiter import RateLimiter
 
 API_KEY = os.getenv("NEWSPY_TEST_NEWSORG_API_KEY", "test-api-key")
 
@@ -192,3 +199,179 @@ def test_categories() -> None:
     actual = newspy.get_categories()
 
     assert actual == expected
+
+
+@responses.activate
+def test_iter_articles(newsorg_articles_res_json) -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://github.com/onemoola/newspy/blob/main/data/rss_sources.csv.gz?raw=true",
+            "body": b"",
+            "status": 404,
+            "content_type": "application/zip",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": f"https://newsapi.org/v2/top-headlines?apiKey={API_KEY}&category=business&pageSize=100&page=1",
+            "body": newsorg_articles_res_json,
+            "status": 200,
+            "content_type": "application/json",
+        }
+    )
+
+    newspy.configure(newsorg_api_key=API_KEY)
+    articles = newspy.iter_articles(category=Category.BUSINESS)
+
+    assert next(articles).source.id == "fortune"
+    with pytest.raises(NewspyHttpException, match="status code: 404"):
+        next(articles)
+
+
+def test_iter_articles_stops_the_channels_when_closed(monkeypatch) -> None:
+    produced = []
+    closed = []
+
+    class SlowChannel:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def iter_articles(self, **kwargs):
+            try:
+                for i in range(10):
+                    produced.append((self.name, i))
+                    yield i
+                    time.sleep(0.05)
+            finally:
+                closed.append(self.name)
+
+    monkeypatch.setattr(
+        newspy,
+        "channels",
+        {
+            Channel.NEWSORG: SimpleNamespace(client=SlowChannel("newsorg")),
+            Channel.RSS: SimpleNamespace(client=SlowChannel("rss")),
+        },
+    )
+    monkeypatch.setattr(newspy, "_MAX_QUEUED_ARTICLES", 2)
+
+    articles = newspy._iter_channel_articles()
+    next(articles)
+    started = time.monotonic()
+    articles.close()
+    elapsed = time.monotonic() - started
+    time.sleep(0.3)
+
+    assert elapsed < 0.2
+    assert len(produced) < 20
+    assert sorted(closed) == ["newsorg", "rss"]
+
+
+def add_english_responses(newsorg_articles_res_json, rss_articles_res_xml) -> None:
+    with open("tests/data/rss_sources.csv.gz", "rb") as f:
+        rss_sources_data = f.read()
+
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://github.com/onemoola/newspy/blob/main/data/rss_sources.csv.gz?raw=true",
+            "body": rss_sources_data,
+            "status": 200,
+            "content_type": "application/zip",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": f"https://newsapi.org/v2/top-headlines?apiKey={API_KEY}&language=en&pageSize=100&page=1",
+            "body": newsorg_articles_res_json,
+            "status": 200,
+            "content_type": "application/json",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+            "body": rss_articles_res_xml,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": "https://feeds.a.dj.com/rss/WSJcomUSBusiness.xml",
+            "body": None,
+            "status": 200,
+            "content_type": "application/rss+xml",
+        }
+    )
+
+
+@responses.activate
+def test_get_article_batch(newsorg_articles_res_json, rss_articles_res_xml) -> None:
+    add_english_responses(newsorg_articles_res_json, rss_articles_res_xml)
+
+    newspy.configure(newsorg_api_key=API_KEY)
+    actual = newspy.get_article_batch(language=Language.EN)
+
+    assert len(actual) == 3
+    assert sorted(actual.titles) == [
+        "Three global cities are pulling ahead since the peak of the pandemic",
+        "UK seeks to tap Middle East money to buy out SVB unit",
+        "Why a former SoftBank partner is tackling mid-career drop-off for working "
+        "mothers",
+    ]
+    assert sorted(source.id for source in actual.sources) == ["fortune", "wsj-markets"]
+    assert {article.published for article in actual} == {
+        datetime(2022, 6, 1, 13, 22, 34, tzinfo=timezone.utc),
+        datetime(2023, 3, 12, 13, 0, 35, tzinfo=timezone.utc),
+        datetime(2023, 3, 12, 12, 54, 53, tzinfo=timezone.utc),
+    }
+
+
+@responses.activate
+def test_get_articles_with_seen(
+    newsorg_articles_res_json, rss_articles_res_xml
+) -> None:
+    add_english_responses(newsorg_articles_res_json, rss_articles_res_xml)
+    seen = SeenSet()
+
+    newspy.configure(newsorg_api_key=API_KEY)
+    first = newspy.get_articles(language=Language.EN, seen=seen)
+    second = newspy.get_articles(language=Language.EN, seen=seen)
+
+    assert len(first) == 3
+    assert second == []
+    assert len(seen) == 3
+
+
+def test_configure_with_rate_limiter() -> None:
+    limiter = RateLimiter(rate=1, hosts=["newsapi.org"])
+    try:
+        newspy.configure(newsorg_api_key=API_KEY, rate_limiter=limiter)
+
+        assert get_http_client().rate_limiter is limiter
+    finally:
+        newspy.configure(newsorg_api_key=API_KEY)
+
+    assert get_http_client().rate_limiter is None
+
+
+def test_configure_with_several_newsorg_api_keys(monkeypatch) -> None:
+    newspy.configure(newsorg_api_key=["first", "second"])
+
+    assert newspy.default_client_config["newsorg_api_key"] == "first"
+    assert newspy.default_client_config["newsorg_key_pool"].keys == ("first", "second")
+
+    monkeypatch.setenv("NEWSORG_API_KEY", "first, second")
+    newspy.configure()
+
+    assert newspy.default_client_config["newsorg_key_pool"].keys == ("first", "second")
+
+    newspy.configure(newsorg_api_key="single")
+
+    assert newspy.default_client_config["newsorg_key_pool"] is None
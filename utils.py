@@ -11,3 +11,7 @@ def compress_csv_to_gzip(csv_format: Path, gzip_format: Path):
 
 if __name__ == "__main__":
     compress_csv_to_gzip(Path("data/rss_sources.csv"), Path("data/rss_sources.csv.gz"))
+    # Offline fallback shipped with the package.
+    shutil.copyfile(
+        Path("data/rss_sources.csv.gz"), Path("newspy/rss/data/rss_sources.csv.gz")
+    )